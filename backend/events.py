@@ -0,0 +1,146 @@
+"""
+Progress streaming for migration sessions.
+
+Migrations publish status snapshots to a ProgressBroker, and each
+Server-Sent Events client holds a Subscription that only ever keeps the
+newest snapshot. A burst of updates between two sends collapses into one
+message, so slow clients never build up a backlog. Clients of a session
+running in another server process are served by polling shared state.
+"""
+
+import asyncio
+import json
+import threading
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Set
+
+# Statuses that end an event stream; a resumed session is streamed anew
+TERMINAL_STATUSES = {"completed", "cancelled", "error", "paused"}
+
+# Minimum gap between two messages to one client; updates in between coalesce
+MIN_SEND_INTERVAL = 0.1
+
+# Comment sent on idle streams so proxies don't close them
+KEEPALIVE_INTERVAL = 15.0
+
+
+class Subscription:
+    """One client's view of a session: the newest unsent snapshot."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._ready = asyncio.Event()
+        self._lock = threading.Lock()
+        self._latest: Optional[Dict[str, Any]] = None
+
+    def offer(self, snapshot: Dict[str, Any]) -> None:
+        """Replace the pending snapshot; safe to call from any thread."""
+        with self._lock:
+            self._latest = snapshot
+        self._loop.call_soon_threadsafe(self._ready.set)
+
+    async def next(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """Wait for the newest snapshot, or None after ``timeout`` idle seconds."""
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        self._ready.clear()
+        with self._lock:
+            snapshot, self._latest = self._latest, None
+        return snapshot
+
+
+class ProgressBroker:
+    """Fans session snapshots out to the subscriptions watching them."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions: Dict[str, Set[Subscription]] = {}
+
+    def subscribe(self, session_id: str) -> Subscription:
+        subscription = Subscription(asyncio.get_running_loop())
+        with self._lock:
+            self._subscriptions.setdefault(session_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, session_id: str, subscription: Subscription) -> None:
+        with self._lock:
+            watchers = self._subscriptions.get(session_id)
+            if watchers is not None:
+                watchers.discard(subscription)
+                if not watchers:
+                    del self._subscriptions[session_id]
+
+    def publish(self, session_id: str, build: Callable[[], Dict[str, Any]]) -> None:
+        """
+        Send a snapshot to every subscription of a session.
+
+        ``build`` is only called when someone is watching, so sessions
+        without clients pay nothing per update.
+        """
+        with self._lock:
+            watchers = list(self._subscriptions.get(session_id, ()))
+        if not watchers:
+            return
+        snapshot = build()
+        for subscription in watchers:
+            subscription.offer(snapshot)
+
+
+def format_sse(data: Dict[str, Any], event: str = "status") -> str:
+    """Encode one Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def stream_session(
+    broker: ProgressBroker,
+    session_id: str,
+    build: Callable[[], Dict[str, Any]],
+) -> AsyncIterator[str]:
+    """
+    Yield SSE messages for a session until it completes or errors.
+
+    Starts with a snapshot from ``build`` (taken after subscribing, so no
+    update is missed) so a client never waits for the first change.
+    """
+    subscription = broker.subscribe(session_id)
+    try:
+        snapshot: Optional[Dict[str, Any]] = build()
+        while True:
+            if snapshot is None:
+                yield ": keepalive\n\n"
+            else:
+                yield format_sse(snapshot)
+                if snapshot.get("status") in TERMINAL_STATUSES:
+                    return
+                await asyncio.sleep(MIN_SEND_INTERVAL)
+            snapshot = await subscription.next(KEEPALIVE_INTERVAL)
+    finally:
+        broker.unsubscribe(session_id, subscription)
+
+
+async def poll_session(
+    build: Callable[[], Dict[str, Any]],
+    interval: float = 0.5,
+) -> AsyncIterator[str]:
+    """
+    Yield SSE messages for a session running in another process.
+
+    No broker can reach across processes, so the shared snapshot is polled
+    every ``interval`` seconds and sent only when it changed.
+    """
+    last: Optional[Dict[str, Any]] = None
+    idle = 0.0
+    while True:
+        snapshot = build()
+        if snapshot != last:
+            yield format_sse(snapshot)
+            if snapshot.get("status") in TERMINAL_STATUSES:
+                return
+            last = snapshot
+            idle = 0.0
+        elif idle >= KEEPALIVE_INTERVAL:
+            yield ": keepalive\n\n"
+            idle = 0.0
+        await asyncio.sleep(interval)
+        idle += interval
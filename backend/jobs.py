@@ -0,0 +1,340 @@
+"""
+Job runner for migrations.
+
+Migrations make blocking Spotify calls, so they run on a fixed pool of
+worker threads instead of the event loop. Jobs wait in a bounded queue;
+when it is full, submit raises QueueFull and the API answers 503 rather
+than accepting unbounded work.
+
+The queue is pluggable: MemoryJobQueue serves a single server process,
+while SQLiteJobQueue is shared by every process on the node, so a job
+submitted to one uvicorn worker may run on another.
+
+A job id can be submitted again once its job finished, e.g. to resume a
+paused migration; submitting a job that is still queued is a no-op.
+
+A claimed job is leased to its worker, which renews the lease while the
+job runs. If the worker's process dies, the lease runs out and the next
+claim queues the job again, so another process resumes the migration.
+"""
+
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Callable, Deque, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+JOB_STATES = (QUEUED, RUNNING, DONE, FAILED)
+
+# Seconds a claimed job stays leased without a heartbeat
+DEFAULT_LEASE_SECONDS = 60.0
+
+
+class QueueFull(Exception):
+    """Raised when the job queue has no room for another job."""
+
+
+class MemoryJobQueue:
+    """Job queue local to one process."""
+
+    def __init__(self, max_queued: int = 32):
+        self.max_queued = max_queued
+        self._lock = threading.Lock()
+        self._pending: Deque[str] = deque()
+        self._states: Dict[str, str] = {}
+
+    def put(self, job_id: str) -> None:
+        with self._lock:
+            if job_id in self._pending:
+                return
+            if len(self._pending) >= self.max_queued:
+                raise QueueFull(f"{self.max_queued} migrations already queued")
+            self._pending.append(job_id)
+            self._states[job_id] = QUEUED
+
+    def claim(self, worker: str) -> Optional[str]:
+        with self._lock:
+            if not self._pending:
+                return None
+            job_id = self._pending.popleft()
+            self._states[job_id] = RUNNING
+            return job_id
+
+    def heartbeat(self, job_id: str, worker: str) -> bool:
+        # Jobs die with the process that holds them, so there is no lease
+        return True
+
+    def finish(self, job_id: str, ok: bool) -> None:
+        with self._lock:
+            # A job submitted again while it ran stays queued
+            if self._states.get(job_id) == RUNNING:
+                self._states[job_id] = DONE if ok else FAILED
+
+    def state(self, job_id: str) -> Optional[str]:
+        return self._states.get(job_id)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            states = list(self._states.values())
+        return {state: states.count(state) for state in JOB_STATES}
+
+
+class SQLiteJobQueue:
+    """
+    Job queue shared through a SQLite database by all processes on a node.
+
+    Args:
+        path: Database file
+        max_queued: Jobs that may wait before put raises QueueFull
+        lease_seconds: How long a claimed job stays with its worker
+            without a heartbeat before it is queued again
+    """
+
+    def __init__(self, path: Path, max_queued: int = 32, lease_seconds: float = DEFAULT_LEASE_SECONDS):
+        self.max_queued = max_queued
+        self.lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(path), check_same_thread=False, isolation_level=None, timeout=30
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                worker TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                lease_expires REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at);
+            """
+        )
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")]
+        if "lease_expires" not in columns:
+            # Databases from before leases; their running jobs count as expired
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN lease_expires REAL")
+
+    def put(self, job_id: str) -> None:
+        now = time.time()
+        with self._lock:
+            # IMMEDIATE takes the write lock up front, so the count and the
+            # insert can't interleave with another process's submit
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                (queued,) = self._conn.execute(
+                    "SELECT COUNT(*) FROM jobs WHERE status = ?", (QUEUED,)
+                ).fetchone()
+                if queued >= self.max_queued:
+                    raise QueueFull(f"{self.max_queued} migrations already queued")
+                self._conn.execute(
+                    "INSERT INTO jobs VALUES (?, ?, NULL, ?, ?, NULL)"
+                    " ON CONFLICT (id) DO UPDATE SET status = excluded.status,"
+                    " worker = NULL, created_at = excluded.created_at,"
+                    " updated_at = excluded.updated_at, lease_expires = NULL"
+                    " WHERE status != ?",
+                    (job_id, QUEUED, now, now, QUEUED),
+                )
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def claim(self, worker: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Jobs whose worker stopped renewing the lease run again,
+                # ahead of newer jobs since they keep their created_at
+                recovered = self._conn.execute(
+                    "UPDATE jobs SET status = ?, worker = NULL, updated_at = ?, lease_expires = NULL"
+                    " WHERE status = ? AND (lease_expires IS NULL OR lease_expires < ?)",
+                    (QUEUED, now, RUNNING, now),
+                ).rowcount
+                if recovered:
+                    logger.warning("Re-queued %d migration job(s) with an expired lease", recovered)
+                row = self._conn.execute(
+                    "SELECT id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1",
+                    (QUEUED,),
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = ?, worker = ?, updated_at = ?, lease_expires = ?"
+                        " WHERE id = ?",
+                        (RUNNING, worker, now, now + self.lease_seconds, row[0]),
+                    )
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return row[0] if row is not None else None
+
+    def heartbeat(self, job_id: str, worker: str) -> bool:
+        """Renew the lease of a running job; False if ``worker`` no longer holds it."""
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET updated_at = ?, lease_expires = ?"
+                " WHERE id = ? AND status = ? AND worker = ?",
+                (now, now + self.lease_seconds, job_id, RUNNING, worker),
+            )
+        return cursor.rowcount == 1
+
+    def finish(self, job_id: str, ok: bool) -> None:
+        with self._lock:
+            # A job submitted again while it ran stays queued
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, lease_expires = NULL, updated_at = ?"
+                " WHERE id = ? AND status = ?",
+                (DONE if ok else FAILED, time.time(), job_id, RUNNING),
+            )
+
+    def state(self, job_id: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+            ).fetchall()
+        counts = dict.fromkeys(JOB_STATES, 0)
+        counts.update(rows)
+        return counts
+
+
+class JobRunner:
+    """
+    Runs queued jobs on ``workers`` threads of this process.
+
+    Idle workers poll the queue every ``poll_interval`` seconds for jobs
+    submitted by other processes; jobs submitted here wake them at once.
+    The leases of running jobs are renewed every ``heartbeat_interval``
+    seconds (a third of the queue's lease by default). With
+    ``autostart=False`` the threads start on ``start()``.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[str], None],
+        queue=None,
+        workers: int = 4,
+        poll_interval: float = 0.5,
+        heartbeat_interval: Optional[float] = None,
+        autostart: bool = True,
+    ):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.handler = handler
+        self.queue = queue if queue is not None else MemoryJobQueue()
+        self.workers = workers
+        self.poll_interval = poll_interval
+        lease_seconds = getattr(self.queue, "lease_seconds", DEFAULT_LEASE_SECONDS)
+        self.heartbeat_interval = heartbeat_interval or lease_seconds / 3
+        self.node = f"{socket.gethostname()}:{os.getpid()}"
+        self._wakeup = threading.Condition()
+        self._stopping = False
+        self._running: Set[str] = set()
+        self._running_lock = threading.Lock()
+        self._threads = [
+            threading.Thread(target=self._work, name=f"migration-worker-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        self._heartbeat = threading.Thread(
+            target=self._renew_leases, name="migration-heartbeat", daemon=True
+        )
+        if autostart:
+            self.start()
+
+    def start(self) -> None:
+        """Start the worker and heartbeat threads."""
+        for thread in self._threads:
+            thread.start()
+        self._heartbeat.start()
+
+    def submit(self, job_id: str) -> None:
+        """
+        Queue a job for ``handler(job_id)``.
+
+        Raises:
+            QueueFull: If the queue already holds ``max_queued`` jobs
+        """
+        self.queue.put(job_id)
+        with self._wakeup:
+            self._wakeup.notify()
+
+    def state(self, job_id: str) -> Optional[str]:
+        """Return the job's state, or None for unknown jobs."""
+        return self.queue.state(job_id)
+
+    def stats(self) -> Dict[str, int]:
+        """Count jobs by state, plus this process's pool size."""
+        counts = self.queue.stats()
+        counts["workers"] = self.workers
+        return counts
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the workers after their current jobs."""
+        with self._wakeup:
+            self._stopping = True
+            self._wakeup.notify_all()
+        if wait:
+            for thread in (*self._threads, self._heartbeat):
+                if thread.ident is not None:  # Started
+                    thread.join()
+
+    def _work(self) -> None:
+        while not self._stopping:
+            job_id = self.queue.claim(self.node)
+            if job_id is None:
+                with self._wakeup:
+                    if not self._stopping:
+                        self._wakeup.wait(self.poll_interval)
+                continue
+            with self._running_lock:
+                self._running.add(job_id)
+            try:
+                self.handler(job_id)
+            except Exception:
+                logger.exception("Migration job %s failed", job_id)
+                self.queue.finish(job_id, ok=False)
+            else:
+                self.queue.finish(job_id, ok=True)
+            finally:
+                with self._running_lock:
+                    self._running.discard(job_id)
+
+    def _renew_leases(self) -> None:
+        while True:
+            with self._wakeup:
+                if self._stopping:
+                    return
+                self._wakeup.wait(self.heartbeat_interval)
+                if self._stopping:
+                    return
+            with self._running_lock:
+                running = list(self._running)
+            for job_id in running:
+                try:
+                    if not self.queue.heartbeat(job_id, self.node):
+                        logger.warning("Migration job %s lost its lease", job_id)
+                except Exception:
+                    logger.exception("Could not renew the lease of migration job %s", job_id)
@@ -3,35 +3,164 @@ FastAPI backend for YT2Spot migration tool.
 Serves both the CLI and web frontend.
 """
 
-from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks, Depends, Request
+from fastapi import FastAPI, HTTPException, Depends, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer
-from fastapi.responses import RedirectResponse, HTMLResponse
+from fastapi.responses import RedirectResponse, HTMLResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
+from contextlib import asynccontextmanager
 import asyncio
+import httpx
+import threading
+import time
 import uuid
 import json
+import weakref
+from dataclasses import asdict
 from datetime import datetime
 from pathlib import Path
-import tempfile
 import os
 import secrets
 import base64
 import urllib.parse
 
 # Import existing YT2Spot modules
-from yt2spot.input_parser import parse_input_file
+from yt2spot.bulk import SharedMatchIndex, playlist_name_for
+from yt2spot.models import MatchCandidate, SongInput
 from yt2spot.spotify_client import SpotifyClient
 from yt2spot.matcher.search import search_spotify_tracks
 from yt2spot.matcher.scoring import score_candidates
 from yt2spot.matcher.decision import make_decision
 from yt2spot.config import ConfigManager
+from yt2spot.models import MatchDecision as TrackDecision
+from yt2spot.metrics import REGISTRY
+from yt2spot.state import StateStore
+
+from compression import CompressionMiddleware
+from events import ProgressBroker, format_sse, poll_session, stream_session
+from jobs import JobRunner, QueueFull
+from parse_cache import ParseCache
+from scheduler import RequestCancelled, RequestScheduler, ScheduledClient
+from serialization import JSONBytesResponse, dumps, encode_array, loads
+from session_store import RESULT_KINDS, SessionStore
+from shared_state import create_shared_backend
+from uploads import UploadError, parse_upload
+
+LOG_DIR = Path(os.getenv("YT2SPOT_LOG_DIR", "logs"))
+
+# Answers and pause/cancel requests posted to a worker's own process wake
+# it at once. Those posted to another server process are polled for, first
+# after DECISION_POLL_MIN seconds and backing off to DECISION_POLL_MAX
+# while none come
+DECISION_POLL_MIN = 0.25
+DECISION_POLL_MAX = 4.0
+
+# A running session checkpoints its position, results and decision queue
+# this often, so a job recovered from a dead worker redoes at most this much
+CHECKPOINT_INTERVAL = float(os.getenv("YT2SPOT_CHECKPOINT_SECONDS", "5"))
+
+# Candidates offered to the user for an uncertain match; only these are kept
+# while the decision waits
+OFFERED_CANDIDATES = 3
+
+# Most decisions returned by one GET /migrate/decisions request
+MAX_DECISION_BATCH = 100
+
+# A running session writes its per-song progress to shared state once every
+# this many songs or seconds; status changes are written at once
+PUBLISH_EVERY_SONGS = 25
+PUBLISH_INTERVAL = 0.25
+
+# Largest accepted upload; uploads are parsed as they stream in, so this
+# bounds request time rather than memory
+MAX_UPLOAD_BYTES = int(os.getenv("YT2SPOT_MAX_UPLOAD_MB", "512")) * 1024 * 1024
+
+# Disk space for songs parsed by /upload, kept for /migrate/start to reuse
+PARSE_CACHE_BYTES = int(os.getenv("YT2SPOT_PARSE_CACHE_MB", "256")) * 1024 * 1024
+
+# Most files accepted by one POST /migrate/bulk request
+MAX_BULK_FILES = int(os.getenv("YT2SPOT_MAX_BULK_FILES", "50"))
+
+# Backend metrics, served at /metrics next to the library's Spotify and
+# matcher metrics. Gauges are filled in when scraped
+MIGRATION_SONGS = REGISTRY.counter(
+    "yt2spot_migration_songs_total",
+    "Songs finished by web migrations, by outcome (matched, rejected, skipped, error)",
+    ("outcome",)
+)
+MIGRATIONS = REGISTRY.counter(
+    "yt2spot_migrations_total",
+    "Migrations finished by this process, by final status",
+    ("status",)
+)
+DECISION_WAIT_SECONDS = REGISTRY.histogram(
+    "yt2spot_decision_wait_seconds",
+    "Time from queueing an uncertain match to applying the user's answer",
+    buckets=(1, 5, 15, 30, 60, 300, 900, 3600, 14400)
+)
+SESSIONS = REGISTRY.gauge("yt2spot_sessions", "Sessions resident in this process, by status", ("status",))
+JOBS = REGISTRY.gauge("yt2spot_jobs", "Migration jobs by state", ("state",))
+SPOTIFY_QUEUED = REGISTRY.gauge(
+    "yt2spot_spotify_queued_requests",
+    "Spotify requests waiting for the scheduler, by priority",
+    ("priority",)
+)
+
+# Sessions, decisions and the search cache, shared with the CLI
+state_store = StateStore.in_dir(LOG_DIR)
+
+# Session snapshots and the job queue, shared by all server processes.
+# "sqlite" works across `uvicorn --workers N` on one node; "memory" only
+# within a single process
+shared_state, job_queue = create_shared_backend(
+    os.getenv("YT2SPOT_SHARED_STATE", "sqlite"),
+    LOG_DIR,
+    max_queued=int(os.getenv("YT2SPOT_MAX_QUEUED_MIGRATIONS", "32")),
+    lease_seconds=float(os.getenv("YT2SPOT_JOB_LEASE_SECONDS", "60"))
+)
+
+# Migrations run on worker threads so blocking Spotify calls never stall
+# the event loop; every server process runs a pool fed by the shared queue.
+# It starts with the app, since it may claim jobs left by a dead worker
+job_runner = JobRunner(
+    lambda session_id: process_migration(session_id),
+    queue=job_queue,
+    workers=int(os.getenv("YT2SPOT_MIGRATION_WORKERS", "4")),
+    autostart=False
+)
+
+# One Spotify request budget for all migrations in this process, shared
+# fairly between sessions; answers to user decisions go first
+spotify_scheduler = RequestScheduler(
+    rate=float(os.getenv("YT2SPOT_SPOTIFY_RATE", "10")),
+    burst=int(os.getenv("YT2SPOT_SPOTIFY_BURST", "10"))
+)
+
+# Pooled connections to Spotify for the OAuth endpoints; opened with the app
+spotify_http: Optional[httpx.AsyncClient] = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global spotify_http
+    spotify_http = httpx.AsyncClient(
+        timeout=httpx.Timeout(10.0),
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+    )
+    job_runner.start()
+    yield
+    await spotify_http.aclose()
+    # Workers may be waiting on users who are gone; they are daemon threads
+    job_runner.shutdown(wait=False)
+    spotify_scheduler.shutdown()
+    state_store.close()
 
 app = FastAPI(
     title="YT2Spot API",
     description="YouTube Music to Spotify Migration API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS for frontend
@@ -43,17 +172,56 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Results and status payloads are sent with brotli or gzip when the client
+# accepts it; event streams are left alone
+app.add_middleware(CompressionMiddleware, minimum_size=int(os.getenv("YT2SPOT_COMPRESS_MIN_BYTES", "500")))
+
 # Security
 security = HTTPBearer()
 
-# In-memory storage for migration sessions
-migration_sessions: Dict[str, Dict[str, Any]] = {}
+# Migration sessions running in this process (mirrored to shared_state).
+# Result lists spill to disk past the memory budget, and finished sessions
+# expire after the TTL
+session_store = SessionStore(
+    LOG_DIR / "sessions",
+    memory_budget=int(os.getenv("YT2SPOT_SESSION_MEMORY_MB", "64")) * 1024 * 1024,
+    ttl=float(os.getenv("YT2SPOT_SESSION_TTL", "3600")),
+    on_evict=shared_state.delete_session
+)
+
+# Pushes session snapshots to /migrate/events subscribers
+progress_broker = ProgressBroker()
+
+# Songs parsed by /upload, by content digest; /migrate/start takes the
+# digest as a file token instead of the same file again
+parse_cache = ParseCache(LOG_DIR / "parse_cache", max_bytes=PARSE_CACHE_BYTES)
+
+# One authenticated Spotify client for every migration in this process;
+# sessions reach it through the scheduler
+_spotify_client = None
+_spotify_client_lock = threading.Lock()
+
+# Match indexes of the bulk jobs with running files, so a song in several
+# files of a job is searched and scored once. An index goes away with the
+# last of its running files; the search cache still covers the rest
+_bulk_indexes: "weakref.WeakValueDictionary[str, SharedMatchIndex]" = weakref.WeakValueDictionary()
+_bulk_indexes_lock = threading.Lock()
 
 # --- OAuth Endpoints ---
 SPOTIFY_CLIENT_ID = os.getenv('SPOTIFY_CLIENT_ID', 'your_spotify_client_id')
 SPOTIFY_CLIENT_SECRET = os.getenv('SPOTIFY_CLIENT_SECRET', 'your_spotify_client_secret')
 SPOTIFY_REDIRECT_URI = os.getenv('SPOTIFY_REDIRECT_URI', 'http://localhost:8000/api/auth/spotify/callback')
 
+SPOTIFY_TOKEN_URL = 'https://accounts.spotify.com/api/token'
+SPOTIFY_API_URL = 'https://api.spotify.com/v1'
+
+# Largest page of /me/playlists Spotify serves
+PLAYLIST_PAGE_SIZE = 50
+
+# Cookie holding the OAuth state until Spotify redirects back to the callback
+OAUTH_STATE_COOKIE = 'spotify_oauth_state'
+OAUTH_STATE_SECONDS = 600
+
 YTMUSIC_CLIENT_ID = os.getenv('YTMUSIC_CLIENT_ID', 'your_ytmusic_client_id')
 YTMUSIC_CLIENT_SECRET = os.getenv('YTMUSIC_CLIENT_SECRET', 'your_ytmusic_client_secret')
 YTMUSIC_REDIRECT_URI = os.getenv('YTMUSIC_REDIRECT_URI', 'http://localhost:8000/api/auth/youtube-music/callback')
@@ -71,40 +239,88 @@ async def spotify_auth(type: str = 'source'):
         'show_dialog': 'true'
     }
     url = f"https://accounts.spotify.com/authorize?{urllib.parse.urlencode(params)}"
-    return RedirectResponse(url)
+    response = RedirectResponse(url)
+    # The callback only accepts the state it was sent from this browser
+    response.set_cookie(
+        OAUTH_STATE_COOKIE, state, max_age=OAUTH_STATE_SECONDS,
+        path='/api/auth/spotify', httponly=True, samesite='lax'
+    )
+    return response
+
+def _auth_popup(message: Dict[str, Any]) -> HTMLResponse:
+    """Answer the OAuth popup with a message for the opener window."""
+    # "<" is escaped so that names like "</script>" can't end the script
+    payload = json.dumps(message).replace("<", "\\u003c")
+    return HTMLResponse(f"<script>window.opener.postMessage({payload}, window.origin);window.close();</script>")
+
+async def _spotify_get(access_token: str, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    resp = await spotify_http.get(
+        f"{SPOTIFY_API_URL}{path}",
+        params=params,
+        headers={'Authorization': f'Bearer {access_token}'}
+    )
+    resp.raise_for_status()
+    return resp.json()
+
+async def _get_all_playlists(access_token: str) -> List[Dict[str, Any]]:
+    """Load every page of the user's playlists; pages after the first are fetched concurrently."""
+    first = await _spotify_get(access_token, '/me/playlists', {'limit': PLAYLIST_PAGE_SIZE, 'offset': 0})
+    rest = await asyncio.gather(*(
+        _spotify_get(access_token, '/me/playlists', {'limit': PLAYLIST_PAGE_SIZE, 'offset': offset})
+        for offset in range(PLAYLIST_PAGE_SIZE, first.get('total', 0), PLAYLIST_PAGE_SIZE)
+    ))
+    # Spotify lists deleted or unavailable playlists as null
+    return [p for page in (first, *rest) for p in page.get('items', []) if p]
 
 @app.get('/api/auth/spotify/callback')
 async def spotify_callback(request: Request):
+    response = await _spotify_login(request)
+    response.delete_cookie(OAUTH_STATE_COOKIE, path='/api/auth/spotify')
+    return response
+
+async def _spotify_login(request: Request) -> HTMLResponse:
     code = request.query_params.get('code')
     state = request.query_params.get('state')
     error = request.query_params.get('error')
     if error:
-        return HTMLResponse(f"<script>window.opener.postMessage({{type: 'AUTH_ERROR', error: '{error}'}}, window.origin);window.close();</script>")
-    # Exchange code for token
-    token_url = 'https://accounts.spotify.com/api/token'
-    data = {
-        'grant_type': 'authorization_code',
-        'code': code,
-        'redirect_uri': SPOTIFY_REDIRECT_URI,
-        'client_id': SPOTIFY_CLIENT_ID,
-        'client_secret': SPOTIFY_CLIENT_SECRET
-    }
-    import requests
-    resp = requests.post(token_url, data=data)
-    token_info = resp.json()
-    access_token = token_info.get('access_token')
-    # Get user info
-    user_resp = requests.get('https://api.spotify.com/v1/me', headers={'Authorization': f'Bearer {access_token}'})
-    user_info = user_resp.json()
-    # Get playlists
-    playlists_resp = requests.get('https://api.spotify.com/v1/me/playlists', headers={'Authorization': f'Bearer {access_token}'})
-    playlists = playlists_resp.json().get('items', [])
+        return _auth_popup({'type': 'AUTH_ERROR', 'error': error})
+    
+    # A state other than the one this browser was sent means the login was
+    # started elsewhere (or forged), so its code is not exchanged
+    expected = request.cookies.get(OAUTH_STATE_COOKIE)
+    if not state or not expected or not secrets.compare_digest(state, expected):
+        return _auth_popup({'type': 'AUTH_ERROR', 'error': 'OAuth state mismatch, please sign in again'})
+    
+    try:
+        # Exchange code for token
+        data = {
+            'grant_type': 'authorization_code',
+            'code': code,
+            'redirect_uri': SPOTIFY_REDIRECT_URI,
+            'client_id': SPOTIFY_CLIENT_ID,
+            'client_secret': SPOTIFY_CLIENT_SECRET
+        }
+        resp = await spotify_http.post(SPOTIFY_TOKEN_URL, data=data)
+        token_info = resp.json()
+        access_token = token_info.get('access_token')
+        if not access_token:
+            error = token_info.get('error_description') or token_info.get('error') or 'Token exchange failed'
+            return _auth_popup({'type': 'AUTH_ERROR', 'error': error})
+        
+        # User info and playlists load at the same time
+        user_info, playlists = await asyncio.gather(
+            _spotify_get(access_token, '/me'),
+            _get_all_playlists(access_token)
+        )
+    except (httpx.HTTPError, ValueError) as e:
+        return _auth_popup({'type': 'AUTH_ERROR', 'error': f'Spotify request failed: {e}'})
+    
     playlist_data = [
         {
             'id': p['id'],
             'name': p['name'],
-            'trackCount': p['tracks']['total'],
-            'imageUrl': p['images'][0]['url'] if p['images'] else None
+            'trackCount': (p.get('tracks') or {}).get('total', 0),
+            'imageUrl': p['images'][0]['url'] if p.get('images') else None
         } for p in playlists
     ]
     # Send result to frontend
@@ -118,7 +334,7 @@ async def spotify_callback(request: Request):
         },
         'playlists': playlist_data
     }
-    return HTMLResponse(f"<script>window.opener.postMessage({json.dumps(result)}, window.origin);window.close();</script>")
+    return _auth_popup(result)
 
 # YouTube Music OAuth (placeholder, as Google OAuth for YT Music is more complex)
 @app.get('/api/auth/youtube-music')
@@ -137,10 +353,19 @@ class MigrationStartRequest(BaseModel):
     reject_threshold: float = 0.60
     max_candidates: int = 5
     dry_run: bool = False
+    playlist_name: Optional[str] = None  # Add matches to this playlist instead of liking them
+    public: bool = False  # Visibility of a playlist that has to be created
+
+class MigrationFromUploadRequest(BaseModel):
+    file_token: str  # From a previous POST /upload
+    config: MigrationStartRequest = MigrationStartRequest()
+
+class BulkMigrationRequest(MigrationStartRequest):
+    playlist_prefix: str = ""  # Each file's playlist is named prefix + file name
 
 class MigrationStatus(BaseModel):
     session_id: str
-    status: str  # "processing", "completed", "error", "awaiting_decision"
+    status: str  # "uploading", "queued", "processing", "awaiting_decision", "paused", "completed", "cancelled", "error"
     progress: Dict[str, Any]
     current_song: Optional[Dict[str, Any]] = None
     pending_decision: Optional[Dict[str, Any]] = None
@@ -149,6 +374,16 @@ class MatchDecision(BaseModel):
     session_id: str
     action: str  # "accept", "reject", "skip"
     selected_track_id: Optional[str] = None
+    decision_id: Optional[str] = None  # Oldest pending decision if omitted
+
+class DecisionAnswer(BaseModel):
+    decision_id: str
+    action: str  # "accept", "reject", "skip"
+    selected_track_id: Optional[str] = None
+
+class DecisionBatch(BaseModel):
+    session_id: str
+    decisions: List[DecisionAnswer]
 
 class MigrationResult(BaseModel):
     session_id: str
@@ -160,300 +395,1113 @@ class MigrationResult(BaseModel):
     results: List[Dict[str, Any]]
     rejected_songs: List[Dict[str, Any]]
 
+class ResultsPage(BaseModel):
+    session_id: str
+    kind: str  # "results" or "rejected_songs"
+    items: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None  # None once the last page of a finished session was read
+
 @app.get("/")
 async def root():
     """Health check endpoint."""
     return {"message": "YT2Spot API is running!", "version": "1.0.0"}
 
 @app.post("/upload", response_model=Dict[str, Any])
-async def upload_file(file: UploadFile = File(...)):
-    """Upload music file and parse songs."""
-    if not file.filename:
-        raise HTTPException(status_code=400, detail="No file provided")
-    
-    # Validate file type
-    allowed_extensions = {'.txt', '.csv', '.json'}
-    file_extension = Path(file.filename).suffix.lower()
-    if file_extension not in allowed_extensions:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"Unsupported file type. Allowed: {', '.join(allowed_extensions)}"
+async def upload_file(request: Request):
+    """
+    Upload music file and parse songs.
+    
+    Returns a preview and a ``file_token`` that /migrate/start accepts in
+    place of the file while the parse stays cached.
+    """
+    # Songs are parsed while the upload streams in; the preview is kept in
+    # memory and the full list goes to the parse cache
+    preview = []
+    partial = parse_cache.partial_path(str(uuid.uuid4()))
+    
+    try:
+        with open(partial, "wb") as songs_file:
+            def keep_song(song, file_index: int):
+                if len(preview) < 10:
+                    preview.append(asdict(song))
+                songs_file.write(dumps(asdict(song)) + b"\n")
+            
+            upload = await parse_upload(request, keep_song, MAX_UPLOAD_BYTES)
+    except UploadError as e:
+        partial.unlink(missing_ok=True)
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+    
+    file = upload.files[0]
+    cached = await run_in_threadpool(parse_cache.put, file.digest, partial, file.filename, file.songs)
+    return {
+        "filename": upload.filename,
+        "total_songs": upload.songs,
+        "songs": preview,  # Preview first 10
+        "preview_truncated": upload.songs > 10,
+        "file_token": file.digest if cached else None  # None if too large to cache
+    }
+
+def _record_queued(session_id: str, config: Dict[str, Any], progress: Dict[str, Any], event: Dict[str, Any]):
+    """Store a newly queued session and journal it; blocks on the state database."""
+    state_store.save_session(session_id, "queued", config=config, progress=progress)
+    state_store.log_event(session_id, "queued", event)
+
+@app.post("/migrate/start", response_model=Dict[str, Any])
+async def start_migration(request: Request):
+    """
+    Start a new migration session.
+    
+    Takes a multipart upload with the file and an optional ``config`` JSON
+    field. The file is parsed as it streams in, and the session reports
+    status "uploading" with bytes and songs read until the upload is done.
+    
+    A file already sent to /upload needn't be sent again: post JSON with
+    its ``file_token`` and ``config`` instead, and the cached parse is used.
+    """
+    session_id = str(uuid.uuid4())
+    songs_path = session_store.session_file(session_id, "songs.jsonl")
+    songs_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    await run_in_threadpool(shared_state.create_session, session_id, {
+        "status": "uploading",
+        "progress": {"bytes_read": 0, "bytes_total": None, "songs_parsed": 0},
+        "current_song": None,
+        "pending_decision": None,
+        "created_at": datetime.utcnow()
+    })
+    
+    def report_upload(bytes_read: int, bytes_total: Optional[int], songs: int):
+        shared_state.update_session(
+            session_id,
+            progress={"bytes_read": bytes_read, "bytes_total": bytes_total, "songs_parsed": songs}
         )
     
+    def discard_upload():
+        shared_state.delete_session(session_id)
+        session_store.discard(session_id)
+    
     try:
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as tmp_file:
-            content = await file.read()
-            tmp_file.write(content)
-            tmp_file_path = tmp_file.name
-        
-        # Parse the file using existing logic
-        songs = parse_input_file(tmp_file_path)
-        
-        # Clean up temp file
-        os.unlink(tmp_file_path)
-        
-        return {
-            "filename": file.filename,
-            "total_songs": len(songs),
-            "songs": [song.model_dump() for song in songs[:10]],  # Preview first 10
-            "preview_truncated": len(songs) > 10
-        }
-        
+        if request.headers.get("content-type", "").startswith("application/json"):
+            try:
+                start = MigrationFromUploadRequest.model_validate_json(await request.body())
+            except ValueError as e:
+                raise HTTPException(status_code=422, detail=f"Invalid migration request: {e}")
+            cached = await run_in_threadpool(parse_cache.link, start.file_token, songs_path)
+            if cached is None:
+                raise HTTPException(status_code=404, detail="Unknown or expired file token; upload the file again")
+            config, filename, total_songs = start.config, cached.filename, cached.songs
+        else:
+            # Parsed songs go straight to the session's song file. Each song is
+            # encoded once here; results embed these bytes as they are
+            with open(songs_path, "wb") as songs_file:
+                def store_song(song, file_index: int):
+                    songs_file.write(dumps(asdict(song)) + b"\n")
+                
+                upload = await parse_upload(request, store_song, MAX_UPLOAD_BYTES, report_upload)
+            filename, total_songs = upload.filename, upload.songs
+            
+            # Settings arrive as a JSON form field next to the uploaded file
+            try:
+                config = MigrationStartRequest.model_validate_json(upload.fields.get("config", "{}"))
+            except ValueError as e:
+                raise HTTPException(status_code=422, detail=f"Invalid migration config: {e}")
+    except UploadError as e:
+        discard_upload()
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except HTTPException:
+        discard_upload()
+        raise
     except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Error parsing file: {str(e)}")
+        discard_upload()
+        raise HTTPException(status_code=400, detail=f"Error starting migration: {str(e)}")
+    
+    # Initialize session; whichever process claims the job runs it
+    progress = {
+        "current": 0,
+        "total": total_songs,
+        "successful": 0,
+        "rejected": 0,
+        "skipped": 0,
+        "pending_decisions": 0
+    }
+    await run_in_threadpool(
+        shared_state.update_session,
+        session_id,
+        status="queued",
+        config=config.model_dump(),
+        progress=progress,
+        songs_file=str(songs_path)
+    )
+    
+    # Hand the migration to the worker pool
+    try:
+        job_runner.submit(session_id)
+    except QueueFull:
+        discard_upload()
+        raise HTTPException(
+            status_code=503,
+            detail="Too many migrations queued, try again shortly",
+            headers={"Retry-After": "30"}
+        )
+    
+    await run_in_threadpool(_record_queued, session_id, config.model_dump(), progress, {"filename": filename})
+    
+    return {"session_id": session_id, "total_songs": total_songs}
 
-@app.post("/migrate/start", response_model=Dict[str, str])
-async def start_migration(
-    background_tasks: BackgroundTasks,
-    request: MigrationStartRequest,
-    file: UploadFile = File(...)
-):
-    """Start a new migration session."""
-    session_id = str(uuid.uuid4())
+@app.post("/migrate/bulk", response_model=Dict[str, Any])
+async def start_bulk_migration(request: Request):
+    """
+    Start one migration per uploaded file, each into its own playlist.
+    
+    Takes a multipart upload with up to MAX_BULK_FILES files and an optional
+    ``config`` JSON field. Every file becomes a session of its own, named
+    after the file; sessions of one bulk job share a match index, so a song
+    in several files is searched once.
+    """
+    bulk_id = str(uuid.uuid4())
+    # A file's session is made when it yields its first song; each file's
+    # parser thread only writes to its own song file
+    children: Dict[int, Tuple[str, Any]] = {}
+    
+    def store_song(song, file_index: int):
+        child = children.get(file_index)
+        if child is None:
+            session_id = str(uuid.uuid4())
+            songs_path = session_store.session_file(session_id, "songs.jsonl")
+            songs_path.parent.mkdir(parents=True, exist_ok=True)
+            child = children[file_index] = (session_id, open(songs_path, "wb"))
+        child[1].write(dumps(asdict(song)) + b"\n")
+    
+    def discard_children():
+        for session_id, _ in children.values():
+            session_store.discard(session_id)
     
     try:
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=Path(file.filename).suffix) as tmp_file:
-            content = await file.read()
-            tmp_file.write(content)
-            tmp_file_path = tmp_file.name
-        
-        # Parse songs
-        songs = parse_input_file(tmp_file_path)
+        try:
+            upload = await parse_upload(request, store_song, MAX_UPLOAD_BYTES, max_files=MAX_BULK_FILES)
+        finally:
+            for _, songs_file in children.values():
+                songs_file.close()
+        try:
+            config = BulkMigrationRequest.model_validate_json(upload.fields.get("config", "{}"))
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=f"Invalid migration config: {e}")
+    except UploadError as e:
+        discard_children()
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except HTTPException:
+        discard_children()
+        raise
+    
+    files = []
+    queue_full = False
+    base_config = config.model_dump(exclude={"playlist_prefix"})
+    for index, (filename, songs, _) in enumerate(upload.files):
+        entry = {"filename": filename, "total_songs": songs, "session_id": None}
+        files.append(entry)
+        if index not in children:
+            entry["error"] = "No songs found"
+            continue
         
-        # Initialize session
-        migration_sessions[session_id] = {
-            "status": "processing",
-            "songs": songs,
-            "config": request.model_dump(),
-            "results": [],
-            "rejected_songs": [],
-            "progress": {
-                "current": 0,
-                "total": len(songs),
-                "successful": 0,
-                "rejected": 0,
-                "skipped": 0
-            },
+        session_id, songs_file = children[index]
+        child_config = {
+            **base_config,
+            "playlist_name": config.playlist_prefix + playlist_name_for(Path(filename)),
+            "bulk_id": bulk_id
+        }
+        progress = {
+            "current": 0,
+            "total": songs,
+            "successful": 0,
+            "rejected": 0,
+            "skipped": 0,
+            "pending_decisions": 0
+        }
+        await run_in_threadpool(shared_state.create_session, session_id, {
+            "status": "queued",
+            "config": child_config,
+            "progress": progress,
             "current_song": None,
             "pending_decision": None,
-            "created_at": datetime.utcnow(),
-            "temp_file": tmp_file_path
-        }
+            "songs_file": songs_file.name,
+            "created_at": datetime.utcnow()
+        })
+        try:
+            job_runner.submit(session_id)
+        except QueueFull:
+            shared_state.delete_session(session_id)
+            session_store.discard(session_id)
+            queue_full = True
+            entry["error"] = "Too many migrations queued"
+            continue
         
-        # Start migration in background
-        background_tasks.add_task(process_migration, session_id)
-        
-        return {"session_id": session_id, "total_songs": len(songs)}
-        
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Error starting migration: {str(e)}")
+        entry["session_id"] = session_id
+        entry["playlist_name"] = child_config["playlist_name"]
+        await run_in_threadpool(_record_queued, session_id, child_config, progress, {"filename": filename, "bulk_id": bulk_id})
+    
+    if not any(entry["session_id"] for entry in files):
+        if queue_full:
+            raise HTTPException(
+                status_code=503,
+                detail="Too many migrations queued, try again shortly",
+                headers={"Retry-After": "30"}
+            )
+        raise HTTPException(status_code=400, detail="No songs found in the uploaded files")
+    
+    # The job itself is only a list of its files' sessions
+    await run_in_threadpool(state_store.save_session, bulk_id, "bulk", config={"source": "web-bulk", "files": files})
+    return {"bulk_id": bulk_id, "files": files}
+
+@app.get("/migrate/bulk/{bulk_id}")
+def get_bulk_status(bulk_id: str):
+    """Get the status of every file of a bulk migration."""
+    stored = state_store.get_session(bulk_id)
+    if stored is None or stored["status"] != "bulk":
+        raise HTTPException(status_code=404, detail="Bulk migration not found")
+    
+    files = []
+    for entry in stored["config"]["files"]:
+        entry = {**entry, "status": None}  # None if never started or expired
+        if entry["session_id"] is not None:
+            try:
+                entry["status"] = _status_snapshot(entry["session_id"])
+            except HTTPException:
+                pass
+        files.append(entry)
+    
+    # Paused files are not done: they can still be resumed
+    statuses = [entry["status"]["status"] for entry in files if entry["status"]]
+    return {
+        "bulk_id": bulk_id,
+        "done": all(status in ("completed", "cancelled", "error") for status in statuses),
+        "files": files
+    }
+
+def _iter_session_songs(path: str, start: int = 0):
+    """Yield (song, encoded song) for a session's upload, from index ``start`` on."""
+    with open(path, "rb") as songs_file:
+        for i, line in enumerate(songs_file):
+            if i >= start:
+                song_json = line.rstrip(b"\n")
+                yield SongInput(**loads(song_json)), song_json
+
+def _status_snapshot(session_id: str) -> Dict[str, Any]:
+    """Build the status of a session from this process, shared state or the state store."""
+    session = session_store.get(session_id) or shared_state.get_session(session_id)
+    if session is None:
+        # Sessions from before a restart are only in the state store
+        stored = state_store.get_session(session_id)
+        if stored is None:
+            raise HTTPException(status_code=404, detail="Session not found")
+        return {
+            "session_id": session_id,
+            "status": stored["status"],
+            "progress": stored["progress"],
+            "current_song": None,
+            "pending_decision": None
+        }
+    
+    return {
+        "session_id": session_id,
+        "status": session["status"],
+        "progress": dict(session["progress"]),
+        "current_song": session["current_song"],
+        "pending_decision": session["pending_decision"]
+    }
+
+def _publish(session_id: str, snapshot: Optional[Dict[str, Any]] = None):
+    """Mirror a running session to shared state and push it to subscribers."""
+    if snapshot is None:
+        snapshot = _status_snapshot(session_id)
+    shared_state.update_session(
+        session_id,
+        status=snapshot["status"],
+        progress=snapshot["progress"],
+        current_song=snapshot["current_song"],
+        pending_decision=snapshot["pending_decision"]
+    )
+    progress_broker.publish(session_id, lambda: snapshot)
+
+def _publish_progress(session_id: str, session: Dict[str, Any]):
+    """
+    Publish a running session's per-song progress.
+
+    Subscribers in this process get every update, but the shared-state
+    write, which takes the database write lock, is coalesced to one every
+    PUBLISH_EVERY_SONGS songs or PUBLISH_INTERVAL seconds, and done at once
+    when the status or the pending decision changed.
+    """
+    now = time.monotonic()
+    state = (session["status"], session["pending_decision"])
+    current = session["progress"]["current"]
+    last = session.get("published")
+    if (
+        last is None
+        or last["state"] != state
+        or current - last["current"] >= PUBLISH_EVERY_SONGS
+        or now - last["at"] >= PUBLISH_INTERVAL
+    ):
+        session["published"] = {"at": now, "current": current, "state": state}
+        _publish(session_id)
+    else:
+        progress_broker.publish(session_id, lambda: _status_snapshot(session_id))
 
 @app.get("/migrate/status/{session_id}", response_model=MigrationStatus)
-async def get_migration_status(session_id: str):
+def get_migration_status(session_id: str):
     """Get current status of migration session."""
-    if session_id not in migration_sessions:
+    # Polled often; the snapshot is plain JSON data, so skip model validation
+    return JSONBytesResponse(_status_snapshot(session_id))
+
+@app.get("/migrate/events/{session_id}")
+def stream_migration_events(session_id: str):
+    """Stream status snapshots as Server-Sent Events until the session ends."""
+    snapshot = _status_snapshot(session_id)
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    
+    if session_id in session_store:
+        stream = stream_session(progress_broker, session_id, lambda: _status_snapshot(session_id))
+    elif shared_state.get_session(session_id) is not None:
+        # Queued, or running in another server process
+        stream = poll_session(lambda: _status_snapshot(session_id))
+    else:
+        # Not running anywhere, so nothing will change
+        stream = iter([format_sse(snapshot)])
+    
+    return StreamingResponse(stream, media_type="text/event-stream", headers=headers)
+
+def _wake_owner(session_id: str):
+    """Wake the worker running a session if it runs in this process."""
+    session = session_store.get(session_id)
+    if session is not None:
+        session["wakeup"].set()
+
+@app.get("/migrate/decisions/{session_id}")
+def get_pending_decisions(session_id: str, limit: int = Query(20, ge=1, le=MAX_DECISION_BATCH)):
+    """
+    Get a batch of decisions waiting for the user, oldest first.
+    
+    Matching continues while decisions wait; ``pending`` counts all of them.
+    """
+    snapshot = _status_snapshot(session_id)
+    return {
+        "session_id": session_id,
+        "pending": snapshot["progress"].get("pending_decisions", 0),
+        "decisions": shared_state.list_decisions(session_id, limit)
+    }
+
+@app.post("/migrate/decisions")
+def submit_decisions(batch: DecisionBatch):
+    """Answer a batch of pending decisions."""
+    if shared_state.get_session(batch.session_id) is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    session = migration_sessions[session_id]
+    accepted = shared_state.answer_decisions(batch.session_id, {
+        answer.decision_id: answer.model_dump(exclude={"decision_id"})
+        for answer in batch.decisions
+    })
+    _wake_owner(batch.session_id)
     
-    return MigrationStatus(
-        session_id=session_id,
-        status=session["status"],
-        progress=session["progress"],
-        current_song=session["current_song"],
-        pending_decision=session["pending_decision"]
-    )
+    # Decisions already answered or unknown are ignored
+    return {"accepted": accepted, "ignored": len(batch.decisions) - accepted}
 
 @app.post("/migrate/decision")
-async def submit_decision(decision: MatchDecision):
+def submit_decision(decision: MatchDecision):
     """Submit user decision for ambiguous match."""
-    if decision.session_id not in migration_sessions:
+    if shared_state.get_session(decision.session_id) is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    session = migration_sessions[decision.session_id]
+    decision_id = decision.decision_id
+    if decision_id is None:
+        oldest = shared_state.list_decisions(decision.session_id, 1)
+        if not oldest:
+            raise HTTPException(status_code=400, detail="Session not awaiting decision")
+        decision_id = oldest[0]["decision_id"]
     
-    if session["status"] != "awaiting_decision":
-        raise HTTPException(status_code=400, detail="Session not awaiting decision")
-    
-    # Store the decision and resume processing
-    session["user_decision"] = decision.model_dump()
-    session["status"] = "processing"
-    session["pending_decision"] = None
+    answer = decision.model_dump(exclude={"session_id", "decision_id"})
+    if not shared_state.answer_decisions(decision.session_id, {decision_id: answer}):
+        raise HTTPException(status_code=400, detail="Decision is not pending")
+    _wake_owner(decision.session_id)
     
     return {"message": "Decision submitted"}
 
-@app.get("/migrate/results/{session_id}", response_model=MigrationResult)
-async def get_migration_results(session_id: str):
-    """Get final migration results."""
-    if session_id not in migration_sessions:
+def _interrupt(session_id: str, control: str):
+    """Stop a session running in this process at its next checkpoint."""
+    session = session_store.get(session_id)
+    if session is not None:
+        session["control"] = control
+        session["wakeup"].set()
+        # Its queued Spotify requests give their turns to other sessions
+        spotify_scheduler.release(session_id)
+
+@app.post("/migrate/{session_id}/pause")
+def pause_migration(session_id: str):
+    """
+    Pause a queued or running migration.
+    
+    A running migration stops at its next checkpoint, frees its worker and
+    Spotify request budget, and keeps its results and queued decisions.
+    Decisions can still be answered while it is paused.
+    """
+    if shared_state.get_session(session_id) is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    if shared_state.transition(session_id, ("queued",), status="paused") is not None:
+        state_store.save_session(session_id, "paused")
+        state_store.log_event(session_id, "paused")
+        _publish(session_id)
+        return {"message": "Migration paused"}
+    
+    if shared_state.transition(session_id, ("processing", "awaiting_decision"), control="pause") is None:
+        raise HTTPException(status_code=409, detail="Migration is not running")
+    _interrupt(session_id, "pause")
+    
+    # The worker publishes "paused" once it stopped
+    return {"message": "Migration pausing"}
+
+@app.post("/migrate/{session_id}/resume")
+def resume_migration(session_id: str):
+    """Queue a paused migration again; it continues after the last processed song."""
+    if shared_state.get_session(session_id) is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    if shared_state.transition(session_id, ("paused",), status="queued", control=None) is None:
+        raise HTTPException(status_code=409, detail="Migration is not paused")
+    
+    try:
+        job_runner.submit(session_id)
+    except QueueFull:
+        shared_state.transition(session_id, ("queued",), status="paused")
+        raise HTTPException(
+            status_code=503,
+            detail="Too many migrations queued, try again shortly",
+            headers={"Retry-After": "30"}
+        )
+    
+    state_store.save_session(session_id, "queued")
+    state_store.log_event(session_id, "resumed")
+    _publish(session_id)
+    return {"message": "Migration resumed"}
+
+@app.post("/migrate/{session_id}/cancel")
+def cancel_migration(session_id: str):
+    """
+    Cancel a migration that has not finished.
+    
+    Songs processed so far stay in the results; the rest are not matched.
+    """
+    if shared_state.get_session(session_id) is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    session = migration_sessions[session_id]
+    shared = shared_state.transition(session_id, ("queued", "paused"), status="cancelled", current_song=None)
+    if shared is not None:
+        # Nothing runs it, so finish it here
+        session = session_store.create(session_id, shared)
+        _finalize_cancelled(session_id, session)
+        _publish(session_id)
+        return {"message": "Migration cancelled"}
+    
+    if shared_state.transition(session_id, ("processing", "awaiting_decision"), control="cancel") is None:
+        raise HTTPException(status_code=409, detail="Migration already finished")
+    _interrupt(session_id, "cancel")
+    
+    # The worker publishes "cancelled" once it stopped
+    return {"message": "Migration cancelling"}
+
+@app.get("/migrate/results/{session_id}", response_model=MigrationResult)
+def get_migration_results(session_id: str):
+    """
+    Get final migration results.
+    
+    Returns every entry at once, which is slow for large sessions; use
+    /migrate/results/{session_id}/page or /export for those. Runs on the
+    threadpool so building the response never stalls the event loop.
+    """
+    session = session_store.get(session_id) or shared_state.get_session(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found")
     
-    if session["status"] not in ["completed", "error"]:
+    if session["status"] not in ["completed", "cancelled", "error"]:
         raise HTTPException(status_code=400, detail="Migration not completed")
     
     progress = session["progress"]
     total = progress["total"]
     successful = progress["successful"]
     
-    return MigrationResult(
-        session_id=session_id,
-        total_songs=total,
-        successful=successful,
-        rejected=progress["rejected"],
-        skipped=progress["skipped"],
-        success_rate=successful / total * 100 if total > 0 else 0,
-        results=session["results"],
-        rejected_songs=session["rejected_songs"]
+    # Stored entries are already JSON, so they are spliced in undecoded
+    summary = dumps({
+        "session_id": session_id,
+        "total_songs": total,
+        "successful": successful,
+        "rejected": progress["rejected"],
+        "skipped": progress["skipped"],
+        "success_rate": successful / total * 100 if total > 0 else 0
+    })
+    results = encode_array(session_store.iter_result_lines(session_id, "results"))
+    rejected = encode_array(session_store.iter_result_lines(session_id, "rejected_songs"))
+    return JSONBytesResponse(
+        summary[:-1] + b',"results":' + results + b',"rejected_songs":' + rejected + b"}"
     )
 
-async def process_migration(session_id: str):
-    """Background task to process migration."""
-    session = migration_sessions[session_id]
+def _result_filter(action: Optional[str], reason: Optional[str]):
+    """Build a predicate for result entries, or None when nothing is filtered."""
+    if action is None and reason is None:
+        return None
+    reason = reason.lower() if reason is not None else None
+    
+    def match(entry: Dict[str, Any]) -> bool:
+        if action is not None and entry.get("action") != action:
+            return False
+        if reason is not None and reason not in (entry.get("reason") or "").lower():
+            return False
+        return True
+    
+    return match
+
+def _check_results(session_id: str, kind: str):
+    """Reject unknown result kinds and sessions."""
+    if kind not in RESULT_KINDS:
+        raise HTTPException(status_code=400, detail=f"kind must be one of: {', '.join(RESULT_KINDS)}")
+    if session_store.get(session_id) is None and shared_state.get_session(session_id) is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+@app.get("/migrate/results/{session_id}/page", response_model=ResultsPage)
+def get_migration_results_page(
+    session_id: str,
+    kind: str = "results",
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    action: Optional[str] = None,
+    reason: Optional[str] = None
+):
+    """
+    Page through a session's results or rejected songs.
     
+    Pass the returned ``next_cursor`` to get the following page. Results
+    can be filtered by exact ``action`` (e.g. "liked") and rejected songs
+    by a case-insensitive substring of their ``reason``. Pages are read
+    while the session runs too: its last page then returns a cursor to
+    the end, where the results added later show up.
+    """
+    _check_results(session_id, kind)
+    session = session_store.get(session_id) or shared_state.get_session(session_id) or {}
+    finished = session.get("status") in ("completed", "cancelled", "error")
     try:
-        songs = session["songs"]
-        config_dict = session["config"]
-        
-        # Initialize Spotify client
-        config_manager = ConfigManager()
-        config = config_manager.create_session_config("dummy_input")
-        spotify_client = SpotifyClient(config)
-        
-        if not spotify_client.authenticate():
-            session["status"] = "error"
-            session["error"] = "Failed to authenticate with Spotify"
-            return
-        
-        # Process each song
-        for i, song in enumerate(songs):
-            session["progress"]["current"] = i + 1
-            session["current_song"] = {
-                "title": song.title,
-                "artist": song.artist,
-                "album": song.album or "",
-                "index": i + 1,
-                "total": len(songs)
+        offset = int(cursor) if cursor else 0
+        if offset < 0:
+            raise ValueError(cursor)
+        lines, next_offset = session_store.read_page_lines(
+            session_id, kind, offset, limit, _result_filter(action, reason), follow=not finished
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    next_cursor = str(next_offset) if next_offset is not None else None
+    page = dumps({"session_id": session_id, "kind": kind})
+    return JSONBytesResponse(
+        page[:-1] + b',"items":' + encode_array(lines) + b',"next_cursor":' + dumps(next_cursor) + b"}"
+    )
+
+@app.get("/migrate/results/{session_id}/export")
+def export_migration_results(
+    session_id: str,
+    kind: str = "results",
+    action: Optional[str] = None,
+    reason: Optional[str] = None
+):
+    """Stream a session's results or rejected songs as NDJSON, one entry per line."""
+    _check_results(session_id, kind)
+    match = _result_filter(action, reason)
+    
+    def lines():
+        for line in session_store.iter_result_lines(session_id, kind):
+            # Stored lines are already NDJSON; only filtering needs to decode them
+            if match is None or match(loads(line)):
+                yield line
+    
+    return StreamingResponse(
+        lines(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{session_id}-{kind}.ndjson"'}
+    )
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """Expose counters and histograms in the Prometheus text format."""
+    SESSIONS.clear()
+    for status, count in session_store.count_by_status().items():
+        SESSIONS.set(count, status=status)
+    for state, count in job_runner.stats().items():
+        if state != "workers":
+            JOBS.set(count, state=state)
+    queued = {"interactive": 0, "bulk": 0}
+    for depths in spotify_scheduler.stats()["sessions"].values():
+        for priority in queued:
+            queued[priority] += depths[priority]
+    for priority, count in queued.items():
+        SPOTIFY_QUEUED.set(count, priority=priority)
+    
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/migrate/stats")
+def get_migration_stats():
+    """Report resident sessions, result memory, worker pool and Spotify request usage."""
+    return {
+        "sessions": session_store.metrics(),
+        "jobs": job_runner.stats(),
+        "spotify": spotify_scheduler.stats(),
+        "parse_cache": parse_cache.stats()
+    }
+
+def _get_spotify_client(config):
+    """Return this process's authenticated Spotify client, or None if authentication fails."""
+    global _spotify_client
+    with _spotify_client_lock:
+        if _spotify_client is None:
+            client = SpotifyClient(config)
+            if client.authenticate():
+                _spotify_client = client
+        return _spotify_client
+
+def _match_index(bulk_id: Optional[str]) -> Optional[SharedMatchIndex]:
+    """Return the match index shared by the running files of a bulk job."""
+    if bulk_id is None:
+        return None
+    with _bulk_indexes_lock:
+        index = _bulk_indexes.get(bulk_id)
+        if index is None:
+            index = _bulk_indexes[bulk_id] = SharedMatchIndex()
+        return index
+
+def _find_candidates(song, spotify_client, config, index: Optional[SharedMatchIndex]):
+    """Search and score a song, once per bulk job when it has a match index."""
+    def search():
+        candidates = search_spotify_tracks(song, spotify_client, config, state_store)
+        if candidates:
+            candidates = score_candidates(song, candidates, config)
+        return candidates
+    
+    if index is None:
+        return search()
+    return index.candidates(song, search)
+
+def _fill_playlist(session_id: str, session: Dict[str, Any], spotify_client):
+    """Add a finished session's matches to its playlist, creating it if needed.
+
+    Tracks an existing playlist already has are not added again.
+    """
+    config_dict = session["config"]
+    track_ids = list(dict.fromkeys(
+        entry["matched_track_id"] for entry in session_store.iter_results(session_id, "results")
+    ))
+    if not track_ids:
+        return
+    
+    name = config_dict["playlist_name"]
+    existing = spotify_client.get_playlist_by_name(name)
+    if existing is not None:
+        playlist_id = existing["id"]
+        # A re-run adds only what the playlist doesn't have yet
+        present = spotify_client.get_playlist_track_ids(playlist_id)
+        if present is None:
+            raise RuntimeError(f"Could not read playlist '{name}'")
+        track_ids = [track_id for track_id in track_ids if track_id not in present]
+    else:
+        playlist_id = spotify_client.create_playlist(
+            name,
+            description="Migrated from YouTube Music by YT2Spot",
+            public=config_dict.get("public", False)
+        )
+    if playlist_id is None:
+        raise RuntimeError(f"Could not create playlist '{name}'")
+    if track_ids and not spotify_client.add_tracks_to_playlist(playlist_id, track_ids):
+        raise RuntimeError(f"Could not add tracks to playlist '{name}'")
+    session["progress"]["playlist_id"] = playlist_id
+    session["progress"]["playlist_tracks"] = len(track_ids)
+
+def _candidate_info(candidate) -> Dict[str, Any]:
+    """Describe a scored candidate for the decision prompt."""
+    return {
+        "spotify_id": candidate.spotify_id,
+        "title": candidate.title,
+        "artist": candidate.all_artists,
+        "album": candidate.album,
+        "match_score": candidate.match_score,
+        "preview_url": candidate.preview_url,
+        "external_url": candidate.spotify_url
+    }
+
+def _queue_decision(session_id: str, session: Dict[str, Any], waiting: Dict[str, Any], decision_id: str, song, song_json: bytes, candidates):
+    """Queue an uncertain match for the user; matching carries on meanwhile."""
+    candidates = candidates[:OFFERED_CANDIDATES]
+    payload = {
+        "decision_id": decision_id,
+        "song": asdict(song),
+        "candidates": [_candidate_info(c) for c in candidates]
+    }
+    shared_state.add_decision(session_id, decision_id, payload)
+    waiting[decision_id] = (song, candidates, payload, time.monotonic(), song_json)
+    session["progress"]["pending_decisions"] = len(waiting)
+    if session["pending_decision"] is None:
+        session["pending_decision"] = payload
+
+def _resolve_decision(song, candidates, answer: Dict[str, Any]) -> TrackDecision:
+    """Turn the user's answer to a queued decision into a match decision."""
+    selected_id = answer.get("selected_track_id")
+    chosen = next((c for c in candidates if c.spotify_id == selected_id), None)
+    if chosen is None and selected_id is None and candidates:
+        chosen = candidates[0]  # "Accept best match"
+    if answer.get("action") == "accept" and chosen is not None:
+        return TrackDecision(
+            input_song=song,
+            chosen_candidate=chosen,
+            decision="manual_accept",
+            confidence=chosen.match_score,
+            reason="Accepted by user"
+        )
+    if answer.get("action") == "skip":
+        return TrackDecision(input_song=song, decision="skipped", reason="Skipped by user")
+    return TrackDecision(input_song=song, decision="manual_reject", reason="User rejected")
+
+def _apply_answers(session_id: str, session: Dict[str, Any], waiting: Dict[str, Any], spotify_client, dry_run: bool) -> bool:
+    """Apply answers posted for queued decisions; return whether any were."""
+    answers = shared_state.take_answers(session_id)
+    for index, (decision_id, answer) in enumerate(answers):
+        entry = waiting.get(decision_id)
+        if entry is None:
+            continue
+        song, candidates, _, queued_at, song_json = entry
+        try:
+            # The user is waiting on these, so they go ahead of bulk matching
+            with spotify_client.interactive():
+                _settle(session_id, _resolve_decision(song, candidates, answer), spotify_client, dry_run, song_json)
+        except RequestCancelled:
+            # Paused or cancelled: answers not applied yet wait for the resumed run
+            for decision_id, answer in answers[index:]:
+                if decision_id in waiting:
+                    shared_state.add_decision(session_id, decision_id, waiting[decision_id][2])
+                    shared_state.answer_decisions(session_id, {decision_id: answer})
+            raise
+        del waiting[decision_id]
+        DECISION_WAIT_SECONDS.observe(time.monotonic() - queued_at)
+    
+    session["progress"]["pending_decisions"] = len(waiting)
+    session["pending_decision"] = next(iter(waiting.values()))[2] if waiting else None
+    return bool(answers)
+
+def _apply_decision(session_id: str, decision: TrackDecision, spotify_client, dry_run: bool, song_json: bytes):
+    """Like the chosen track and update the session's progress and results."""
+    # The song is embedded as it was encoded in the session's song file
+    raw = {"song": song_json}
+    session = session_store.get(session_id)
+    progress = session["progress"]
+    
+    if decision.is_matched:
+        chosen = decision.chosen_candidate
+        # Playlist sessions add their matches in one go once they finish
+        to_playlist = session["config"].get("playlist_name") is not None
+        if not dry_run and not to_playlist:
+            spotify_client.like_track(chosen.spotify_id)
+        progress["successful"] += 1
+        MIGRATION_SONGS.inc(outcome="matched")
+        action = "added" if to_playlist else "liked"
+        session_store.append_result(session_id, "results", {
+            "matched_track_id": chosen.spotify_id,
+            "match_score": chosen.match_score,
+            "action": f"auto_{action}" if decision.decision == "auto_accept" else action
+        }, raw=raw)
+    elif decision.decision == "skipped":
+        progress["skipped"] += 1
+        MIGRATION_SONGS.inc(outcome="skipped")
+    else:
+        progress["rejected"] += 1
+        MIGRATION_SONGS.inc(outcome="rejected")
+        session_store.append_result(session_id, "rejected_songs", {
+            "reason": decision.reason,
+            "best_score": decision.confidence
+        }, raw=raw)
+
+def _settle(session_id: str, decision: TrackDecision, spotify_client, dry_run: bool, song_json: bytes):
+    """Apply and record a final decision, rejecting the song if that fails."""
+    try:
+        _apply_decision(session_id, decision, spotify_client, dry_run, song_json)
+        state_store.record_decision(session_id, decision)
+    except RequestCancelled:
+        raise  # Nothing was recorded; the decision is applied on resume
+    except Exception as e:
+        _reject_on_error(session_id, song_json, e)
+
+def _reject_on_error(session_id: str, song_json: bytes, error: Exception):
+    """Count a song that failed to process as rejected."""
+    session_store.get(session_id)["progress"]["rejected"] += 1
+    MIGRATION_SONGS.inc(outcome="error")
+    session_store.append_result(session_id, "rejected_songs", {
+        "reason": f"Error: {str(error)}"
+    }, raw={"song": song_json})
+
+def _next_poll(delay: float, found: bool) -> float:
+    """Return the delay until the next poll for answers from other processes."""
+    return DECISION_POLL_MIN if found else min(delay * 2, DECISION_POLL_MAX)
+
+def _check_control(session_id: str, session: Dict[str, Any]) -> Optional[str]:
+    """Pick up a pause or cancel request posted to any process."""
+    shared = shared_state.get_session(session_id)
+    control = shared.get("control") if shared is not None else "cancel"  # Discarded
+    if control is not None:
+        session["control"] = control
+    return session["control"]
+
+def _checkpoint_path(session_id: str) -> Path:
+    return session_store.session_file(session_id, "checkpoint.json")
+
+def _save_checkpoint(session_id: str, session: Dict[str, Any], waiting: Dict[str, Any]):
+    """Record the next song of a session, its results so far and the decisions it waits on."""
+    now = time.monotonic()
+    checkpoint = {
+        "next_song": session["next_song"],
+        "progress": session["progress"],
+        # Results past these lengths are dropped if the session is recovered
+        "results": session_store.flush(session_id),
+        "waiting": [
+            {
+                "decision_id": decision_id,
+                "song": asdict(song),
+                "candidates": [asdict(c) for c in candidates],
+                "payload": payload,
+                "waited": now - queued_at
             }
-            
-            try:
-                # Search for matches
-                candidates = search_spotify_tracks(spotify_client, song, config_dict["max_candidates"])
-                
-                if not candidates:
-                    # No matches found
-                    session["progress"]["rejected"] += 1
-                    session["rejected_songs"].append({
-                        "song": song.model_dump(),
-                        "reason": "No matches found"
-                    })
-                    continue
-                
-                # Score candidates
-                scored_candidates = score_candidates(song, candidates)
-                
-                # Make decision
-                decision = make_decision(
-                    scored_candidates,
-                    config_dict["hard_threshold"],
-                    config_dict["reject_threshold"],
-                    interactive=True  # Always interactive for web UI
-                )
-                
-                if decision["action"] == "prompt":
-                    # Wait for user decision
-                    session["status"] = "awaiting_decision"
-                    session["pending_decision"] = {
-                        "song": song.model_dump(),
-                        "candidates": [
-                            {
-                                "spotify_id": c.spotify_track.id,
-                                "title": c.spotify_track.name,
-                                "artist": ", ".join([artist.name for artist in c.spotify_track.artists]),
-                                "album": c.spotify_track.album.name,
-                                "match_score": c.match_score,
-                                "preview_url": c.spotify_track.preview_url,
-                                "external_url": c.spotify_track.external_urls.get("spotify")
-                            }
-                            for c in scored_candidates[:3]  # Top 3 matches
-                        ]
-                    }
-                    
-                    # Wait for user decision
-                    while session.get("status") == "awaiting_decision":
-                        await asyncio.sleep(1)
-                    
-                    # Process user decision
-                    user_decision = session.get("user_decision")
-                    if user_decision:
-                        if user_decision["action"] == "accept" and user_decision["selected_track_id"]:
-                            # Like the selected track
-                            if not config_dict["dry_run"]:
-                                spotify_client.like_track(user_decision["selected_track_id"])
-                            
-                            session["progress"]["successful"] += 1
-                            session["results"].append({
-                                "song": song.model_dump(),
-                                "matched_track_id": user_decision["selected_track_id"],
-                                "action": "liked"
-                            })
-                        else:
-                            session["progress"]["rejected"] += 1
-                            session["rejected_songs"].append({
-                                "song": song.model_dump(),
-                                "reason": "User rejected"
-                            })
-                    
-                    # Clear user decision
-                    session.pop("user_decision", None)
-                    
-                elif decision["action"] == "accept":
-                    # Auto-accept
-                    best_match = decision["track"]
-                    if not config_dict["dry_run"]:
-                        spotify_client.like_track(best_match.spotify_track.id)
-                    
-                    session["progress"]["successful"] += 1
-                    session["results"].append({
-                        "song": song.model_dump(),
-                        "matched_track_id": best_match.spotify_track.id,
-                        "match_score": best_match.match_score,
-                        "action": "auto_liked"
-                    })
-                    
-                else:
-                    # Auto-reject
-                    session["progress"]["rejected"] += 1
-                    session["rejected_songs"].append({
-                        "song": song.model_dump(),
-                        "reason": "Below threshold",
-                        "best_score": scored_candidates[0].match_score if scored_candidates else 0
-                    })
-                
-            except Exception as e:
-                session["progress"]["rejected"] += 1
-                session["rejected_songs"].append({
-                    "song": song.model_dump(),
-                    "reason": f"Error: {str(e)}"
-                })
-        
-        # Migration completed
-        session["status"] = "completed"
-        session["current_song"] = None
-        
-        # Clean up temp file
-        if "temp_file" in session:
-            try:
-                os.unlink(session["temp_file"])
-            except:
-                pass
-        
+            for decision_id, (song, candidates, payload, queued_at, _) in waiting.items()
+        ]
+    }
+    path = _checkpoint_path(session_id)
+    partial = path.with_suffix(".partial")
+    partial.write_text(json.dumps(checkpoint, default=str), encoding="utf-8")
+    os.replace(partial, path)
+
+def _read_checkpoint(session_id: str) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads(_checkpoint_path(session_id).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+
+def _restore_checkpoint(session: Dict[str, Any], checkpoint: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Set the song to continue from and the progress; return the restored decision queue."""
+    if checkpoint is None:
+        session["next_song"] = 0
+        return {}
+    
+    session["next_song"] = checkpoint["next_song"]
+    if "progress" in checkpoint:
+        session["progress"] = checkpoint["progress"]
+    
+    # Time spent paused counts as waiting for the user
+    now = time.monotonic()
+    waiting = {
+        entry["decision_id"]: (
+            SongInput(**entry["song"]),
+            [MatchCandidate(**c) for c in entry["candidates"]],
+            entry["payload"],
+            now - entry["waited"],
+            dumps(entry["song"])
+        )
+        for entry in checkpoint["waiting"]
+    }
+    session["progress"]["pending_decisions"] = len(waiting)
+    session["pending_decision"] = next(iter(waiting.values()))[2] if waiting else None
+    return waiting
+
+def _release_files(session_id: str, session: Dict[str, Any]):
+    """Start the TTL of a session that stopped for good and drop its run files."""
+    # Results stay available until the session's TTL runs out
+    session_store.finish(session_id)
+    
+    # The parsed upload is not needed once the session stopped
+    for path in (session["songs_file"], _checkpoint_path(session_id)):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+def _finalize_paused(session_id: str, session: Dict[str, Any], waiting: Dict[str, Any]) -> Dict[str, Any]:
+    """Checkpoint a paused session and free it; return its final snapshot."""
+    session["status"] = "paused"
+    session["current_song"] = None
+    _save_checkpoint(session_id, session, waiting)
+    state_store.save_session(session_id, "paused", progress=session["progress"])
+    state_store.log_event(session_id, "paused", {"next_song": session["next_song"]})
+    
+    # Results are spilled and the session leaves memory; any process can
+    # resume it. The snapshot is built first and published last, since a
+    # resume may start as soon as the status says "paused"
+    snapshot = _status_snapshot(session_id)
+    session_store.release(session_id)
+    return snapshot
+
+def _finalize_cancelled(session_id: str, session: Dict[str, Any]):
+    """Finish a cancelled session; the results so far are kept."""
+    session["status"] = "cancelled"
+    session["current_song"] = None
+    session["pending_decision"] = None
+    session["progress"]["pending_decisions"] = 0
+    shared_state.clear_decisions(session_id)
+    state_store.save_session(session_id, "cancelled", progress=session["progress"])
+    state_store.log_event(session_id, "cancelled")
+    _release_files(session_id, session)
+
+def process_migration(session_id: str):
+    """Run one migration; executes on a job runner worker thread."""
+    # A session still marked running was left by a worker whose job lease
+    # ran out, so its job was queued again
+    previous = (shared_state.get_session(session_id) or {}).get("status")
+    shared = shared_state.transition(session_id, ("queued", "processing", "awaiting_decision"), status="processing")
+    if shared is None:
+        return  # Paused, cancelled or expired while queued
+    
+    # This process now owns the live session. A resumed or recovered
+    # session continues its results, decision queue and position from its
+    # checkpoint; results written after it are written again
+    checkpoint = _read_checkpoint(session_id)
+    if checkpoint is not None:
+        session_store.rewind(session_id, checkpoint.get("results", {}))
+    session = session_store.create(session_id, {
+        **shared,
+        # Set when answers or a pause/cancel request reach this process
+        "wakeup": threading.Event(),
+        "control": None
+    })
+    waiting = _restore_checkpoint(session, checkpoint)
+    if checkpoint is None:
+        _save_checkpoint(session_id, session, waiting)
+    if previous in ("processing", "awaiting_decision"):
+        # Answers the dead worker took but did not checkpoint are asked again
+        for decision_id, (_, _, payload, _, _) in waiting.items():
+            shared_state.add_decision(session_id, decision_id, payload, replace=False)
+        state_store.log_event(session_id, "recovered", {"next_song": session["next_song"]})
+    state_store.save_session(session_id, "processing")
+    _publish(session_id)
+    
+    try:
+        _run_migration(session_id, session, waiting)
+    except RequestCancelled:
+        pass  # Interrupted mid-request; that song is processed on resume
     except Exception as e:
         session["status"] = "error"
         session["error"] = str(e)
+        state_store.save_session(session_id, "error", progress=session["progress"])
+        state_store.log_event(session_id, "error", {"error": str(e)})
+    
+    finally:
+        spotify_scheduler.unregister(session_id)
+        snapshot = None
+        if session["status"] in ("completed", "error"):
+            _release_files(session_id, session)
+        elif session["control"] == "pause":
+            snapshot = _finalize_paused(session_id, session, waiting)
+        else:
+            _finalize_cancelled(session_id, session)
+        MIGRATIONS.inc(status=session["status"])
+        _publish(session_id, snapshot)
+
+def _run_migration(session_id: str, session: Dict[str, Any], waiting: Dict[str, Any]):
+    """Process a session's songs from ``next_song`` on until done, paused or cancelled."""
+    total_songs = session["progress"]["total"]
+    config_dict = session["config"]
+    
+    # Matching settings of the session
+    config_manager = ConfigManager()
+    config = config_manager.create_session_config("dummy_input")
+    config.hard_threshold = config_dict["hard_threshold"]
+    config.reject_threshold = config_dict["reject_threshold"]
+    config.max_candidates = config_dict["max_candidates"]
+    
+    # Initialize Spotify client, shared with the process's other sessions
+    client = _get_spotify_client(config)
+    if client is None:
+        session["status"] = "error"
+        session["error"] = "Failed to authenticate with Spotify"
+        state_store.save_session(session_id, "error", progress=session["progress"])
+        return
+    spotify_scheduler.register(session_id)
+    spotify_client = ScheduledClient(client, spotify_scheduler, session_id)
+    match_index = _match_index(config_dict.get("bulk_id"))
+    
+    # Process each song. Uncertain matches wait in the decision queue
+    # while the rest of the library is matched
+    dry_run = config_dict["dry_run"]
+    next_check = 0.0
+    poll = DECISION_POLL_MIN
+    next_save = time.monotonic() + CHECKPOINT_INTERVAL
+    start = session["next_song"]
+    for i, (song, song_json) in enumerate(_iter_session_songs(session["songs_file"], start), start):
+        session["next_song"] = i
+        session["progress"]["current"] = i + 1
+        session["current_song"] = {
+            "title": song.title,
+            "artist": song.artist,
+            "album": song.album or "",
+            "index": i + 1,
+            "total": total_songs
+        }
+        
+        # Checkpoint: take posted answers and stop if paused or cancelled
+        if session["wakeup"].is_set() or time.monotonic() >= next_check:
+            session["wakeup"].clear()
+            if _check_control(session_id, session):
+                return
+            answered = bool(waiting) and _apply_answers(session_id, session, waiting, spotify_client, dry_run)
+            poll = _next_poll(poll, answered)
+            next_check = time.monotonic() + poll
+            if answered or time.monotonic() >= next_save:
+                _save_checkpoint(session_id, session, waiting)
+                next_save = time.monotonic() + CHECKPOINT_INTERVAL
+        _publish_progress(session_id, session)
+        
+        try:
+            candidates = _find_candidates(song, spotify_client, config, match_index)
+            decision = make_decision(song, candidates, config, interactive=False)
+        except Exception as e:
+            if session["control"]:
+                return  # Interrupted mid-search; the song is matched on resume
+            _reject_on_error(session_id, song_json, e)
+            session["next_song"] = i + 1
+            continue
+        
+        if session["control"]:
+            # Searches may have been cut short, so don't trust the decision
+            return
+        if decision.decision == "skipped":
+            # Uncertain match: the web UI always asks the user
+            _queue_decision(session_id, session, waiting, str(i + 1), song, song_json, candidates)
+        else:
+            _settle(session_id, decision, spotify_client, dry_run, song_json)
+        session["next_song"] = i + 1
+    
+    # Everything is matched; finish once the user answered the rest
+    session["current_song"] = None
+    if waiting:
+        session["status"] = "awaiting_decision"
+        _save_checkpoint(session_id, session, waiting)
+        _publish(session_id)
+    while waiting:
+        session["wakeup"].wait(poll)
+        session["wakeup"].clear()
+        if _check_control(session_id, session):
+            return
+        answered = _apply_answers(session_id, session, waiting, spotify_client, dry_run)
+        poll = _next_poll(poll, answered)
+        if answered:
+            _save_checkpoint(session_id, session, waiting)
+            _publish(session_id)
+    
+    if config_dict.get("playlist_name") is not None and not dry_run:
+        _fill_playlist(session_id, session, spotify_client)
+    
+    # Migration completed
+    session["status"] = "completed"
+    state_store.save_session(session_id, "completed", progress=session["progress"])
+    state_store.log_event(session_id, "completed")
 
 if __name__ == "__main__":
     import uvicorn
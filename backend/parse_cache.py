@@ -0,0 +1,140 @@
+"""
+Content-addressed cache of parsed uploads.
+
+A file is usually uploaded twice: to /upload for a preview, then to
+/migrate/start. The first upload stores its parsed songs here under a
+token, the SHA-256 of the file's extension and content, and the second
+request passes the token instead of the file.
+
+Entries are JSONL song files, in the format of a session's song file, so
+starting a session from one is a hard link. The cache lives on disk and
+is shared by every server process on the node. Least recently used
+entries are evicted once it grows past its size limit.
+"""
+
+import json
+import os
+import re
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional
+
+TOKEN_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+
+class CachedParse(NamedTuple):
+    """A cached parse: where its songs are, and what file they came from."""
+
+    path: Path
+    filename: str
+    songs: int
+
+
+class ParseCache:
+    """
+    Parsed song files keyed by content digest, evicted by total size.
+
+    Args:
+        directory: Where entries are stored
+        max_bytes: Size the entries are kept under; larger parses are not cached
+    """
+
+    def __init__(self, directory: Path, max_bytes: int = 256 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evicted = 0
+
+    def partial_path(self, name: str) -> Path:
+        """Path to write a parse to before put() adds it."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        return self.directory / f"{name}.partial"
+
+    def put(self, token: str, songs_path: Path, filename: str, songs: int) -> bool:
+        """
+        Move a parsed song file into the cache under ``token``.
+
+        Returns:
+            Whether it was cached; files over the size limit are deleted instead
+        """
+        if not TOKEN_PATTERN.fullmatch(token) or songs_path.stat().st_size > self.max_bytes:
+            songs_path.unlink(missing_ok=True)
+            return False
+        path, meta_path = self._paths(token)
+        meta_partial = songs_path.with_suffix(".meta")
+        meta_partial.write_text(json.dumps({"filename": filename, "songs": songs}), encoding="utf-8")
+        # The metadata goes first: an entry counts once its song file exists
+        os.replace(meta_partial, meta_path)
+        os.replace(songs_path, path)
+        with self._lock:
+            self._evict()
+        return True
+
+    def get(self, token: str) -> Optional[CachedParse]:
+        """Look up a cached parse and mark it recently used, or return None."""
+        if not TOKEN_PATTERN.fullmatch(token):
+            return None
+        path, meta_path = self._paths(token)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            os.utime(path)
+        except (OSError, ValueError):
+            with self._lock:
+                self._misses += 1
+            return None
+        with self._lock:
+            self._hits += 1
+        return CachedParse(path, meta["filename"], meta["songs"])
+
+    def link(self, token: str, target: Path) -> Optional[CachedParse]:
+        """
+        Put the songs of a cached parse at ``target``, or return None if not cached.
+
+        Entries are never changed in place, so a hard link is safe and
+        stays valid when the entry is evicted; it falls back to a copy.
+        """
+        cached = self.get(token)
+        if cached is None:
+            return None
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(cached.path, target)
+        except FileNotFoundError:
+            return None  # Evicted meanwhile
+        except OSError:
+            try:
+                shutil.copyfile(cached.path, target)
+            except FileNotFoundError:
+                return None
+        return cached
+
+    def stats(self) -> Dict[str, Any]:
+        """Report lookups and evictions in this process."""
+        with self._lock:
+            return {"hits": self._hits, "misses": self._misses, "evicted": self._evicted}
+
+    def _paths(self, token: str):
+        return self.directory / f"{token}.jsonl", self.directory / f"{token}.json"
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until under the size limit (call with the lock held)."""
+        entries = []
+        total = 0
+        for path in self.directory.glob("*.jsonl"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue  # Evicted by another process
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            path.with_suffix(".json").unlink(missing_ok=True)
+            total -= size
+            self._evicted += 1
@@ -0,0 +1,228 @@
+"""
+Process-wide scheduler for Spotify API requests.
+
+Every migration in a server process shares one request budget, a token
+bucket refilled at ``rate`` requests per second. Callers queue for a
+token per session. Interactive requests, which a user is waiting on, are
+always served before bulk matching. Within a priority class, sessions
+take turns by smooth weighted round-robin, so a large library can't
+crowd out a small one.
+
+Sessions call Spotify from their worker thread, so a call blocks until
+its turn and then runs on the caller's thread; the scheduler only decides
+the order.
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, Set
+
+from yt2spot.spotify_client import RequestCancelled
+
+# Priority classes, served in this order
+INTERACTIVE = "interactive"
+BULK = "bulk"
+
+PRIORITIES = (INTERACTIVE, BULK)
+
+
+class RequestScheduler:
+    """
+    Hands out a shared request budget fairly across sessions.
+
+    Args:
+        rate: Requests per second across all sessions
+        burst: Requests that may go out at once after an idle period
+    """
+
+    def __init__(self, rate: float = 10.0, burst: int = 10):
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+        self.rate = rate
+        self.burst = burst
+        self._cond = threading.Condition()
+        self._tokens = float(burst)
+        self._refilled = time.monotonic()
+        self._queues: Dict[str, Dict[str, Deque[threading.Event]]] = {}
+        self._weights: Dict[str, float] = {}
+        self._credit: Dict[str, Dict[str, float]] = {p: {} for p in PRIORITIES}
+        self._granted: Dict[str, int] = {}
+        self._waited: Dict[str, float] = {}
+        self._released: Set[str] = set()
+        self._stopping = False
+        self._dispatcher = threading.Thread(
+            target=self._dispatch, name="spotify-scheduler", daemon=True
+        )
+        self._dispatcher.start()
+
+    def register(self, session_id: str, weight: float = 1.0) -> None:
+        """Give a session ``weight`` shares of the budget (default: one)."""
+        if weight <= 0:
+            raise ValueError("weight must be positive")
+        with self._cond:
+            self._weights[session_id] = weight
+            self._released.discard(session_id)
+
+    def unregister(self, session_id: str) -> None:
+        """Forget a session that stopped calling Spotify."""
+        with self._cond:
+            self._weights.pop(session_id, None)
+            for credits in self._credit.values():
+                credits.pop(session_id, None)
+            self._granted.pop(session_id, None)
+            self._waited.pop(session_id, None)
+            self._released.discard(session_id)
+
+    def release(self, session_id: str) -> None:
+        """
+        Give up a session's share of the budget at once.
+
+        Its queued calls and any it makes until it registers again raise
+        RequestCancelled instead of waiting for a turn.
+        """
+        with self._cond:
+            self._released.add(session_id)
+            for queue in self._queues.pop(session_id, {}).values():
+                while queue:
+                    queue.popleft().set()
+
+    def call(
+        self,
+        session_id: str,
+        fn: Callable[..., Any],
+        *args: Any,
+        priority: str = BULK,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Wait for the session's turn, then return ``fn(*args, **kwargs)``.
+
+        Raises:
+            RequestCancelled: If the session's requests were released
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority: {priority}")
+        turn = threading.Event()
+        queued_at = time.monotonic()
+        with self._cond:
+            if session_id in self._released:
+                raise RequestCancelled(f"Requests of session {session_id} were released")
+            if self._stopping:
+                return fn(*args, **kwargs)
+            queues = self._queues.setdefault(session_id, {p: deque() for p in PRIORITIES})
+            queues[priority].append(turn)
+            self._cond.notify()
+        turn.wait()
+        with self._cond:
+            if session_id in self._released:
+                raise RequestCancelled(f"Requests of session {session_id} were released")
+            self._waited[session_id] = self._waited.get(session_id, 0.0) + (
+                time.monotonic() - queued_at
+            )
+        return fn(*args, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        """Report the budget and each session's queue depth, grants and wait time."""
+        with self._cond:
+            session_ids = set(self._queues) | set(self._granted)
+            sessions = {}
+            for session_id in session_ids:
+                queues = self._queues.get(session_id, {})
+                sessions[session_id] = {
+                    **{p: len(queues.get(p, ())) for p in PRIORITIES},
+                    "granted": self._granted.get(session_id, 0),
+                    "waited_seconds": round(self._waited.get(session_id, 0.0), 3),
+                }
+            return {"rate": self.rate, "burst": self.burst, "sessions": sessions}
+
+    def shutdown(self) -> None:
+        """Stop the dispatcher and release every waiting call."""
+        with self._cond:
+            self._stopping = True
+            for queues in self._queues.values():
+                for queue in queues.values():
+                    while queue:
+                        queue.popleft().set()
+            self._cond.notify_all()
+
+    def _dispatch(self) -> None:
+        with self._cond:
+            while not self._stopping:
+                if not self._queues:
+                    self._cond.wait()
+                    continue
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._refilled) * self.rate
+                )
+                self._refilled = now
+                if self._tokens < 1:
+                    self._cond.wait((1 - self._tokens) / self.rate)
+                    continue
+                self._tokens -= 1
+                self._next_turn().set()
+
+    def _next_turn(self) -> threading.Event:
+        """Pop the next waiting call (call with the lock held and a queue non-empty)."""
+        for priority in PRIORITIES:
+            waiting = [sid for sid, queues in self._queues.items() if queues[priority]]
+            if not waiting:
+                continue
+            # Smooth weighted round-robin: every waiting session earns its
+            # weight, the richest goes next and pays the total back
+            credit = self._credit[priority]
+            total = 0.0
+            for session_id in waiting:
+                weight = self._weights.get(session_id, 1.0)
+                credit[session_id] = credit.get(session_id, 0.0) + weight
+                total += weight
+            chosen = max(waiting, key=credit.__getitem__)
+            credit[chosen] -= total
+
+            queues = self._queues[chosen]
+            turn = queues[priority].popleft()
+            self._granted[chosen] = self._granted.get(chosen, 0) + 1
+            if not any(queues.values()):
+                # Credit is kept: a session waits on one call at a time, so
+                # its queue empties after nearly every turn
+                del self._queues[chosen]
+            return turn
+        raise RuntimeError("No queued requests")
+
+
+class ScheduledClient:
+    """
+    A session's SpotifyClient whose API calls go through the scheduler.
+
+    Calls are bulk by default; wrap those a user is waiting on in
+    ``with client.interactive():``.
+    """
+
+    def __init__(self, client: Any, scheduler: RequestScheduler, session_id: str):
+        self._client = client
+        self._scheduler = scheduler
+        self._session_id = session_id
+        self._priority = BULK
+
+    @contextmanager
+    def interactive(self) -> Iterator[None]:
+        """Serve the calls made inside the block before bulk matching."""
+        previous, self._priority = self._priority, INTERACTIVE
+        try:
+            yield
+        finally:
+            self._priority = previous
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._client, name)
+        if not callable(attribute):
+            return attribute
+
+        def scheduled(*args: Any, **kwargs: Any) -> Any:
+            return self._scheduler.call(
+                self._session_id, attribute, *args, priority=self._priority, **kwargs
+            )
+
+        return scheduled
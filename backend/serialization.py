@@ -0,0 +1,88 @@
+"""
+JSON encoding for the API's large and frequent payloads.
+
+orjson, which comes with ``fastapi[all]``, encodes several times faster
+than the standard library and returns bytes that can be sent or appended
+to a result log as they are. Without it the standard library is used.
+
+Values that are already JSON, like the encoded songs of an upload or the
+lines of a result log, are spliced into responses as bytes instead of
+being decoded and encoded again.
+"""
+
+import json
+from dataclasses import asdict, is_dataclass
+from datetime import date
+from typing import Any, Dict, Iterable, Optional
+
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    # orjson encodes dataclasses and datetimes itself; match it without orjson
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Encode a value as compact UTF-8 JSON.
+
+    Dataclasses are encoded as objects and datetimes in ISO 8601; other
+    unknown types are encoded as str().
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=_default)
+    return json.dumps(value, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: Any) -> Any:
+    """Decode JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def encode_entry(entry: Dict[str, Any], raw: Optional[Dict[str, bytes]] = None) -> bytes:
+    """
+    Encode a dict, taking the fields in ``raw`` as already encoded JSON.
+
+    The raw fields come first, so ``encode_entry({"a": 1}, {"song": b"{}"})``
+    gives ``{"song":{},"a":1}``.
+    """
+    encoded = dumps(entry)
+    if not raw:
+        return encoded
+    fields = b",".join(dumps(key) + b":" + value for key, value in raw.items())
+    if encoded == b"{}":
+        return b"{" + fields + b"}"
+    return b"{" + fields + b"," + encoded[1:]
+
+
+def encode_array(items: Iterable[bytes]) -> bytes:
+    """Join encoded JSON values (trailing newlines allowed) into an array."""
+    return b"[" + b",".join(item.rstrip(b"\n") for item in items) + b"]"
+
+
+class JSONBytesResponse(Response):
+    """
+    JSON response encoded with ``dumps``, or sent as is when given bytes.
+
+    Endpoints return it to skip response-model validation and the standard
+    encoder; they keep their ``response_model`` for the API docs.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
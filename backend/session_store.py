@@ -0,0 +1,387 @@
+"""
+Bounded in-memory store for live migration sessions.
+
+Result lists are the part of a session that grows with the library, so
+each one is a ResultLog that keeps only a small tail in memory and spills
+the rest to a JSONL file. Finished sessions are evicted after a TTL, and
+least recently used ones go first when the store is over its limits.
+
+Pages of results are addressed by a cursor: the byte offset of an entry in
+its log, counting spilled and buffered lines as one sequence. An entry
+keeps its offset when it spills, so a cursor stays valid and a page costs
+one seek however deep into the session it starts.
+"""
+
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from serialization import encode_entry, loads
+
+RESULT_KINDS = ("results", "rejected_songs")
+
+# Entries a filtered page may skip before it returns what it has so far
+MAX_PAGE_SCAN = 10_000
+
+
+class ResultLog:
+    """Append-only list of result dicts, spilled to disk in batches."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.buffer: List[bytes] = []
+        self.buffer_bytes = 0
+        self.file_bytes = 0
+        self.count = 0
+        if path.exists():
+            # A resumed session continues the entries it already spilled
+            with open(path, "rb") as file:
+                for line in file:
+                    self.file_bytes += len(line)
+                    self.count += 1
+
+    def append(self, entry: Dict[str, Any], raw: Optional[Dict[str, bytes]] = None) -> int:
+        """Add an entry, with ``raw`` fields already encoded, and return its size in bytes."""
+        return self.append_line(encode_entry(entry, raw) + b"\n")
+
+    def append_line(self, line: bytes) -> int:
+        """Add an entry encoded as a JSON line and return its size in bytes."""
+        self.buffer.append(line)
+        self.buffer_bytes += len(line)
+        self.count += 1
+        return len(line)
+
+    def spill(self) -> int:
+        """Move buffered entries to disk and return the bytes freed."""
+        if not self.buffer:
+            return 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "ab") as file:
+            file.writelines(self.buffer)
+        freed = self.buffer_bytes
+        self.file_bytes += freed
+        self.buffer = []
+        self.buffer_bytes = 0
+        return freed
+
+    def snapshot(self) -> Tuple[int, List[bytes]]:
+        """Capture the spilled length and buffered lines (call under a lock)."""
+        return self.file_bytes, list(self.buffer)
+
+    def iter_snapshot(self, file_bytes: int, buffered: List[bytes]) -> Iterator[Dict[str, Any]]:
+        """Yield the entries of a snapshot; later spills are not read twice."""
+        for _, line in self.iter_lines(file_bytes, buffered):
+            yield loads(line)
+
+    def iter_lines(
+        self, file_bytes: int, buffered: List[bytes], offset: int = 0
+    ) -> Iterator[Tuple[int, bytes]]:
+        """
+        Yield (offset, encoded line) for the snapshot's entries from ``offset`` on.
+
+        Raises:
+            ValueError: If ``offset`` points into the middle of a spilled entry
+        """
+        position = 0
+        if offset < file_bytes:
+            with open(self.path, "rb") as file:
+                if offset > 0:
+                    file.seek(offset - 1)
+                    if file.read(1) != b"\n":
+                        raise ValueError(f"Offset {offset} is not the start of an entry")
+                file.seek(offset)
+                position = offset
+                for line in file:
+                    if position >= file_bytes:
+                        break
+                    yield position, line
+                    position += len(line)
+        position = file_bytes
+        for line in buffered:
+            if position >= offset:
+                yield position, line
+            position += len(line)
+
+
+class SessionStore:
+    """
+    Live sessions with a memory budget and eviction.
+
+    Args:
+        spill_dir: Directory for spilled result files
+        memory_budget: Bytes of buffered results kept in memory across sessions
+        spill_after: Entries a result list may buffer before it is spilled
+        ttl: Seconds a finished session stays available
+        max_sessions: Sessions kept before finished ones are evicted early
+        on_evict: Called with the id of each evicted session
+    """
+
+    def __init__(
+        self,
+        spill_dir: Path,
+        memory_budget: int = 64 * 1024 * 1024,
+        spill_after: int = 500,
+        ttl: float = 3600.0,
+        max_sessions: int = 1000,
+        on_evict: Optional[Callable[[str], None]] = None,
+    ):
+        self.spill_dir = Path(spill_dir)
+        self.memory_budget = memory_budget
+        self.spill_after = spill_after
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.on_evict = on_evict
+        self._lock = threading.RLock()
+        self._sessions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._logs: Dict[str, Dict[str, ResultLog]] = {}
+        self._finished_at: Dict[str, float] = {}
+        self._resident_bytes = 0
+        self._evicted = 0
+
+    def create(self, session_id: str, session: Dict[str, Any]) -> Dict[str, Any]:
+        """Register a new live session."""
+        with self._lock:
+            self._evict()
+            self.release(session_id)
+            self._sessions[session_id] = session
+            self._logs[session_id] = {
+                kind: ResultLog(self.spill_dir / session_id / f"{kind}.jsonl")
+                for kind in RESULT_KINDS
+            }
+        return session
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Return a live session (marking it recently used), or None."""
+        with self._lock:
+            self._evict()
+            session = self._sessions.get(session_id)
+            if session is not None:
+                self._sessions.move_to_end(session_id)
+            return session
+
+    def __contains__(self, session_id: str) -> bool:
+        return self.get(session_id) is not None
+
+    def append_result(
+        self,
+        session_id: str,
+        kind: str,
+        entry: Dict[str, Any],
+        raw: Optional[Dict[str, bytes]] = None,
+    ) -> None:
+        """Append to one of a session's result lists, spilling as needed."""
+        # Encoded outside the lock; only the bookkeeping needs it
+        line = encode_entry(entry, raw) + b"\n"
+        with self._lock:
+            log = self._logs[session_id][kind]
+            self._resident_bytes += log.append_line(line)
+            if len(log.buffer) >= self.spill_after:
+                self._resident_bytes -= log.spill()
+            if self._resident_bytes > self.memory_budget:
+                self._spill_all()
+
+    def iter_results(self, session_id: str, kind: str) -> Iterator[Dict[str, Any]]:
+        """
+        Yield a session's results in order, from disk and memory.
+
+        Sessions that ran in another process are read from their spill
+        file, which is complete once the session finished.
+        """
+        log, file_bytes, buffered = self._snapshot(session_id, kind)
+        return log.iter_snapshot(file_bytes, buffered)
+
+    def iter_result_lines(self, session_id: str, kind: str) -> Iterator[bytes]:
+        """Yield a session's results as encoded JSON lines, without decoding them."""
+        log, file_bytes, buffered = self._snapshot(session_id, kind)
+        return (line for _, line in log.iter_lines(file_bytes, buffered))
+
+    def read_page(
+        self,
+        session_id: str,
+        kind: str,
+        cursor: int = 0,
+        limit: int = 100,
+        match: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        follow: bool = False,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Read up to ``limit`` results starting at ``cursor``.
+
+        Args:
+            session_id: Session to read
+            kind: One of RESULT_KINDS
+            cursor: Offset from a previous page, 0 for the first
+            limit: Most entries to return
+            match: Keeps only the entries it returns True for
+            follow: Return the end offset instead of None at the end, for
+                sessions still adding results
+
+        Returns:
+            The entries and the cursor of the next page, or None at the end.
+            A filtered page may hold fewer than ``limit`` entries (even none)
+            when it stops after MAX_PAGE_SCAN skipped entries.
+
+        Raises:
+            ValueError: If ``cursor`` is not the offset of an entry, or lies
+                past the end (the results were cut back since it was issued)
+        """
+        lines, next_cursor = self.read_page_lines(session_id, kind, cursor, limit, match, follow)
+        return [loads(line) for line in lines], next_cursor
+
+    def read_page_lines(
+        self,
+        session_id: str,
+        kind: str,
+        cursor: int = 0,
+        limit: int = 100,
+        match: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        follow: bool = False,
+    ) -> Tuple[List[bytes], Optional[int]]:
+        """Like read_page(), but return the entries as encoded JSON lines."""
+        log, file_bytes, buffered = self._snapshot(session_id, kind)
+        end = file_bytes + sum(len(line) for line in buffered)
+        if cursor > end:
+            raise ValueError(f"Offset {cursor} is past the end of the results")
+        lines: List[bytes] = []
+        scanned = 0
+        for offset, line in log.iter_lines(file_bytes, buffered, cursor):
+            if len(lines) >= limit or scanned >= MAX_PAGE_SCAN:
+                return lines, offset
+            scanned += 1
+            # Only filtering needs to decode an entry
+            if match is None or match(loads(line)):
+                lines.append(line)
+        return lines, end if follow else None
+
+    def session_file(self, session_id: str, name: str) -> Path:
+        """Path of a per-session file, removed along with the session."""
+        return self.spill_dir / session_id / name
+
+    def flush(self, session_id: str) -> Dict[str, int]:
+        """Spill a live session's buffered results; return each list's length in bytes."""
+        with self._lock:
+            lengths = {}
+            for kind, log in self._logs[session_id].items():
+                self._resident_bytes -= log.spill()
+                lengths[kind] = log.file_bytes
+            return lengths
+
+    def rewind(self, session_id: str, lengths: Dict[str, int]) -> None:
+        """
+        Cut the result files of a session not live here back to ``lengths``.
+
+        A session recovered from a dead worker continues from its last
+        checkpoint, so the results written after it are dropped.
+        """
+        for kind, length in lengths.items():
+            path = self.spill_dir / session_id / f"{kind}.jsonl"
+            if path.exists() and path.stat().st_size > length:
+                with open(path, "r+b") as file:
+                    file.truncate(length)
+
+    def count_results(self, session_id: str, kind: str) -> int:
+        return self._logs[session_id][kind].count
+
+    def finish(self, session_id: str) -> None:
+        """
+        Start the TTL of a session that stopped running.
+
+        Its results are spilled so that every process can read them.
+        """
+        with self._lock:
+            if session_id in self._sessions:
+                self._finished_at[session_id] = time.monotonic()
+                for log in self._logs[session_id].values():
+                    self._resident_bytes -= log.spill()
+
+    def release(self, session_id: str) -> None:
+        """
+        Drop a paused session from memory but keep its files.
+
+        Its results are spilled, so a later create() of the same session,
+        in this process or another, continues them.
+        """
+        with self._lock:
+            self._sessions.pop(session_id, None)
+            self._finished_at.pop(session_id, None)
+            for log in self._logs.pop(session_id, {}).values():
+                self._resident_bytes -= log.spill()
+
+    def discard(self, session_id: str) -> None:
+        """Drop a session and its spilled results."""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+            self._finished_at.pop(session_id, None)
+            for log in self._logs.pop(session_id, {}).values():
+                self._resident_bytes -= log.buffer_bytes
+            shutil.rmtree(self.spill_dir / session_id, ignore_errors=True)
+
+    def _snapshot(self, session_id: str, kind: str) -> Tuple[ResultLog, int, List[bytes]]:
+        """Return a session's log with the spilled length and buffered lines to read."""
+        with self._lock:
+            logs = self._logs.get(session_id)
+            if logs is not None:
+                log = logs[kind]
+                return (log, *log.snapshot())
+        log = ResultLog(self.spill_dir / session_id / f"{kind}.jsonl")
+        file_bytes = log.path.stat().st_size if log.path.exists() else 0
+        return log, file_bytes, []
+
+    def count_by_status(self) -> Dict[str, int]:
+        """Count resident sessions by their status."""
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for session in self._sessions.values():
+                status = session.get("status", "unknown")
+                counts[status] = counts.get(status, 0) + 1
+            return counts
+
+    def metrics(self) -> Dict[str, int]:
+        """Report resident sessions and bytes."""
+        with self._lock:
+            spilled = sum(
+                log.file_bytes for logs in self._logs.values() for log in logs.values()
+            )
+            return {
+                "resident_sessions": len(self._sessions),
+                "finished_sessions": len(self._finished_at),
+                "resident_result_bytes": self._resident_bytes,
+                "spilled_result_bytes": spilled,
+                "evicted_sessions": self._evicted,
+            }
+
+    def _spill_all(self) -> None:
+        """Spill every buffered result list, largest first, until under budget."""
+        logs = [log for logs in self._logs.values() for log in logs.values()]
+        logs.sort(key=lambda log: log.buffer_bytes, reverse=True)
+        for log in logs:
+            if self._resident_bytes <= self.memory_budget // 2:
+                return
+            self._resident_bytes -= log.spill()
+
+    def _evict(self) -> None:
+        """Evict expired finished sessions, then LRU finished ones over the limit."""
+        now = time.monotonic()
+        expired = [
+            session_id
+            for session_id, finished_at in self._finished_at.items()
+            if now - finished_at >= self.ttl
+        ]
+        # Running sessions are never evicted, only finished ones
+        overflow = len(self._sessions) - len(expired) - self.max_sessions + 1
+        if overflow > 0:
+            for session_id in self._sessions:
+                if overflow <= 0:
+                    break
+                if session_id in self._finished_at and session_id not in expired:
+                    expired.append(session_id)
+                    overflow -= 1
+
+        for session_id in expired:
+            self.discard(session_id)
+            self._evicted += 1
+            if self.on_evict is not None:
+                self.on_evict(session_id)
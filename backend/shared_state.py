@@ -0,0 +1,291 @@
+"""
+Session state shared between server processes.
+
+The process running a migration owns its live session and mirrors a
+JSON-serializable snapshot of it (status, progress, current song) here
+after every change. Any process can then serve status, event streams and
+results.
+
+Uncertain matches wait in a per-session decision queue while the owner
+keeps matching. Any process can list the queue and record answers, and
+the owner takes the answers from here and applies them.
+
+Status changes that must not race (claiming a queued job, pausing,
+resuming, cancelling) go through ``transition``, which only applies when
+the session is still in one of the expected statuses.
+
+MemorySharedState keeps everything in one process; SQLiteSharedState is
+the default stand-in for a real shared service and works across all
+uvicorn workers of a node.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+class MemorySharedState:
+    """Shared state for a single server process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+        # session id -> decision id -> [payload, answer or None]
+        self._decisions: Dict[str, Dict[str, list]] = {}
+
+    def create_session(self, session_id: str, data: Dict[str, Any]) -> None:
+        with self._lock:
+            self._sessions[session_id] = json.loads(json.dumps(data, default=str))
+
+    def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            data = self._sessions.get(session_id)
+            return json.loads(json.dumps(data)) if data is not None else None
+
+    def update_session(self, session_id: str, **fields: Any) -> None:
+        """Merge ``fields`` into a session; other fields are left alone."""
+        fields = json.loads(json.dumps(fields, default=str))
+        with self._lock:
+            if session_id in self._sessions:
+                self._sessions[session_id].update(fields)
+
+    def transition(self, session_id: str, statuses: Iterable[str], **fields: Any) -> Optional[Dict[str, Any]]:
+        """Merge ``fields`` only if the session's status is one of ``statuses``; return the result or None."""
+        fields = json.loads(json.dumps(fields, default=str))
+        with self._lock:
+            data = self._sessions.get(session_id)
+            if data is None or data.get("status") not in statuses:
+                return None
+            data.update(fields)
+            return json.loads(json.dumps(data))
+
+    def delete_session(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+            self._decisions.pop(session_id, None)
+
+    def clear_decisions(self, session_id: str) -> None:
+        """Drop a session's queued decisions, answered or not."""
+        with self._lock:
+            self._decisions.pop(session_id, None)
+
+    def add_decision(self, session_id: str, decision_id: str, payload: Dict[str, Any], replace: bool = True) -> None:
+        """Queue a decision for the user; with ``replace=False`` a queued one is kept."""
+        payload = json.loads(json.dumps(payload, default=str))
+        with self._lock:
+            queued = self._decisions.setdefault(session_id, {})
+            if replace or decision_id not in queued:
+                queued[decision_id] = [payload, None]
+
+    def list_decisions(self, session_id: str, limit: int) -> List[Dict[str, Any]]:
+        """Return up to ``limit`` unanswered decisions, oldest first."""
+        with self._lock:
+            queued = self._decisions.get(session_id, {}).values()
+            unanswered = [payload for payload, answer in queued if answer is None]
+            return json.loads(json.dumps(unanswered[:limit]))
+
+    def answer_decisions(self, session_id: str, answers: Dict[str, Dict[str, Any]]) -> int:
+        """Record answers to queued decisions; return how many were still open."""
+        answers = json.loads(json.dumps(answers, default=str))
+        accepted = 0
+        with self._lock:
+            queued = self._decisions.get(session_id, {})
+            for decision_id, answer in answers.items():
+                entry = queued.get(decision_id)
+                if entry is not None and entry[1] is None:
+                    entry[1] = answer
+                    accepted += 1
+        return accepted
+
+    def take_answers(self, session_id: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """Remove answered decisions and return (decision id, answer) pairs."""
+        with self._lock:
+            queued = self._decisions.get(session_id, {})
+            answered = [(did, entry[1]) for did, entry in queued.items() if entry[1] is not None]
+            for decision_id, _ in answered:
+                del queued[decision_id]
+            return answered
+
+
+class SQLiteSharedState:
+    """Shared state in a SQLite database used by every process on a node."""
+
+    def __init__(self, path: Path):
+        self._lock = threading.Lock()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(path), check_same_thread=False, isolation_level=None, timeout=30
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS live_sessions (
+                id TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS pending_decisions (
+                session_id TEXT NOT NULL,
+                decision_id TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                answer TEXT,
+                PRIMARY KEY (session_id, decision_id)
+            );
+            """
+        )
+
+    def create_session(self, session_id: str, data: Dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO live_sessions VALUES (?, ?, ?)",
+                (session_id, json.dumps(data, default=str), time.time()),
+            )
+
+    def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM live_sessions WHERE id = ?", (session_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def update_session(self, session_id: str, **fields: Any) -> None:
+        """Merge ``fields`` into a session; other fields are left alone."""
+        with self._lock:
+            # Read-modify-write under the database write lock, so writers in
+            # other processes (e.g. a posted decision) are not overwritten
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT data FROM live_sessions WHERE id = ?", (session_id,)
+                ).fetchone()
+                if row is not None:
+                    data = json.loads(row[0])
+                    data.update(fields)
+                    self._conn.execute(
+                        "UPDATE live_sessions SET data = ?, updated_at = ? WHERE id = ?",
+                        (json.dumps(data, default=str), time.time(), session_id),
+                    )
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def transition(self, session_id: str, statuses: Iterable[str], **fields: Any) -> Optional[Dict[str, Any]]:
+        """Merge ``fields`` only if the session's status is one of ``statuses``; return the result or None."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT data FROM live_sessions WHERE id = ?", (session_id,)
+                ).fetchone()
+                data = json.loads(row[0]) if row is not None else None
+                if data is None or data.get("status") not in statuses:
+                    data = None
+                else:
+                    data.update(json.loads(json.dumps(fields, default=str)))
+                    self._conn.execute(
+                        "UPDATE live_sessions SET data = ?, updated_at = ? WHERE id = ?",
+                        (json.dumps(data), time.time(), session_id),
+                    )
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return data
+
+    def delete_session(self, session_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM live_sessions WHERE id = ?", (session_id,))
+            self._conn.execute(
+                "DELETE FROM pending_decisions WHERE session_id = ?", (session_id,)
+            )
+
+    def clear_decisions(self, session_id: str) -> None:
+        """Drop a session's queued decisions, answered or not."""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM pending_decisions WHERE session_id = ?", (session_id,)
+            )
+
+    def add_decision(self, session_id: str, decision_id: str, payload: Dict[str, Any], replace: bool = True) -> None:
+        """Queue a decision for the user; with ``replace=False`` a queued one is kept."""
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR {'REPLACE' if replace else 'IGNORE'} INTO pending_decisions VALUES (?, ?, ?, NULL)",
+                (session_id, decision_id, json.dumps(payload, default=str)),
+            )
+
+    def list_decisions(self, session_id: str, limit: int) -> List[Dict[str, Any]]:
+        """Return up to ``limit`` unanswered decisions, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT payload FROM pending_decisions"
+                " WHERE session_id = ? AND answer IS NULL ORDER BY rowid LIMIT ?",
+                (session_id, limit),
+            ).fetchall()
+        return [json.loads(payload) for (payload,) in rows]
+
+    def answer_decisions(self, session_id: str, answers: Dict[str, Dict[str, Any]]) -> int:
+        """Record answers to queued decisions; return how many were still open."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                accepted = 0
+                for decision_id, answer in answers.items():
+                    cursor = self._conn.execute(
+                        "UPDATE pending_decisions SET answer = ?"
+                        " WHERE session_id = ? AND decision_id = ? AND answer IS NULL",
+                        (json.dumps(answer, default=str), session_id, decision_id),
+                    )
+                    accepted += cursor.rowcount
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return accepted
+
+    def take_answers(self, session_id: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """Remove answered decisions and return (decision id, answer) pairs."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT decision_id, answer FROM pending_decisions"
+                    " WHERE session_id = ? AND answer IS NOT NULL ORDER BY rowid",
+                    (session_id,),
+                ).fetchall()
+                self._conn.execute(
+                    "DELETE FROM pending_decisions WHERE session_id = ? AND answer IS NOT NULL",
+                    (session_id,),
+                )
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return [(decision_id, json.loads(answer)) for decision_id, answer in rows]
+
+
+def create_shared_backend(kind: str, directory: Path, max_queued: int, lease_seconds: Optional[float] = None):
+    """
+    Build the shared state and job queue for ``kind`` ("sqlite" or "memory").
+
+    ``lease_seconds`` (sqlite only) is how long a job claimed by a process
+    that stopped responding waits before another process runs it.
+
+    Raises:
+        ValueError: For an unknown kind
+    """
+    from jobs import DEFAULT_LEASE_SECONDS, MemoryJobQueue, SQLiteJobQueue
+
+    if kind == "memory":
+        return MemorySharedState(), MemoryJobQueue(max_queued)
+    if kind == "sqlite":
+        path = Path(directory) / "backend.sqlite3"
+        return SQLiteSharedState(path), SQLiteJobQueue(
+            path, max_queued, lease_seconds or DEFAULT_LEASE_SECONDS
+        )
+    raise ValueError(f"Unknown shared state backend: {kind} (use 'sqlite' or 'memory')")
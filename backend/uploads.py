@@ -0,0 +1,300 @@
+"""
+Streaming multipart uploads.
+
+The request body is fed chunk by chunk to a multipart parser. Bytes of each
+file part are handed through a small bounded queue to a helper thread that
+decodes them and runs the yt2spot stream parsers, so an upload is parsed
+while it arrives: nothing is buffered beyond a few chunks, and nothing is
+written to a temporary file. Each file is hashed on the way, so a parse can
+be cached by its content.
+"""
+
+import asyncio
+import codecs
+import hashlib
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from fastapi import Request
+
+from yt2spot.input_parser import iter_input_stream
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ImportError:  # python-multipart < 0.0.13
+    from multipart.multipart import MultipartParser, parse_options_header
+
+ALLOWED_EXTENSIONS = {".txt", ".csv", ".json"}
+
+# Chunks in flight between the request and the parser thread
+QUEUE_CHUNKS = 8
+
+# Form fields other than the file are small settings
+MAX_FIELD_BYTES = 64 * 1024
+
+# Report progress every this many bytes
+PROGRESS_EVERY = 1024 * 1024
+
+
+class UploadError(Exception):
+    """An upload that can't be accepted, with the HTTP status to answer."""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class UploadedFile(NamedTuple):
+    """One parsed file of an upload."""
+
+    filename: str
+    songs: int
+    # SHA-256 of the file's extension and content; equal digests parse equally
+    digest: str
+
+
+def content_hasher(extension: str) -> Any:
+    """Start the digest of a file with the given extension (which picks its parser)."""
+    return hashlib.sha256(extension.encode("utf-8") + b"\0")
+
+
+class UploadResult:
+    """What a parsed upload contained."""
+
+    def __init__(self, files: List[UploadedFile], fields: Dict[str, str], size: int):
+        self.files = files  # In upload order
+        self.fields = fields
+        self.size = size
+
+    @property
+    def filename(self) -> str:
+        return self.files[0].filename
+
+    @property
+    def songs(self) -> int:
+        return sum(file.songs for file in self.files)
+
+
+class _ChunkFeed:
+    """Bounded hand-off of byte chunks from the event loop to a parser thread."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._queue: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue(QUEUE_CHUNKS)
+        self._ended = False
+
+    async def put(self, chunk: Optional[bytes]) -> None:
+        """Queue a chunk (None marks the end), waiting while the queue is full."""
+        await self._queue.put(chunk)
+
+    def chunks(self) -> Iterator[bytes]:
+        """Yield queued chunks until the end marker; runs on the parser thread."""
+        while not self._ended:
+            chunk = asyncio.run_coroutine_threadsafe(self._queue.get(), self._loop).result()
+            if chunk is None:
+                self._ended = True
+                return
+            yield chunk
+
+    def text(self, split_lines: bool) -> Iterator[str]:
+        """Decode the chunks as UTF-8, optionally re-cut into lines."""
+        decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        pending = ""
+        for chunk in self.chunks():
+            text = decoder.decode(chunk)
+            if not split_lines:
+                yield text
+                continue
+            lines = (pending + text).split("\n")
+            pending = lines.pop()
+            for line in lines:
+                yield line + "\n"
+        tail = pending + decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+    def drain(self) -> None:
+        """Consume what is left so the producer never blocks on a dead reader."""
+        for _ in self.chunks():
+            pass
+
+
+def _parse_file(feed: _ChunkFeed, file_format: str, on_song: Callable[[Any], None], counter: List[int]) -> int:
+    """Parse songs from the feed and return how many; runs on a parser thread."""
+    songs = 0
+    try:
+        # JSON is read as raw chunks, everything else line by line
+        text = feed.text(split_lines=file_format != ".json")
+        for song in iter_input_stream(text, file_format):
+            on_song(song)
+            songs += 1
+            counter[0] += 1
+    finally:
+        feed.drain()
+    return songs
+
+
+async def parse_upload(
+    request: Request,
+    on_song: Callable[[Any, int], None],
+    max_bytes: int,
+    on_progress: Optional[Callable[[int, Optional[int], int], None]] = None,
+    max_files: int = 1,
+) -> UploadResult:
+    """
+    Parse the files of a multipart upload while they stream in.
+
+    Args:
+        request: Request with a multipart/form-data body holding the files
+        on_song: Called with each parsed song and the index of its file,
+            on that file's parser thread
+        max_bytes: Largest accepted request body
+        on_progress: Called on the event loop with (bytes read, bytes
+            expected or None, songs parsed) about every megabyte
+        max_files: Most file parts accepted
+
+    Returns:
+        The filenames with their number of songs and digests, and the other
+        form fields
+
+    Raises:
+        UploadError: If the request is too large, malformed, has no file or
+            too many, or a file can't be parsed
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    boundary = params.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise UploadError(400, "Expected a multipart/form-data upload")
+
+    expected = request.headers.get("content-length")
+    expected_size = int(expected) if expected and expected.isdigit() else None
+    if expected_size is not None and expected_size > max_bytes:
+        raise UploadError(413, f"Upload exceeds the {max_bytes // (1024 * 1024)} MB limit")
+
+    loop = asyncio.get_running_loop()
+    counter = [0]
+    fields: Dict[str, str] = {}
+    state: Dict[str, Any] = {"headers": {}, "field": None, "data": []}
+    # Per file part: its name, feed, parse task and content hash
+    files: List[Tuple[str, _ChunkFeed, asyncio.Future, Any]] = []
+    # Chunks for the parser threads as (file index, bytes or None at the end)
+    outgoing: List[Tuple[int, Optional[bytes]]] = []
+    ended: set = set()
+
+    def on_header_field(data: bytes, start: int, end: int) -> None:
+        state["header_name"] = state.get("header_name", b"") + data[start:end]
+
+    def on_header_value(data: bytes, start: int, end: int) -> None:
+        state["header_value"] = state.get("header_value", b"") + data[start:end]
+
+    def on_header_end() -> None:
+        name = state.pop("header_name", b"").lower()
+        state["headers"][name] = state.pop("header_value", b"")
+
+    def on_headers_finished() -> None:
+        _, options = parse_options_header(state["headers"].get(b"content-disposition", b""))
+        state["field"] = options.get(b"name", b"").decode("utf-8", "replace")
+        filename = options.get(b"filename")
+        state["is_file"] = filename is not None
+        if not state["is_file"]:
+            return
+
+        if len(files) >= max_files:
+            raise UploadError(400, f"Too many files, at most {max_files} per upload")
+        filename = filename.decode("utf-8", "replace")
+        extension = Path(filename).suffix.lower()
+        if extension not in ALLOWED_EXTENSIONS:
+            raise UploadError(
+                400,
+                f"Unsupported file type. Allowed: {', '.join(sorted(ALLOWED_EXTENSIONS))}",
+            )
+        index = len(files)
+        feed = _ChunkFeed(loop)
+        task = loop.run_in_executor(
+            None, _parse_file, feed, extension, lambda song: on_song(song, index), counter
+        )
+        files.append((filename, feed, task, content_hasher(extension)))
+
+    def on_part_data(data: bytes, start: int, end: int) -> None:
+        if state.get("is_file"):
+            piece = data[start:end]
+            files[-1][3].update(piece)
+            outgoing.append((len(files) - 1, piece))
+        else:
+            state["data"].append(data[start:end])
+            if sum(map(len, state["data"])) > MAX_FIELD_BYTES:
+                raise UploadError(413, f"Form field '{state['field']}' is too large")
+
+    def on_part_end() -> None:
+        if state.get("is_file"):
+            outgoing.append((len(files) - 1, None))
+        elif state["field"]:
+            fields[state["field"]] = b"".join(state["data"]).decode("utf-8", "replace")
+        state.update(headers={}, data=[], is_file=False)
+
+    def on_end() -> None:
+        state["complete"] = True
+
+    parser = MultipartParser(
+        boundary,
+        {
+            "on_header_field": on_header_field,
+            "on_header_value": on_header_value,
+            "on_header_end": on_header_end,
+            "on_headers_finished": on_headers_finished,
+            "on_part_data": on_part_data,
+            "on_part_end": on_part_end,
+            "on_end": on_end,
+        },
+    )
+
+    received = 0
+    next_report = PROGRESS_EVERY
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > max_bytes:
+                raise UploadError(413, f"Upload exceeds the {max_bytes // (1024 * 1024)} MB limit")
+            parser.write(chunk)
+
+            for index, piece in outgoing:
+                await files[index][1].put(piece)
+                if piece is None:
+                    ended.add(index)
+            outgoing.clear()
+
+            if on_progress is not None and received >= next_report:
+                on_progress(received, expected_size, counter[0])
+                next_report += PROGRESS_EVERY
+        parser.finalize()
+        if not state.get("complete"):
+            # The body was cut short, so its last file may be too
+            raise UploadError(400, "Malformed upload: missing the closing boundary")
+    except UploadError:
+        raise
+    except Exception as e:
+        raise UploadError(400, f"Malformed upload: {e}") from e
+    finally:
+        # Always release the parser threads and let them stop, even when the
+        # upload failed, so the caller can clean up what on_song wrote
+        for index, (_, feed, _, _) in enumerate(files):
+            if index not in ended:
+                await feed.put(None)
+        await asyncio.gather(*(task for _, _, task, _ in files), return_exceptions=True)
+
+    if not files:
+        raise UploadError(400, "No file provided")
+    for filename, _, task, _ in files:
+        error = task.exception()
+        if error is not None:
+            detail = f"Error parsing {filename}: {error}" if len(files) > 1 else f"Error parsing file: {error}"
+            raise UploadError(400, detail) from error
+
+    if on_progress is not None:
+        on_progress(received, expected_size, counter[0])
+    return UploadResult(
+        [UploadedFile(filename, task.result(), hasher.hexdigest()) for filename, _, task, hasher in files],
+        fields,
+        received,
+    )
@@ -0,0 +1,161 @@
+"""
+Benchmark encoding and size of the results API response.
+
+Compares how GET /migrate/results used to be built, with every song
+converted by ``asdict`` and every entry encoded by ``json.dumps``, then
+decoded and validated into a pydantic model and encoded again, against the
+current path: songs encoded once at upload, result lines spliced into the
+response undecoded, and orjson when installed. Reports the encode time of
+appending the results and of building the response, and the response
+size uncompressed, gzipped and (if ``brotli`` is installed) brotli'd.
+
+Usage:
+    python benchmarks/bench_api_responses.py [result_count ...]
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import time
+import zlib
+from collections.abc import Callable
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel
+
+from yt2spot.models import SongInput
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from compression import brotli  # noqa: E402
+from serialization import dumps, encode_array, encode_entry, orjson  # noqa: E402
+
+
+class MigrationResult(BaseModel):
+    """The results response model the endpoint validated against."""
+
+    session_id: str
+    total_songs: int
+    successful: int
+    rejected: int
+    skipped: int
+    success_rate: float
+    results: list[dict[str, Any]]
+    rejected_songs: list[dict[str, Any]]
+
+
+def generate_songs(count: int) -> list[SongInput]:
+    """Make library-like songs: unique titles, repeating artists and albums."""
+    return [
+        SongInput(
+            title=f"Song Title {i}",
+            artist=f"Artist {i % 997}",
+            album=f"Album {i % 113}",
+            duration="3:30",
+            source_line=i + 1,
+        )
+        for i in range(count)
+    ]
+
+
+def result_fields(i: int) -> dict[str, Any]:
+    return {
+        "matched_track_id": f"{i:022d}",
+        "match_score": 0.9 + (i % 10) / 100,
+        "action": "auto_liked",
+    }
+
+
+def append_before(songs: list[SongInput]) -> list[bytes]:
+    """Encode result lines the old way: asdict and json.dumps per entry."""
+    return [
+        (json.dumps({"song": asdict(song), **result_fields(i)}, default=str) + "\n").encode()
+        for i, song in enumerate(songs)
+    ]
+
+
+def append_after(song_lines: list[bytes]) -> list[bytes]:
+    """Encode result lines around the songs encoded at upload."""
+    return [
+        encode_entry(result_fields(i), {"song": song_json}) + b"\n"
+        for i, song_json in enumerate(song_lines)
+    ]
+
+
+def summary(count: int) -> dict[str, Any]:
+    return {
+        "session_id": "benchmark",
+        "total_songs": count,
+        "successful": count,
+        "rejected": 0,
+        "skipped": 0,
+        "success_rate": 100.0,
+    }
+
+
+def respond_before(lines: list[bytes]) -> bytes:
+    """Decode every line, validate the model and encode it again."""
+    model = MigrationResult(
+        **summary(len(lines)),
+        results=[json.loads(line) for line in lines],
+        rejected_songs=[],
+    )
+    return json.dumps(model.model_dump(), separators=(",", ":")).encode()
+
+
+def respond_after(lines: list[bytes]) -> bytes:
+    """Splice the stored lines into the response."""
+    return (
+        dumps(summary(len(lines)))[:-1]
+        + b',"results":'
+        + encode_array(lines)
+        + b',"rejected_songs":[]}'
+    )
+
+
+def timed(func: Callable[[Any], Any], arg: Any, repeat: int = 3) -> tuple[Any, float]:
+    """Return the result and the best time in milliseconds of ``repeat`` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(arg)
+        best = min(best, time.perf_counter() - start)
+    return result, best * 1000
+
+
+def sizes(body: bytes) -> str:
+    gzip_size = len(zlib.compress(body, 6)) / 1024
+    text = f"{len(body) / 1024:>9.0f} {gzip_size:>8.0f}"
+    if brotli is not None:
+        text += f" {len(brotli.compress(body, quality=4)) / 1024:>8.0f}"
+    return text
+
+
+def main(counts: list[int]) -> None:
+    print(f"JSON encoder: {'orjson' if orjson is not None else 'json'}")
+    header = f"{'results':>8} {'path':>6} {'append ms':>10} {'respond ms':>11} {'KiB':>9} {'gzip KiB':>8}"
+    if brotli is not None:
+        header += f" {'br KiB':>8}"
+    print(header)
+    for count in counts:
+        songs = generate_songs(count)
+        song_lines = [dumps(asdict(song)) for song in songs]
+
+        before_lines, before_append = timed(append_before, songs)
+        before_body, before_respond = timed(respond_before, before_lines)
+        after_lines, after_append = timed(append_after, song_lines)
+        after_body, after_respond = timed(respond_after, after_lines)
+        assert json.loads(before_body) == json.loads(after_body)
+
+        for path, append, respond, body in (
+            ("before", before_append, before_respond, before_body),
+            ("after", after_append, after_respond, after_body),
+        ):
+            print(f"{count:>8} {path:>6} {append:>10.1f} {respond:>11.1f} {sizes(body)}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000])
@@ -0,0 +1,86 @@
+"""
+Benchmark peak memory of JSON export parsing.
+
+Compares loading a generated export with ``json.load`` against streaming it
+with ``iter_input_file``. Streaming peak memory should stay flat as the
+export grows.
+
+Usage:
+    python benchmarks/bench_json_parse.py [track_count ...]
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+from yt2spot.input_parser import iter_input_file
+
+
+def write_export(path: Path, track_count: int) -> None:
+    """Write a Takeout-style export with ``track_count`` tracks."""
+    with open(path, "w", encoding="utf-8") as file:
+        file.write('{"metadata": {"source": "benchmark"}, "tracks": [')
+        for i in range(track_count):
+            if i:
+                file.write(",")
+            json.dump(
+                {
+                    "title": f"Song Title {i}",
+                    "artist": [f"Artist {i % 997}", "Featured Artist"],
+                    "album": f"Album {i % 113}",
+                    "duration_ms": 180000 + i % 60000,
+                },
+                file,
+            )
+        file.write("]}")
+
+
+def load_whole(path: Path) -> int:
+    """Parse the export the old way, materializing the document."""
+    with open(path, encoding="utf-8") as file:
+        data = json.load(file)
+    return len(data["tracks"])
+
+
+def stream(path: Path) -> int:
+    """Parse the export incrementally, discarding each song after use."""
+    return sum(1 for _ in iter_input_file(path))
+
+
+def measure(func: Callable[[Path], int], path: Path) -> tuple[int, float, float]:
+    """Return (items, peak MiB, seconds) for one parse."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    items = func(path)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return items, peak / 2**20, elapsed
+
+
+def main(counts: list[int]) -> None:
+    print(f"{'tracks':>10} {'file MiB':>9} {'json.load MiB':>14} {'stream MiB':>11} {'stream s':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in counts:
+            path = Path(tmp) / f"export-{count}.json"
+            write_export(path, count)
+            size = path.stat().st_size / 2**20
+
+            _, whole_peak, _ = measure(load_whole, path)
+            items, stream_peak, stream_time = measure(stream, path)
+            assert items == count
+
+            print(
+                f"{count:>10} {size:>9.1f} {whole_peak:>14.1f} "
+                f"{stream_peak:>11.2f} {stream_time:>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 500_000])
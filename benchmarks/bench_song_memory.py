@@ -0,0 +1,93 @@
+"""
+Benchmark memory cost per song of the different song containers.
+
+Compares a list of dict-backed dataclasses (how SongInput used to be
+defined), a list of the current slotted SongInput (what parse_csv_parallel
+returned before) and a SongTable (what it returns now).
+
+Usage:
+    python benchmarks/bench_song_memory.py [song_count]
+"""
+
+from __future__ import annotations
+
+import sys
+import tracemalloc
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+from yt2spot.models import SongInput
+from yt2spot.song_table import SongTable
+
+
+@dataclass
+class DictSongInput:
+    """SongInput as it was before it was slotted."""
+
+    title: str
+    artist: str
+    album: str = ""
+    duration: str = ""
+    source_line: int = 0
+    normalized_key: str = ""
+
+    def __post_init__(self) -> None:
+        if not self.normalized_key:
+            self.normalized_key = f"{self.title.lower()}|{self.artist.lower()}"
+
+
+def generate_fields(count: int) -> Iterator[tuple[str, str, str, str, int]]:
+    """Yield library-like fields: unique titles, repeating artists and albums."""
+    for i in range(count):
+        yield (
+            f"Song Title Number {i}",
+            f"Artist {i % 5000}",
+            f"Album {i % 20000}",
+            f"{i % 6}:{i % 60:02d}",
+            i + 1,
+        )
+
+
+def build_list(song_class: type, count: int) -> list:
+    return [
+        song_class(title, artist, album, duration, line)
+        for title, artist, album, duration, line in generate_fields(count)
+    ]
+
+
+def bytes_per_song(build: Callable[[], Any], count: int) -> float:
+    """Return bytes still allocated per song after building the container."""
+    tracemalloc.start()
+    container = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del container
+    return current / count
+
+
+def main(count: int) -> None:
+    results = {
+        "list[dict dataclass]": bytes_per_song(
+            lambda: build_list(DictSongInput, count), count
+        ),
+        "list[slotted SongInput]": bytes_per_song(
+            lambda: build_list(SongInput, count), count
+        ),
+        # Built from a stream, as the parser workers do
+        "SongTable": bytes_per_song(
+            lambda: SongTable.from_songs(
+                SongInput(*fields) for fields in generate_fields(count)
+            ),
+            count,
+        ),
+    }
+
+    baseline = results["list[dict dataclass]"]
+    print(f"{count} songs")
+    for name, per_song in results.items():
+        print(f"  {name:<24} {per_song:>8.1f} B/song  ({per_song / baseline:.0%})")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
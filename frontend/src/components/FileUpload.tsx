@@ -55,16 +55,22 @@ export const FileUpload: React.FC<FileUploadProps> = ({ onSuccess }) => {
     setError(null);
 
     try {
-      // We need to re-upload the file for the migration endpoint
-      // In a real app, you'd store the file or pass a file ID
-      const fileInput = document.querySelector('input[type="file"]') as HTMLInputElement;
-      const file = fileInput?.files?.[0];
+      // The upload's parse is cached on the server, so send its token
+      let startResponse = uploadedFile.file_token
+        ? await api.startMigrationFromUpload(uploadedFile.file_token, config)
+        : null;
 
-      if (!file) {
-        throw new Error('Please re-select your file');
-      }
+      if (!startResponse) {
+        // Too large to cache, or evicted since: upload the file again
+        const fileInput = document.querySelector('input[type="file"]') as HTMLInputElement;
+        const file = fileInput?.files?.[0];
+
+        if (!file) {
+          throw new Error('Please re-select your file');
+        }
 
-      const startResponse = await api.startMigration(file, config);
+        startResponse = await api.startMigration(file, config);
+      }
 
       // Poll for initial status
       const status = await api.getMigrationStatus(startResponse.session_id);
@@ -1,8 +1,11 @@
-import React, { useState } from 'react';
+import React, { useCallback, useEffect, useState } from 'react';
 import { CheckCircle, XCircle, Music, Headphones, ExternalLink, AlertTriangle } from 'lucide-react';
-import { MigrationSession, SpotifyTrack } from '../types';
+import { DecisionAnswer, MigrationSession, PendingDecisionBatch, SpotifyTrack } from '../types';
 import { api } from '../utils/api';
 
+// Decisions fetched, answered and submitted together
+const DECISION_BATCH_SIZE = 20;
+
 interface InteractiveDecisionProps {
   session: MigrationSession;
   onDecisionMade: (session: MigrationSession) => void;
@@ -11,32 +14,58 @@ interface InteractiveDecisionProps {
 
 export const InteractiveDecision: React.FC<InteractiveDecisionProps> = ({
   session,
-  onDecisionMade,
-  onComplete
+  onDecisionMade
 }) => {
+  const [batch, setBatch] = useState<PendingDecisionBatch | null>(null);
+  const [index, setIndex] = useState(0);
+  const [answers, setAnswers] = useState<DecisionAnswer[]>([]);
   const [isSubmitting, setIsSubmitting] = useState(false);
   const [error, setError] = useState<string | null>(null);
 
-  const handleDecision = async (decision: 'accept' | 'reject' | 'manual', candidateId?: string) => {
+  const loadBatch = useCallback(async () => {
+    try {
+      const nextBatch = await api.getPendingDecisions(session.session_id, DECISION_BATCH_SIZE);
+      setBatch(nextBatch);
+      setIndex(0);
+      setAnswers([]);
+    } catch (err) {
+      setError(err instanceof Error ? err.message : 'Failed to load decisions');
+    }
+  }, [session.session_id]);
+
+  useEffect(() => {
+    loadBatch();
+  }, [loadBatch]);
+
+  const handleDecision = async (action: DecisionAnswer['action'], candidateId?: string) => {
+    if (!batch) {
+      return;
+    }
+    const answered = [
+      ...answers,
+      { decision_id: batch.decisions[index].decision_id, action, selected_track_id: candidateId }
+    ];
+    if (index + 1 < batch.decisions.length) {
+      // Answers are sent once the whole batch is answered
+      setAnswers(answered);
+      setIndex(index + 1);
+      return;
+    }
+
     setIsSubmitting(true);
     setError(null);
 
     try {
-      const response = await api.makeDecision(session.session_id, decision, candidateId);
-
-      if (response.migration_complete) {
-        onComplete(response.session);
-      } else {
-        onDecisionMade(response.session);
-      }
+      await api.submitDecisions(session.session_id, answered);
+      await loadBatch();
     } catch (err) {
-      setError(err instanceof Error ? err.message : 'Failed to submit decision');
+      setError(err instanceof Error ? err.message : 'Failed to submit decisions');
     } finally {
       setIsSubmitting(false);
     }
   };
 
-  const decision = session.current_decision_needed || session.pending_decision;
+  const decision = batch?.decisions[index];
   if (!decision) {
     return (
       <div className="max-w-4xl mx-auto">
@@ -44,11 +73,16 @@ export const InteractiveDecision: React.FC<InteractiveDecisionProps> = ({
           <div className="text-center">
             <AlertTriangle className="h-12 w-12 text-yellow-400 mx-auto mb-4" />
             <h3 className="text-xl font-semibold text-white mb-2">
-              No Decision Required
+              {batch ? 'No Decision Required' : 'Loading Decisions...'}
             </h3>
-            <p className="text-spotify-gray">
+            <p className="text-spotify-gray mb-4">
               The migration is continuing automatically.
             </p>
+            {batch && (
+              <button onClick={() => onDecisionMade(session)} className="btn-primary">
+                Back to Progress
+              </button>
+            )}
           </div>
         </div>
       </div>
@@ -169,7 +203,7 @@ export const InteractiveDecision: React.FC<InteractiveDecisionProps> = ({
 
               <div className="mt-4 flex justify-end">
                 <button
-                  onClick={() => handleDecision('manual', candidate.id || candidate.spotify_id)}
+                  onClick={() => handleDecision('accept', candidate.id || candidate.spotify_id)}
                   disabled={isSubmitting}
                   className="btn-primary disabled:opacity-50 disabled:cursor-not-allowed"
                 >
@@ -184,7 +218,7 @@ export const InteractiveDecision: React.FC<InteractiveDecisionProps> = ({
       {/* Action Buttons */}
       <div className="flex justify-center space-x-4">
         <button
-          onClick={() => handleDecision('reject')}
+          onClick={() => handleDecision('skip')}
           disabled={isSubmitting}
           className="btn-secondary disabled:opacity-50 disabled:cursor-not-allowed flex items-center space-x-2"
         >
@@ -214,8 +248,8 @@ export const InteractiveDecision: React.FC<InteractiveDecisionProps> = ({
       {/* Progress Context */}
       <div className="mt-8 text-center">
         <p className="text-spotify-gray">
-          Song {session.processed_songs + 1} of {session.total_songs} •
-          {session.accepted_songs} accepted • {session.rejected_songs} rejected
+          Decision {index + 1} of {batch.decisions.length} in this batch •
+          {batch.pending} waiting in total • matching continues in the background
         </p>
       </div>
     </div>
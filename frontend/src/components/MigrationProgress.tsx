@@ -1,5 +1,5 @@
 import React, { useEffect, useState } from 'react';
-import { Play, CheckCircle, XCircle, Clock, Music, AlertTriangle } from 'lucide-react';
+import { Play, Pause, Square, CheckCircle, XCircle, Clock, Music, AlertTriangle } from 'lucide-react';
 import { MigrationSession } from '../types';
 import { api } from '../utils/api';
 
@@ -15,37 +15,51 @@ export const MigrationProgress: React.FC<MigrationProgressProps> = ({
   onInteractionNeeded
 }) => {
   const [session, setSession] = useState(initialSession);
-  const [isPolling, setIsPolling] = useState(true);
+  const [isStreaming, setIsStreaming] = useState(true);
+  const [controlError, setControlError] = useState<string | null>(null);
+
+  const isActive = ['queued', 'processing', 'awaiting_decision'].includes(session.status);
 
   useEffect(() => {
-    let interval: NodeJS.Timeout;
-
-    if (isPolling && (session.status === 'processing' || session.status === 'awaiting_decision')) {
-      interval = setInterval(async () => {
-        try {
-          const updatedSession = await api.getMigrationStatus(session.session_id);
-          setSession(updatedSession);
-
-          if (updatedSession.status === 'completed') {
-            setIsPolling(false);
-            onComplete(updatedSession);
-          } else if (updatedSession.status === 'awaiting_decision') {
-            setIsPolling(false);
-            onInteractionNeeded(updatedSession);
-          } else if (updatedSession.status === 'error') {
-            setIsPolling(false);
-          }
-        } catch (error) {
-          console.error('Failed to update status:', error);
-          setIsPolling(false);
-        }
-      }, 1000);
+    if (!isStreaming || !isActive) {
+      return;
     }
 
-    return () => {
-      if (interval) clearInterval(interval);
-    };
-  }, [session.session_id, session.status, isPolling, onComplete, onInteractionNeeded]);
+    const unsubscribe = api.subscribeToMigration(
+      session.session_id,
+      (updatedSession) => {
+        setSession(updatedSession);
+
+        if (updatedSession.status === 'completed' || updatedSession.status === 'cancelled') {
+          setIsStreaming(false);
+          onComplete(updatedSession);
+        } else if (updatedSession.status === 'awaiting_decision') {
+          setIsStreaming(false);
+          onInteractionNeeded(updatedSession);
+        } else if (updatedSession.status === 'error' || updatedSession.status === 'paused') {
+          setIsStreaming(false);
+        }
+      },
+      (error) => {
+        console.error('Failed to update status:', error);
+        setIsStreaming(false);
+      }
+    );
+
+    return unsubscribe;
+  }, [session.session_id, session.status, isActive, isStreaming, onComplete, onInteractionNeeded]);
+
+  const handleControl = async (action: (sessionId: string) => Promise<unknown>) => {
+    setControlError(null);
+    try {
+      await action(session.session_id);
+      // Pausing and cancelling finish at the worker's next checkpoint; the stream reports it
+      setSession(await api.getMigrationStatus(session.session_id));
+      setIsStreaming(true);
+    } catch (error) {
+      setControlError(error instanceof Error ? error.message : 'Request failed');
+    }
+  };
 
   const getStatusIcon = () => {
     switch (session.status) {
@@ -55,6 +69,10 @@ export const MigrationProgress: React.FC<MigrationProgressProps> = ({
         return <CheckCircle className="h-6 w-6 text-green-400" />;
       case 'awaiting_decision':
         return <AlertTriangle className="h-6 w-6 text-yellow-400" />;
+      case 'paused':
+        return <Pause className="h-6 w-6 text-spotify-gray" />;
+      case 'cancelled':
+        return <Square className="h-6 w-6 text-spotify-gray" />;
       case 'error':
         return <XCircle className="h-6 w-6 text-red-400" />;
       default:
@@ -69,7 +87,11 @@ export const MigrationProgress: React.FC<MigrationProgressProps> = ({
       case 'completed':
         return 'Migration completed!';
       case 'awaiting_decision':
-        return 'Waiting for your decision';
+        return 'Waiting for your remaining decisions';
+      case 'paused':
+        return 'Migration paused';
+      case 'cancelled':
+        return 'Migration cancelled';
       case 'error':
         return 'Migration failed';
       default:
@@ -104,7 +126,27 @@ export const MigrationProgress: React.FC<MigrationProgressProps> = ({
               {session.processed_songs} of {session.total_songs} songs processed
             </p>
           </div>
+          <div className="flex-1" />
+          {isActive && (
+            <button onClick={() => handleControl((id) => api.pauseMigration(id))} className="btn-secondary flex items-center space-x-2">
+              <Pause className="h-4 w-4" />
+              <span>Pause</span>
+            </button>
+          )}
+          {session.status === 'paused' && (
+            <button onClick={() => handleControl((id) => api.resumeMigration(id))} className="btn-primary flex items-center space-x-2">
+              <Play className="h-4 w-4" />
+              <span>Resume</span>
+            </button>
+          )}
+          {(isActive || session.status === 'paused') && (
+            <button onClick={() => handleControl((id) => api.cancelMigration(id))} className="btn-secondary flex items-center space-x-2">
+              <Square className="h-4 w-4" />
+              <span>Cancel</span>
+            </button>
+          )}
         </div>
+        {controlError && <p className="text-red-300 mb-4">{controlError}</p>}
 
         {/* Progress Bar */}
         <div className="mb-6">
@@ -156,6 +198,23 @@ export const MigrationProgress: React.FC<MigrationProgressProps> = ({
         </div>
       </div>
 
+      {/* Decisions waiting for review; matching continues meanwhile */}
+      {(session.progress?.pending_decisions ?? 0) > 0 && (
+        <div className="card bg-yellow-500/10 border-yellow-500/40 mb-6">
+          <div className="flex items-center justify-between">
+            <div className="flex items-center space-x-3">
+              <AlertTriangle className="h-6 w-6 text-yellow-400" />
+              <p className="text-white">
+                {session.progress.pending_decisions} uncertain matches are waiting for your review
+              </p>
+            </div>
+            <button onClick={() => onInteractionNeeded(session)} className="btn-primary">
+              Review Now
+            </button>
+          </div>
+        </div>
+      )}
+
       {/* Current Song (if processing) */}
       {session.status === 'processing' && session.current_song && (
         <div className="card bg-white/10 backdrop-blur border-gray-700">
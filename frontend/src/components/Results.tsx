@@ -15,7 +15,10 @@ export const Results: React.FC<ResultsProps> = ({ session, onStartNew }) => {
 
   const handleDownloadReport = async () => {
     try {
-      const results = await api.getMigrationResults(session.session_id);
+      const [acceptedSongs, rejectedSongs] = await Promise.all([
+        api.getAllMigrationResults(session.session_id, 'results'),
+        api.getAllMigrationResults(session.session_id, 'rejected_songs')
+      ]);
 
       // Create a detailed report
       const report = {
@@ -29,9 +32,9 @@ export const Results: React.FC<ResultsProps> = ({ session, onStartNew }) => {
           success_rate: successRate.toFixed(1) + '%',
           duration: session.duration || 'Unknown'
         },
-        accepted_songs: results.accepted_songs || [],
-        rejected_songs: results.rejected_songs || [],
-        manual_songs: results.manual_songs || []
+        accepted_songs: acceptedSongs,
+        rejected_songs: rejectedSongs,
+        manual_songs: acceptedSongs.filter((result) => result.action === 'liked')
       };
 
       const blob = new Blob([JSON.stringify(report, null, 2)], { type: 'application/json' });
@@ -26,6 +26,8 @@ export interface MigrationConfig {
   reject_threshold: number;
   max_candidates: number;
   dry_run: boolean;
+  playlist_name?: string | null;
+  public?: boolean;
 }
 
 export interface MigrationProgress {
@@ -34,17 +36,31 @@ export interface MigrationProgress {
   successful: number;
   rejected: number;
   skipped: number;
+  pending_decisions?: number;
 }
 
 export interface PendingDecision {
+  decision_id?: string;
   song: Song;
   candidates: SpotifyTrack[];
   match_scores?: number[];
 }
 
+export interface PendingDecisionBatch {
+  session_id: string;
+  pending: number;
+  decisions: Array<PendingDecision & { decision_id: string }>;
+}
+
+export interface DecisionAnswer {
+  decision_id: string;
+  action: 'accept' | 'reject' | 'skip';
+  selected_track_id?: string;
+}
+
 export interface MigrationSession {
   session_id: string;
-  status: 'processing' | 'completed' | 'error' | 'awaiting_decision';
+  status: 'queued' | 'processing' | 'awaiting_decision' | 'paused' | 'completed' | 'cancelled' | 'error';
   progress: MigrationProgress;
   current_song?: Song & { index: number; total: number };
   pending_decision?: PendingDecision;
@@ -104,11 +120,19 @@ export interface MigrationResult {
   }>;
 }
 
+export interface ResultsPage {
+  session_id: string;
+  kind: 'results' | 'rejected_songs';
+  items: Array<Record<string, any>>;
+  next_cursor: string | null;
+}
+
 export interface UploadResponse {
   filename: string;
   total_songs: number;
   songs: Song[];
   preview_truncated: boolean;
+  file_token: string | null; // Starts a migration without uploading again
 }
 
 export interface StartMigrationResponse {
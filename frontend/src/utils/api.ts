@@ -1,3 +1,5 @@
+import { DecisionAnswer, PendingDecisionBatch, ResultsPage } from '../types';
+
 const API_BASE_URL = 'http://localhost:8000';
 
 class ApiClient {
@@ -36,6 +38,25 @@ class ApiClient {
     return response.json();
   }
 
+  // Start from a file already sent to /upload; null if its parse is no longer cached
+  async startMigrationFromUpload(fileToken: string, config: any) {
+    const response = await fetch(`${API_BASE_URL}/migrate/start`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ file_token: fileToken, config }),
+    });
+
+    if (response.status === 404) {
+      return null;
+    }
+    if (!response.ok) {
+      const error = await response.json();
+      throw new Error(error.detail || 'Failed to start migration');
+    }
+
+    return response.json();
+  }
+
   async getMigrationStatus(sessionId: string) {
     const response = await fetch(`${API_BASE_URL}/migrate/status/${sessionId}`);
 
@@ -47,6 +68,56 @@ class ApiClient {
     return response.json();
   }
 
+  subscribeToMigration(
+    sessionId: string,
+    onStatus: (session: any) => void,
+    onError: (error: Error) => void
+  ): () => void {
+    // Server-Sent Events: the backend pushes a snapshot whenever the session changes
+    const source = new EventSource(`${API_BASE_URL}/migrate/events/${sessionId}`);
+
+    source.addEventListener('status', (event) => {
+      const session = JSON.parse((event as MessageEvent).data);
+      onStatus(session);
+      // A paused migration gets a new stream once it is resumed
+      if (['completed', 'cancelled', 'error', 'paused'].includes(session.status)) {
+        source.close();
+      }
+    });
+    source.onerror = () => {
+      if (source.readyState === EventSource.CLOSED) {
+        onError(new Error('Lost connection to migration updates'));
+      }
+    };
+
+    return () => source.close();
+  }
+
+  private async controlMigration(sessionId: string, action: 'pause' | 'resume' | 'cancel') {
+    const response = await fetch(`${API_BASE_URL}/migrate/${sessionId}/${action}`, {
+      method: 'POST',
+    });
+
+    if (!response.ok) {
+      const error = await response.json();
+      throw new Error(error.detail || `Failed to ${action} migration`);
+    }
+
+    return response.json();
+  }
+
+  async pauseMigration(sessionId: string) {
+    return this.controlMigration(sessionId, 'pause');
+  }
+
+  async resumeMigration(sessionId: string) {
+    return this.controlMigration(sessionId, 'resume');
+  }
+
+  async cancelMigration(sessionId: string) {
+    return this.controlMigration(sessionId, 'cancel');
+  }
+
   async getMigrationResults(sessionId: string) {
     const response = await fetch(`${API_BASE_URL}/migrate/results/${sessionId}`);
 
@@ -58,22 +129,69 @@ class ApiClient {
     return response.json();
   }
 
-  async makeDecision(sessionId: string, decision: 'accept' | 'reject' | 'manual', candidateId?: string) {
-    const response = await fetch(`${API_BASE_URL}/migrate/decision`, {
+  async getMigrationResultsPage(
+    sessionId: string,
+    kind: 'results' | 'rejected_songs',
+    options: { cursor?: string; limit?: number; action?: string; reason?: string } = {}
+  ): Promise<ResultsPage> {
+    const params = new URLSearchParams({ kind });
+    for (const [key, value] of Object.entries(options)) {
+      if (value !== undefined) {
+        params.set(key, String(value));
+      }
+    }
+    const response = await fetch(`${API_BASE_URL}/migrate/results/${sessionId}/page?${params}`);
+
+    if (!response.ok) {
+      const error = await response.json();
+      throw new Error(error.detail || 'Failed to get results');
+    }
+
+    return response.json();
+  }
+
+  async getAllMigrationResults(sessionId: string, kind: 'results' | 'rejected_songs') {
+    // Page through the results so no single response has to hold them all.
+    // A running session's last page points back at its end, so stop there
+    const items: any[] = [];
+    let cursor: string | undefined;
+    for (;;) {
+      const page = await this.getMigrationResultsPage(sessionId, kind, { cursor, limit: 1000 });
+      items.push(...page.items);
+      const next = page.next_cursor ?? undefined;
+      if (next === undefined || next === cursor) {
+        return items;
+      }
+      cursor = next;
+    }
+  }
+
+  async getPendingDecisions(sessionId: string, limit = 20): Promise<PendingDecisionBatch> {
+    const response = await fetch(`${API_BASE_URL}/migrate/decisions/${sessionId}?limit=${limit}`);
+
+    if (!response.ok) {
+      const error = await response.json();
+      throw new Error(error.detail || 'Failed to get pending decisions');
+    }
+
+    return response.json();
+  }
+
+  async submitDecisions(sessionId: string, decisions: DecisionAnswer[]) {
+    const response = await fetch(`${API_BASE_URL}/migrate/decisions`, {
       method: 'POST',
       headers: {
         'Content-Type': 'application/json',
       },
       body: JSON.stringify({
         session_id: sessionId,
-        decision,
-        candidate_id: candidateId,
+        decisions,
       }),
     });
 
     if (!response.ok) {
       const error = await response.json();
-      throw new Error(error.detail || 'Failed to submit decision');
+      throw new Error(error.detail || 'Failed to submit decisions');
     }
 
     return response.json();
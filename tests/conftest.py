@@ -1,7 +1,91 @@
 """Test configuration for YT2Spot."""
 
+import importlib
+import sys
+import time
+from pathlib import Path
+
 import pytest
 
+from yt2spot.models import MatchCandidate
+
+# The backend's modules import each other as top-level siblings
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+
+class FakeSpotify:
+    """
+    Spotify client for backend tests.
+
+    Songs by Queen are certain matches, songs by John Lennon are uncertain
+    (queued for the user) and all others are rejected. Searches and likes
+    are counted across every client the backend creates.
+    """
+
+    search_delay = 0.0
+    searches = 0
+    liked = []
+
+    def __init__(self, config):
+        pass
+
+    def authenticate(self):
+        return True
+
+    def search_tracks(self, query):
+        FakeSpotify.searches += 1
+        time.sleep(self.search_delay)
+        return query
+
+    def like_track(self, track_id):
+        FakeSpotify.liked.append(track_id)
+        return True
+
+
+def fake_search(song, client, config, store):
+    """Stand-in for search_spotify_tracks, routed through the client."""
+    client.search_tracks(song.title)
+    if "Queen" in song.artist:
+        score = 0.95
+    elif "Lennon" in song.artist:
+        score = 0.7
+    else:
+        score = 0.1
+    return [
+        MatchCandidate(
+            spotify_id=f"id-{song.title}",
+            title=song.title,
+            artist=song.artist,
+            all_artists=song.artist,
+            album="",
+            duration_ms=1,
+            popularity=1,
+            match_score=score,
+        )
+    ]
+
+
+def load_backend():
+    """Import the backend app afresh, configured by the environment, with a fake Spotify."""
+    sys.modules.pop("main", None)
+    main = importlib.import_module("main")
+    FakeSpotify.searches = 0
+    FakeSpotify.liked = []
+    main.SpotifyClient = FakeSpotify
+    main.search_spotify_tracks = fake_search
+    main.score_candidates = lambda song, candidates, config: candidates
+    return main
+
+
+@pytest.fixture
+def backend(tmp_path, monkeypatch):
+    """The backend app module, keeping its files in tmp_path."""
+    monkeypatch.setenv("YT2SPOT_LOG_DIR", str(tmp_path / "logs"))
+    monkeypatch.setenv("YT2SPOT_SPOTIFY_RATE", "1000")
+    monkeypatch.setenv("YT2SPOT_SPOTIFY_BURST", "1000")
+    yield load_backend()
+    sys.modules.pop("main", None)
+
 
 @pytest.fixture
 def sample_input_file(tmp_path):
@@ -0,0 +1,216 @@
+"""Tests for bulk migration of many input files."""
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from yt2spot.bulk import (
+    BulkMigration,
+    SharedMatchIndex,
+    discover_inputs,
+    playlist_name_for,
+)
+from yt2spot.models import MatchCandidate, SongInput
+
+
+def _candidate(song_title, artist):
+    return MatchCandidate(
+        spotify_id=f"id-{song_title}",
+        title=song_title,
+        artist=artist,
+        all_artists=artist,
+        album="",
+        duration_ms=1,
+        popularity=1,
+        match_score=0.95,
+    )
+
+
+def _fake_search(song, client, config, store=None):
+    return client.search_tracks(f"{song.title}|{song.artist}")
+
+
+class FakeClient:
+    """Spotify client that finds every song exactly and records playlists."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.searches = []
+        self.playlists = {}
+
+    def search_tracks(self, query, limit=10):
+        with self.lock:
+            self.searches.append(query)
+        title, _, artist = query.partition("|")
+        return [_candidate(title, artist)]
+
+    def get_playlist_by_name(self, name):
+        return {"id": name} if name in self.playlists else None
+
+    def create_playlist(self, name, description="", public=True):
+        self.playlists[name] = []
+        return name
+
+    def get_playlist_track_ids(self, playlist_id):
+        return set(self.playlists[playlist_id])
+
+    def add_tracks_to_playlist(self, playlist_id, track_ids):
+        self.playlists[playlist_id].extend(track_ids)
+        return True
+
+
+class TestDiscoverInputs:
+    """Test expanding input paths."""
+
+    def test_directories_contribute_supported_files_in_order(self, tmp_path):
+        (tmp_path / "b.csv").write_text("")
+        (tmp_path / "a.txt").write_text("")
+        (tmp_path / "notes.md").write_text("")
+        extra = tmp_path / "extra.dat"
+        extra.write_text("")
+
+        assert discover_inputs([tmp_path, extra]) == [
+            tmp_path / "a.txt",
+            tmp_path / "b.csv",
+            extra,
+        ]
+
+    def test_rejects_missing_and_repeated_inputs(self, tmp_path):
+        song_file = tmp_path / "a.txt"
+        song_file.write_text("")
+
+        with pytest.raises(ValueError):
+            discover_inputs([tmp_path / "missing.txt"])
+        with pytest.raises(ValueError):
+            discover_inputs([song_file, tmp_path])
+
+    def test_playlist_named_after_file(self):
+        assert playlist_name_for(Path("exports/road_trip.csv"), "YT: ") == "YT: road trip"
+
+
+class TestSharedMatchIndex:
+    """Test sharing searches between files."""
+
+    def test_same_song_is_searched_once(self):
+        index = SharedMatchIndex()
+        calls = []
+
+        def search():
+            calls.append(1)
+            return ["candidate"]
+
+        first = index.candidates(SongInput(title="Imagine", artist="John Lennon"), search)
+        again = index.candidates(SongInput(title="imagine", artist="john lennon"), search)
+
+        assert first == again == ["candidate"]
+        assert len(calls) == 1
+        assert (index.searches, index.reused) == (1, 1)
+
+    def test_failed_search_is_retried(self):
+        index = SharedMatchIndex()
+        song = SongInput(title="Imagine", artist="John Lennon")
+
+        def failing():
+            raise RuntimeError("search failed")
+
+        with pytest.raises(RuntimeError):
+            index.candidates(song, failing)
+        assert index.candidates(song, lambda: ["candidate"]) == ["candidate"]
+
+    def test_waiters_search_themselves_when_the_first_search_fails(self):
+        index = SharedMatchIndex()
+        song = SongInput(title="Imagine", artist="John Lennon")
+        started = threading.Event()
+        release = threading.Event()
+
+        def failing():
+            started.set()
+            release.wait(5)
+            raise RuntimeError("search failed")
+
+        def first():
+            with pytest.raises(RuntimeError):
+                index.candidates(song, failing)
+
+        thread = threading.Thread(target=first)
+        thread.start()
+        started.wait(5)
+        results = []
+        waiter = threading.Thread(
+            target=lambda: results.append(index.candidates(song, lambda: ["retried"]))
+        )
+        waiter.start()
+        release.set()
+        thread.join(5)
+        waiter.join(5)
+
+        assert results == [["retried"]]
+
+
+class TestBulkMigration:
+    """Test migrating many files concurrently."""
+
+    def _files(self, tmp_path):
+        rock = tmp_path / "rock.txt"
+        rock.write_text("Bohemian Rhapsody - Queen\nImagine - John Lennon\n")
+        mellow = tmp_path / "mellow.txt"
+        mellow.write_text("Imagine - John Lennon\nHey Jude - The Beatles\n")
+        return rock, mellow
+
+    def test_each_file_fills_its_own_playlist(self, tmp_path, sample_config, monkeypatch):
+        monkeypatch.setattr("yt2spot.bulk.search_spotify_tracks", _fake_search)
+        monkeypatch.setattr("yt2spot.bulk.score_candidates", lambda song, c, config: c)
+        sample_config.dry_run = False
+        client = FakeClient()
+        rock, mellow = self._files(tmp_path)
+
+        results = BulkMigration(client, sample_config, concurrency=2).run(
+            [(rock, "Rock"), (mellow, "Mellow")]
+        )
+
+        assert [r.playlist_name for r in results] == ["Rock", "Mellow"]
+        assert all(r.ok and r.total == 2 for r in results)
+        assert client.playlists == {
+            "Rock": ["id-Bohemian Rhapsody", "id-Imagine"],
+            "Mellow": ["id-Imagine", "id-Hey Jude"],
+        }
+        # "Imagine" is in both files but searched once
+        assert len(client.searches) == 3
+
+    def test_rerun_adds_only_missing_tracks(self, tmp_path, sample_config, monkeypatch):
+        monkeypatch.setattr("yt2spot.bulk.search_spotify_tracks", _fake_search)
+        monkeypatch.setattr("yt2spot.bulk.score_candidates", lambda song, c, config: c)
+        sample_config.dry_run = False
+        client = FakeClient()
+        rock, _ = self._files(tmp_path)
+
+        BulkMigration(client, sample_config).run([(rock, "Rock")])
+        with rock.open("a") as f:
+            f.write("Hey Jude - The Beatles\n")
+        results = BulkMigration(client, sample_config).run([(rock, "Rock")])
+
+        assert client.playlists["Rock"] == [
+            "id-Bohemian Rhapsody",
+            "id-Imagine",
+            "id-Hey Jude",
+        ]
+        assert results[0].added == 1
+
+    def test_dry_run_creates_no_playlists(self, tmp_path, sample_config, monkeypatch):
+        monkeypatch.setattr(
+            "yt2spot.bulk.search_spotify_tracks",
+            lambda song, client, config, store=None: [],
+        )
+        client = FakeClient()
+        rock, _ = self._files(tmp_path)
+        missing = tmp_path / "broken.xyz"
+        missing.write_text("")
+
+        results = BulkMigration(client, sample_config).run(
+            [(rock, "Rock"), (missing, "Broken")]
+        )
+
+        assert client.playlists == {}
+        assert results[0].ok and results[0].rejected == 2
+        assert not results[1].ok
@@ -0,0 +1,185 @@
+"""Tests for CLI processing helpers."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from yt2spot import cli
+from yt2spot.incremental import SeenSongs
+from yt2spot.matcher import decision as decision_module
+from yt2spot.models import MatchCandidate, MatchDecision, SongInput
+
+
+def _songs(count):
+    return [
+        SongInput(title=f"Song {i}", artist="Artist", source_line=i)
+        for i in range(1, count + 1)
+    ]
+
+
+class TestPrefetch:
+    """Test candidate prefetching."""
+
+    def test_preserves_input_order(self, sample_config, monkeypatch):
+        """Test that prefetched songs are yielded in input order."""
+        monkeypatch.setattr(
+            cli, "_search_and_score", lambda song, client, config, store=None: [song.title]
+        )
+        songs = _songs(10)
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            pairs = list(cli._iter_prefetched(songs, None, sample_config, executor, 3))
+
+        assert [song for song, _ in pairs] == songs
+        assert [future.result() for _, future in pairs] == [[s.title] for s in songs]
+
+    def test_searches_ahead_of_consumer(self, sample_config, monkeypatch):
+        """Test that the lookahead window is searched before it is consumed."""
+        searched = []
+        lock = threading.Lock()
+
+        def fake_search(song, client, config, store=None):
+            with lock:
+                searched.append(song.source_line)
+            return []
+
+        monkeypatch.setattr(cli, "_search_and_score", fake_search)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            prefetched = cli._iter_prefetched(
+                _songs(10), None, sample_config, executor, 2
+            )
+            _, first = next(prefetched)
+            first.result()
+            executor.shutdown(wait=True)
+
+        # The current song, the window of two, and the refill on first yield
+        assert sorted(searched) == [1, 2, 3, 4]
+
+    def test_without_executor_searches_lazily(self, sample_config, monkeypatch):
+        """Test that disabling prefetch searches each song when reached."""
+        searched = []
+
+        def fake_search(song, client, config, store=None):
+            searched.append(song.source_line)
+            raise RuntimeError("search failed")
+
+        monkeypatch.setattr(cli, "_search_and_score", fake_search)
+        prefetched = cli._iter_prefetched(_songs(3), None, sample_config, None, 0)
+
+        _, future = next(prefetched)
+        assert searched == [1]
+        assert isinstance(future.exception(), RuntimeError)
+
+    def test_skipped_songs_are_not_searched(self, sample_config, monkeypatch):
+        """Test that songs rejected by the skip hook get no search."""
+        searched = []
+        monkeypatch.setattr(
+            cli,
+            "_search_and_score",
+            lambda song, client, config, store=None: searched.append(song.source_line) or [],
+        )
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            pairs = list(
+                cli._iter_prefetched(
+                    _songs(6),
+                    None,
+                    sample_config,
+                    executor,
+                    2,
+                    skip=lambda song: song.source_line % 2 == 0,
+                )
+            )
+
+        assert [song.source_line for song, _ in pairs] == [1, 2, 3, 4, 5, 6]
+        assert [future is None for _, future in pairs] == [False, True] * 3
+        assert sorted(searched) == [1, 3, 5]
+
+
+class TestProcessSongs:
+    """Test the per-song processing loop."""
+
+    def test_failed_like_is_not_fanned_out(self, tmp_path, sample_config, monkeypatch):
+        """Test that duplicates of a song whose like failed are retried, not marked seen."""
+        candidate = MatchCandidate(
+            spotify_id="t1",
+            title="Imagine",
+            artist="John Lennon",
+            all_artists="John Lennon",
+            album="Imagine",
+            duration_ms=183000,
+            popularity=80,
+        )
+        monkeypatch.setattr(
+            cli, "_search_and_score", lambda song, client, config, store=None: [candidate]
+        )
+        monkeypatch.setattr(
+            decision_module,
+            "make_decision",
+            lambda song, candidates, config, interactive=False: MatchDecision(
+                input_song=song,
+                chosen_candidate=candidates[0],
+                decision="auto_accept",
+                confidence=1.0,
+            ),
+        )
+
+        class FailingClient:
+            def __init__(self):
+                self.liked = []
+
+            def like_track(self, spotify_id):
+                self.liked.append(spotify_id)
+                return False
+
+        client = FailingClient()
+        songs = [
+            SongInput(title="Imagine", artist="John Lennon", source_line=1),
+            SongInput(title="Imagine (Official Video)", artist="John Lennon", source_line=2),
+        ]
+        seen = SeenSongs.in_dir(tmp_path)
+
+        cli._process_songs_with_progress(
+            songs, client, sample_config, False, False, False, True, prefetch=0, seen=seen
+        )
+
+        assert client.liked == ["t1", "t1"]
+        assert len(seen) == 0
+
+
+class TestParseAndValidateInput:
+    """Test opening the song stream."""
+
+    def test_completed_songs_skipped_before_limit(self, tmp_path):
+        """Test that resumed lines don't count towards the limit."""
+        path = tmp_path / "songs.txt"
+        path.write_text("".join(f"Artist - Song {i}\n" for i in range(1, 7)))
+
+        songs = cli._parse_and_validate_input(
+            path, limit=2, quiet=True, completed={1, 2, 4}
+        )
+
+        assert [song.source_line for song in songs] == [3, 5]
+
+    def test_large_csv_parsed_in_parallel(self, tmp_path, monkeypatch):
+        """Test that CSVs over the size threshold go through the parallel parser."""
+        from yt2spot import input_parser
+
+        path = tmp_path / "songs.csv"
+        path.write_text(
+            "Title,Artist,Duration\n" + "".join(f"Song {i},Artist,{200 + i}\n" for i in range(5))
+        )
+        calls = []
+        parse_csv_parallel = input_parser.parse_csv_parallel
+        monkeypatch.setattr(input_parser, "PARALLEL_CSV_MIN_BYTES", 1)
+        monkeypatch.setattr(
+            input_parser,
+            "parse_csv_parallel",
+            lambda file_path: calls.append(file_path) or parse_csv_parallel(file_path, workers=1),
+        )
+
+        songs = list(cli._parse_and_validate_input(path, limit=None, quiet=True))
+
+        assert calls == [path]
+        assert songs == list(input_parser.iter_input_file(path))
+        assert [song.title for song in songs] == [f"Song {i}" for i in range(5)]
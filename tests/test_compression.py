@@ -0,0 +1,132 @@
+"""Tests for the backend's response compression middleware."""
+
+import gzip
+import json
+
+import compression
+import pytest
+from compression import CompressionMiddleware, negotiate_encoding
+from fastapi import FastAPI
+from fastapi.responses import Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+ROWS = [{"title": f"Song {i}", "artist": "Queen", "match_score": 0.95} for i in range(200)]
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+    @app.get("/rows")
+    def rows():
+        return ROWS
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/export")
+    def export():
+        lines = (json.dumps(row) + "\n" for row in ROWS)
+        return StreamingResponse(lines, media_type="application/x-ndjson")
+
+    @app.get("/events")
+    def events():
+        lines = (f"data: {json.dumps(row)}\n\n" for row in ROWS)
+        return StreamingResponse(lines, media_type="text/event-stream")
+
+    @app.get("/precompressed")
+    def precompressed():
+        body = gzip.compress(json.dumps(ROWS).encode())
+        return Response(body, media_type="application/json", headers={"Content-Encoding": "gzip"})
+
+    with TestClient(app) as client:
+        yield client
+
+
+class TestNegotiateEncoding:
+    """Test picking an encoding from Accept-Encoding."""
+
+    @pytest.mark.parametrize(
+        ("header", "expected"),
+        [
+            ("gzip, deflate, br", "br"),
+            ("br;q=0.5, gzip", "gzip"),
+            ("gzip;q=0, br;q=0", None),
+            ("identity", None),
+            ("", None),
+            ("*", "br"),
+            ("*;q=0, gzip", "gzip"),
+            ("GZIP;q=0.8", "gzip"),
+            ("gzip;q=oops", None),
+        ],
+    )
+    def test_with_brotli(self, monkeypatch, header, expected):
+        """Test q-values, wildcards and the brotli preference on ties."""
+        monkeypatch.setattr(compression, "brotli", object())
+        assert negotiate_encoding(header) == expected
+
+    def test_without_brotli(self, monkeypatch):
+        """Test that brotli is never picked when it can't be produced."""
+        monkeypatch.setattr(compression, "brotli", None)
+        assert negotiate_encoding("br") is None
+        assert negotiate_encoding("br, gzip;q=0.1") == "gzip"
+
+
+class TestCompressionMiddleware:
+    """Test which responses are compressed, and how."""
+
+    def test_gzip(self, client):
+        """Test that a large JSON body is gzipped with the headers to match."""
+        response = client.get("/rows", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "accept-encoding" in response.headers["vary"].lower()
+        assert int(response.headers["content-length"]) < len(json.dumps(ROWS)) // 5
+        assert response.json() == ROWS
+
+    def test_brotli(self, client):
+        """Test that brotli is used when it is preferred and installed."""
+        pytest.importorskip("brotli")
+        response = client.get("/rows", headers={"Accept-Encoding": "gzip, br"})
+
+        assert response.headers["content-encoding"] == "br"
+        assert response.json() == ROWS
+
+    @pytest.mark.parametrize("accept", ["identity", "gzip;q=0", ""])
+    def test_identity(self, client, accept):
+        """Test that clients not accepting an encoding get the plain body."""
+        response = client.get("/rows", headers={"Accept-Encoding": accept})
+
+        assert "content-encoding" not in response.headers
+        assert response.json() == ROWS
+
+    def test_below_minimum_size(self, client):
+        """Test that small bodies are not worth compressing."""
+        response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+        assert response.json() == {"ok": True}
+
+    def test_streamed_json(self, client):
+        """Test that NDJSON streams are compressed chunk by chunk."""
+        response = client.get("/export", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        assert [json.loads(line) for line in response.text.splitlines()] == ROWS
+
+    def test_event_stream_untouched(self, client):
+        """Test that Server-Sent Events pass through as they are written."""
+        response = client.get("/events", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+        assert response.text.count("data: ") == len(ROWS)
+
+    def test_already_encoded_untouched(self, client):
+        """Test that a body with its own Content-Encoding is not compressed again."""
+        response = client.get("/precompressed", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.json() == ROWS
@@ -0,0 +1,79 @@
+"""Tests for YouTube Music text export conversion."""
+
+import csv
+import io
+
+from yt2spot.converter import convert_export, iter_export_rows
+from yt2spot.input_parser import iter_input_file
+
+EXPORT = """
+What About Us
+P!NK
+Beautiful Trauma
+4:30
+
+Die With A Smile
+Lady Gaga
+ &
+Bruno Mars
+MAYHEM
+4:12
+
+My Song
+Artist Name
+My Song
+1:03:45
+3:00
+
+Dropped Without Artist
+2:00
+
+Song "Quoted", Title
+Artist
+"""
+
+
+class TestIterExportRows:
+    """Test the streaming block parser."""
+
+    def test_blocks(self):
+        """Test titles, multi-line artists, singles and dropped blocks."""
+        rows = list(iter_export_rows(io.StringIO(EXPORT)))
+
+        assert [row[:4] for row in rows] == [
+            ("What About Us", "P!NK", "Beautiful Trauma", "4:30"),
+            ("Die With A Smile", "Lady Gaga & Bruno Mars", "MAYHEM", "4:12"),
+            ("My Song", "Artist Name", "", "1:03:45"),
+        ]
+        assert [row.source_line for row in rows] == [2, 7, 14]
+
+
+class TestConvertExport:
+    """Test CSV output."""
+
+    def test_writes_valid_csv(self):
+        """Test that quotes and commas survive a CSV round trip."""
+        text = 'Song "Quoted", Title\nArtist\nAlbum, Deluxe\n3:30\n'
+        output = io.StringIO(newline="")
+
+        assert convert_export(io.StringIO(text), output) == 1
+
+        rows = list(csv.reader(io.StringIO(output.getvalue())))
+        assert rows == [
+            ["Title", "Artist", "Album", "Duration"],
+            ['Song "Quoted", Title', "Artist", "Album, Deluxe", "3:30"],
+        ]
+
+    def test_feeds_input_parser(self, tmp_path):
+        """Test migrating a text export without an intermediate file."""
+        path = tmp_path / "library.txt"
+        path.write_text(EXPORT, encoding="utf-8")
+
+        songs = list(iter_input_file(path, "ytmusic-text"))
+
+        assert [song.artist for song in songs] == [
+            "P!NK",
+            "Lady Gaga & Bruno Mars",
+            "Artist Name",
+        ]
+        assert songs[1].album == "MAYHEM"
@@ -0,0 +1,155 @@
+"""Tests for incremental processing and deduplication."""
+
+import pytest
+
+from yt2spot.incremental import (
+    MigrationJournal,
+    SeenSongs,
+    SongDeduplicator,
+    song_key,
+)
+from yt2spot.models import MatchDecision, SongInput
+
+
+class TestSongKey:
+    """Test deduplication keys."""
+
+    def test_ignores_youtube_noise(self):
+        """Test that qualifiers, case and punctuation don't split groups."""
+        first = SongInput(title="Hey Jude (Official Video)", artist="The Beatles")
+        second = SongInput(title="hey jude", artist="beatles, the")
+
+        assert song_key(first) == song_key(second)
+
+    def test_different_artists_differ(self):
+        """Test that the same title by different artists is not merged."""
+        first = SongInput(title="Hurt", artist="Nine Inch Nails")
+        second = SongInput(title="Hurt", artist="Johnny Cash")
+
+        assert song_key(first) != song_key(second)
+
+
+class TestSongDeduplicator:
+    """Test the deduplication stage."""
+
+    def test_fans_out_first_decision(self):
+        """Test that duplicates reuse the first song's decision."""
+        deduplicator = SongDeduplicator()
+        songs = [
+            SongInput(title="Imagine", artist="John Lennon", source_line=1),
+            SongInput(title="Hurt", artist="Johnny Cash", source_line=2),
+            SongInput(title="Imagine (HD)", artist="John Lennon", source_line=3),
+        ]
+
+        flags = [deduplicator.register(song) for song in songs]
+        assert flags == [False, False, True]
+        assert (deduplicator.unique, deduplicator.duplicates) == (2, 1)
+
+        decision = MatchDecision(
+            input_song=songs[0], decision="auto_accept", confidence=0.9, reason="ok"
+        )
+        deduplicator.record(songs[0], decision)
+        copy = deduplicator.fan_out(songs[2])
+
+        assert copy.input_song is songs[2]
+        assert copy.decision == "auto_accept"
+        assert copy.reason == "Duplicate of line 1: ok"
+        assert decision.input_song is songs[0]
+
+    def test_no_decision_to_fan_out(self):
+        """Test that a group without a recorded decision returns None."""
+        deduplicator = SongDeduplicator()
+        song = SongInput(title="Imagine", artist="John Lennon")
+        deduplicator.register(song)
+        deduplicator.register(song)
+
+        assert deduplicator.fan_out(song) is None
+
+
+class TestMigrationJournal:
+    """Test the checkpoint journal."""
+
+    def _input(self, tmp_path, text="Title,Artist\nA,B\n"):
+        path = tmp_path / "songs.csv"
+        path.write_text(text)
+        return path
+
+    def test_resume_loads_completed_lines(self, tmp_path):
+        """Test that a resumed journal knows which lines were finished."""
+        input_path = self._input(tmp_path)
+        with MigrationJournal.for_input(tmp_path, input_path) as journal:
+            journal.record(2, "auto", "track1")
+            journal.record(5, "skipped")
+
+        resumed = MigrationJournal.for_input(tmp_path, input_path, resume=True)
+        resumed.record(7, "auto", "track2")
+        resumed.close()
+
+        again = MigrationJournal.for_input(tmp_path, input_path, resume=True)
+        assert again.completed == {2, 5, 7}
+        again.close()
+
+    def test_without_resume_starts_over(self, tmp_path):
+        """Test that a fresh run discards the previous journal."""
+        input_path = self._input(tmp_path)
+        with MigrationJournal.for_input(tmp_path, input_path) as journal:
+            journal.record(2, "auto", "track1")
+
+        with MigrationJournal.for_input(tmp_path, input_path) as journal:
+            assert journal.completed == set()
+        with MigrationJournal.for_input(tmp_path, input_path, resume=True) as journal:
+            assert journal.completed == set()
+
+    def test_torn_last_line_is_ignored(self, tmp_path):
+        """Test that a partially written entry from a crash is dropped."""
+        input_path = self._input(tmp_path)
+        with MigrationJournal.for_input(tmp_path, input_path) as journal:
+            journal.record(2, "auto", "track1")
+            path = journal.path
+        with open(path, "a", encoding="utf-8") as file:
+            file.write('{"line": 3, "deci')
+
+        with MigrationJournal.for_input(tmp_path, input_path, resume=True) as journal:
+            assert journal.completed == {2}
+            journal.record(4, "manual", "track4")
+
+        with MigrationJournal.for_input(tmp_path, input_path, resume=True) as journal:
+            assert journal.completed == {2, 4}
+
+    def test_rejects_journal_of_other_input(self, tmp_path):
+        """Test that a journal is not applied to a different file."""
+        input_path = self._input(tmp_path)
+        with MigrationJournal.for_input(tmp_path, input_path) as journal:
+            path = journal.path
+
+        with pytest.raises(ValueError):
+            MigrationJournal(path, "0" * 64, resume=True)
+
+
+class TestSeenSongs:
+    """Test the set of songs handled by earlier runs."""
+
+    def test_round_trip_filters_only_new_songs(self, tmp_path):
+        """Test that a saved set skips known songs on the next run."""
+        seen = SeenSongs.in_dir(tmp_path)
+        seen.add(SongInput(title="Imagine", artist="John Lennon"))
+        seen.add(SongInput(title="Hurt", artist="Johnny Cash"))
+        seen.save()
+
+        reloaded = SeenSongs.in_dir(tmp_path)
+        export = [
+            SongInput(title="Imagine (Official Video)", artist="John Lennon"),
+            SongInput(title="Hurt", artist="Nine Inch Nails"),
+            SongInput(title="Hurt", artist="Johnny Cash"),
+        ]
+
+        assert len(reloaded) == 2
+        assert list(reloaded.filter_new(export)) == [export[1]]
+        assert reloaded.unchanged == 2
+
+    def test_save_without_changes_writes_nothing(self, tmp_path):
+        """Test that an unchanged set is not rewritten."""
+        seen = SeenSongs.in_dir(tmp_path)
+        seen.save()
+
+        assert not (tmp_path / SeenSongs.FILE_NAME).exists()
@@ -0,0 +1,152 @@
+"""Tests for input file parsing."""
+
+import pytest
+
+from yt2spot.input_parser import iter_input_file, iter_input_stream, parse_input_file
+
+
+class TestParseInputFile:
+    """Test eager parsing."""
+
+    def test_txt_file(self, sample_input_file):
+        """Test parsing a simple text export."""
+        songs = parse_input_file(sample_input_file)
+
+        assert len(songs) == 11
+        assert songs[0].title == "Bohemian Rhapsody"
+        assert songs[0].artist == "Queen"
+        assert songs[1].source_line == 2
+
+    def test_json_prefers_tracks(self, tmp_path):
+        """Test that a file's "tracks" array wins over an earlier "songs" one."""
+        path = tmp_path / "export.json"
+        path.write_text(
+            '{"songs": [{"title": "Old", "artist": "B"}], '
+            '"tracks": [{"title": "New", "artist": "A"}, {"title": "Newer", "artist": "A"}]}',
+            encoding="utf-8",
+        )
+
+        songs = parse_input_file(path)
+
+        assert [song.title for song in songs] == ["New", "Newer"]
+
+    def test_missing_file(self, tmp_path):
+        """Test that a missing file raises immediately."""
+        with pytest.raises(FileNotFoundError):
+            iter_input_file(tmp_path / "missing.txt")
+
+    def test_unsupported_format(self, tmp_path):
+        """Test that an unsupported suffix raises before iterating."""
+        path = tmp_path / "songs.xml"
+        path.write_text("<songs/>")
+
+        with pytest.raises(ValueError, match="Unsupported file format"):
+            iter_input_file(path)
+
+
+class TestIterInputStream:
+    """Test lazy parsing."""
+
+    def test_csv_with_header(self):
+        """Test CSV parsing from an iterable of lines."""
+        lines = [
+            "Title,Artist,Album,Duration\n",
+            "Imagine,John Lennon,Imagine,3:03\n",
+            "\n",
+            '"Hey, Jude",The Beatles,,7:11\n',
+        ]
+        songs = list(iter_input_stream(lines, "csv"))
+
+        assert [s.title for s in songs] == ["Imagine", "Hey, Jude"]
+        assert songs[0].album == "Imagine"
+        assert songs[1].source_line == 4
+
+    def test_csv_header_detected_past_sample(self):
+        """Test that rows after the sniffing sample are still parsed."""
+        lines = ["Title,Artist,Duration\n"] + [
+            f"Song {i},Artist {i},{180 + i}\n" for i in range(200)
+        ]
+        songs = list(iter_input_stream(lines, ".CSV"))
+
+        assert len(songs) == 200
+        assert songs[-1].title == "Song 199"
+
+    def test_json_tracks(self):
+        """Test JSON parsing with a tracks array."""
+        text = '{"tracks": [{"name": "Song", "artist": ["A", "B"]}, {"title": "x"}]}'
+        songs = list(iter_input_stream([text], "json"))
+
+        assert len(songs) == 1
+        assert songs[0].artist == "A, B"
+
+    def test_stops_reading_early(self):
+        """Test that only the consumed prefix of the input is read."""
+        read = []
+
+        def lines():
+            for i in range(1, 1000):
+                read.append(i)
+                yield f"Song {i} - Artist\n"
+
+        songs = iter_input_stream(lines(), "txt")
+        first = [next(songs) for _ in range(3)]
+
+        assert [s.source_line for s in first] == [1, 2, 3]
+        assert len(read) == 3
+
+    def test_malformed_input_raises_value_error(self):
+        """Test that parse failures surface as ValueError while iterating."""
+        with pytest.raises(ValueError, match="Failed to parse JSON file"):
+            list(iter_input_stream(["{not json"], "json"))
+
+
+class TestParseCsvParallel:
+    """Test chunked multi-process CSV parsing."""
+
+    @pytest.fixture
+    def large_csv(self, tmp_path):
+        """Create a CSV with quoted commas, quotes, newlines and blank rows."""
+        rows = ["Title,Artist,Album,Duration"]
+        for i in range(300):
+            if i % 50 == 7:
+                rows.append("")
+            if i % 13 == 0:
+                rows.append(f'"Line\nbreak, ""{i}""",Artist {i},"Album, {i}",{i}')
+            elif i % 29 == 0:
+                rows.append(f",Artist {i},,{i}")
+            else:
+                rows.append(f"Song {i},Artist {i},Album {i % 7},{i}")
+        path = tmp_path / "large.csv"
+        path.write_text("\n".join(rows) + "\n", encoding="utf-8")
+        return path
+
+    @pytest.mark.parametrize("workers", [1, 2, 5])
+    def test_matches_sequential_parser(self, large_csv, workers):
+        """Test that chunking does not change songs or line numbers."""
+        from yt2spot.input_parser import parse_csv_parallel
+        from yt2spot.song_table import SongTable
+
+        expected = list(iter_input_file(large_csv))
+        songs = parse_csv_parallel(large_csv, workers=workers)
+
+        assert isinstance(songs, SongTable)
+        assert list(songs) == expected
+        assert any("\n" in song.title for song in songs)
+
+    def test_boundaries_respect_quotes(self, tmp_path):
+        """Test that no chunk starts inside a quoted field."""
+        import mmap
+
+        from yt2spot.input_parser import _find_record_boundaries
+
+        path = tmp_path / "quoted.csv"
+        path.write_bytes(b'a,"x\n\n\n\n\n\n\n\ny"\nb,c\nd,e\n')
+
+        with open(path, "rb") as file, mmap.mmap(
+            file.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mapped:
+            boundaries = _find_record_boundaries(mapped, 0, len(mapped), 4)
+
+        assert boundaries[0] == 0
+        assert boundaries[-1] == path.stat().st_size
+        assert all(b >= 15 for b in boundaries[1:])
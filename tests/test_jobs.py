@@ -0,0 +1,125 @@
+"""Tests for the backend's migration job queues."""
+
+import sqlite3
+import threading
+import time
+
+import pytest
+from jobs import (
+    DONE,
+    FAILED,
+    QUEUED,
+    RUNNING,
+    JobRunner,
+    MemoryJobQueue,
+    QueueFull,
+    SQLiteJobQueue,
+)
+
+
+class TestSQLiteJobQueue:
+    """Test the job queue shared between server processes."""
+
+    def test_expired_lease_is_claimed_again(self, tmp_path):
+        """Test that a job whose worker stopped renewing its lease runs again."""
+        queue = SQLiteJobQueue(tmp_path / "jobs.sqlite3", lease_seconds=0.05)
+        queue.put("job")
+
+        assert queue.claim("dead-worker") == "job"
+        assert queue.claim("live-worker") is None
+        time.sleep(0.1)
+
+        assert queue.claim("live-worker") == "job"
+        assert queue.state("job") == RUNNING
+        assert not queue.heartbeat("job", "dead-worker")
+
+    def test_heartbeat_keeps_the_lease(self, tmp_path):
+        """Test that renewing the lease keeps the job with its worker."""
+        queue = SQLiteJobQueue(tmp_path / "jobs.sqlite3", lease_seconds=0.2)
+        queue.put("job")
+        assert queue.claim("worker") == "job"
+
+        for _ in range(3):
+            time.sleep(0.1)
+            assert queue.heartbeat("job", "worker")
+            assert queue.claim("other-worker") is None
+
+        queue.finish("job", ok=True)
+        assert not queue.heartbeat("job", "worker")
+
+    def test_running_jobs_of_old_databases_are_recovered(self, tmp_path):
+        """Test that a database from before leases gets the column and its stuck jobs back."""
+        path = tmp_path / "jobs.sqlite3"
+        with sqlite3.connect(path) as conn:
+            conn.execute(
+                "CREATE TABLE jobs (id TEXT PRIMARY KEY, status TEXT NOT NULL, worker TEXT,"
+                " created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+            conn.execute("INSERT INTO jobs VALUES ('job', ?, 'gone', 0, 0)", (RUNNING,))
+        conn.close()
+
+        queue = SQLiteJobQueue(path)
+
+        assert queue.state("job") == RUNNING
+        assert queue.claim("worker") == "job"
+        assert queue.stats()[QUEUED] == 0
+
+
+class TestJobRunner:
+    """Test running jobs on the worker pool."""
+
+    def test_rejects_jobs_once_the_queue_is_full(self):
+        """Test that submit raises QueueFull while the workers are busy and the queue is full."""
+        release = threading.Event()
+        started = threading.Event()
+        ran = []
+
+        def handler(job_id):
+            started.set()
+            release.wait(5)
+            ran.append(job_id)
+
+        runner = JobRunner(handler, queue=MemoryJobQueue(max_queued=2), workers=1)
+        try:
+            runner.submit("running")
+            assert started.wait(5)
+            runner.submit("a")
+            runner.submit("a")  # Already queued: no-op, takes no room
+            runner.submit("b")
+
+            with pytest.raises(QueueFull):
+                runner.submit("c")
+            assert runner.stats() == {
+                QUEUED: 2,
+                RUNNING: 1,
+                DONE: 0,
+                FAILED: 0,
+                "workers": 1,
+            }
+        finally:
+            runner.shutdown(wait=False)
+            release.set()
+            runner.shutdown()
+
+        # Shutting down finishes the running job and leaves the queue as is
+        assert ran == ["running"]
+        assert (runner.state("a"), runner.state("c")) == (QUEUED, None)
+
+    def test_failed_job_is_marked_failed(self):
+        """Test that a handler error fails the job without stopping the worker."""
+        done = threading.Event()
+
+        def handler(job_id):
+            if job_id == "bad":
+                raise RuntimeError("boom")
+            done.set()
+
+        runner = JobRunner(handler, workers=1)
+        try:
+            runner.submit("bad")
+            runner.submit("good")
+            assert done.wait(5)
+        finally:
+            runner.shutdown()
+
+        assert (runner.state("bad"), runner.state("good")) == (FAILED, DONE)
@@ -0,0 +1,113 @@
+"""Tests for incremental JSON reading."""
+
+import json
+
+import pytest
+
+from yt2spot.json_stream import iter_json_items
+
+KEYS = ("tracks", "songs", "items")
+
+
+def _chunked(text, size):
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+class TestIterJsonItems:
+    """Test array item streaming."""
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 7, 1024])
+    def test_matches_json_load(self, size):
+        """Test that any chunking yields the same items as json.loads."""
+        tracks = [
+            {"title": 'Say "Hi" \\ Bye', "artist": ["A", "B"], "duration_ms": 123456},
+            {"title": "Ünïcode ✓", "popularity": 1.5e3, "explicit": False},
+            {"title": "Nested", "meta": {"tags": [[1], {"x": None}]}, "n": -12},
+        ]
+        document = {
+            "generated": {"by": "takeout", "list": [1, 2, {"tracks": []}]},
+            "note": "tracks: [ not this ]",
+            "tracks": tracks,
+            "songs": [{"title": "ignored"}],
+        }
+        text = json.dumps(document, ensure_ascii=False)
+
+        assert list(iter_json_items(_chunked(text, size), KEYS)) == tracks
+
+    @pytest.mark.parametrize("size", [1, 4, 1024])
+    def test_top_level_array(self, size):
+        """Test a top-level array of scalars and objects."""
+        items = [1, 2.5, -3e-2, "x", True, None, {"a": 1}]
+        text = json.dumps(items, indent=2)
+
+        assert list(iter_json_items(_chunked(text, size), KEYS)) == items
+
+    def test_object_without_array(self):
+        """Test that an object without a known key yields nothing."""
+        assert list(iter_json_items(['{"other": [1, 2]}'], KEYS)) == []
+        assert list(iter_json_items(["{}"], KEYS)) == []
+
+    def test_items_are_lazy(self):
+        """Test that the preferred key's items are yielded before the document is fully read."""
+        chunks_read = []
+
+        def chunks():
+            yield '{"tracks": ['
+            for i in range(100):
+                chunks_read.append(i)
+                yield f'{{"title": "{i}"}},'
+            yield '{"title": "last"}]}'
+
+        items = iter_json_items(chunks(), KEYS)
+        assert next(items) == {"title": "0"}
+        assert len(chunks_read) < 5
+
+    @pytest.mark.parametrize("size", [1, 3, 1024])
+    @pytest.mark.parametrize("rereadable", [True, False])
+    def test_preferred_key_wins(self, size, rereadable):
+        """Test that "tracks" is used even when "songs" and "items" come first."""
+        document = {
+            "items": [{"title": "item"}],
+            "songs": [{"title": "song"}, {"title": '"tracks": ['}],
+            "tracks": [{"title": "track"}],
+            "more": {"songs": [1]},
+        }
+        text = json.dumps(document)
+        rereads = []
+
+        def reread():
+            rereads.append(True)
+            return _chunked(text, size)
+
+        items = iter_json_items(_chunked(text, size), KEYS, reread if rereadable else None)
+        assert list(items) == [{"title": "track"}]
+        assert rereads == []
+
+    @pytest.mark.parametrize("size", [1, 3, 1024])
+    @pytest.mark.parametrize("rereadable", [True, False])
+    def test_next_preferred_key(self, size, rereadable):
+        """Test that without "tracks", "songs" beats an earlier "items"."""
+        text = json.dumps(
+            {
+                "items": [{"title": "item"}],
+                "songs": [{"title": "song\\"}, {"title": "second"}],
+                "tracks": None,
+            }
+        )
+        rereads = []
+
+        def reread():
+            rereads.append(True)
+            return _chunked(text, size)
+
+        items = iter_json_items(_chunked(text, size), KEYS, reread if rereadable else None)
+        assert list(items) == [{"title": "song\\"}, {"title": "second"}]
+        assert rereads == ([True] if rereadable else [])
+
+    @pytest.mark.parametrize(
+        "text", ['"just a string"', '{"tracks": [1, 2', '{"tracks": [1 2]}', "[{]"]
+    )
+    def test_invalid_documents(self, text):
+        """Test that malformed or unexpected documents raise ValueError."""
+        with pytest.raises(ValueError):
+            list(iter_json_items(_chunked(text, 3), KEYS))
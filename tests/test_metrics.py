@@ -0,0 +1,106 @@
+"""Tests for the in-process metrics registry."""
+
+import pytest
+
+from yt2spot.matcher.search import search_spotify_tracks
+from yt2spot.metrics import SEARCH_CACHE, MetricsRegistry
+from yt2spot.models import MatchCandidate, SongInput
+from yt2spot.state import StateStore
+
+
+class TestMetricsRegistry:
+    """Tests for counters, gauges and histograms."""
+
+    def test_counter_renders_labelled_samples(self):
+        registry = MetricsRegistry()
+        requests = registry.counter("requests_total", "Requests", ("outcome",))
+        requests.inc(outcome="ok")
+        requests.inc(2, outcome="ok")
+        requests.inc(outcome="error")
+
+        text = registry.render()
+        assert "# TYPE requests_total counter" in text
+        assert 'requests_total{outcome="ok"} 3' in text
+        assert 'requests_total{outcome="error"} 1' in text
+
+    def test_counter_rejects_wrong_labels_and_decrements(self):
+        registry = MetricsRegistry()
+        requests = registry.counter("requests_total", "Requests", ("outcome",))
+        with pytest.raises(ValueError):
+            requests.inc(status="ok")
+        with pytest.raises(ValueError):
+            requests.inc(-1, outcome="ok")
+
+    def test_gauge_set_and_clear(self):
+        registry = MetricsRegistry()
+        sessions = registry.gauge("sessions", "Sessions", ("status",))
+        sessions.set(4, status="processing")
+        sessions.dec(status="processing")
+        assert sessions.value(status="processing") == 3
+
+        sessions.clear()
+        assert "sessions{" not in registry.render()
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry()
+        latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.7, 3.0):
+            latency.observe(value)
+
+        text = registry.render()
+        assert 'latency_seconds_bucket{le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{le="1"} 3' in text
+        assert 'latency_seconds_bucket{le="+Inf"} 4' in text
+        assert "latency_seconds_count 4" in text
+        assert "latency_seconds_sum 4.25" in text
+
+    def test_histogram_times_decorated_functions(self):
+        registry = MetricsRegistry()
+        latency = registry.histogram("stage_seconds", "Stages", ("stage",))
+
+        @latency.time(stage="work")
+        def work():
+            return 42
+
+        assert work() == 42
+        assert work() == 42
+        assert latency.count(stage="work") == 2
+
+    def test_registering_twice_returns_the_same_metric(self):
+        registry = MetricsRegistry()
+        first = registry.counter("requests_total", "Requests")
+        assert registry.counter("requests_total", "Requests") is first
+        with pytest.raises(ValueError):
+            registry.gauge("requests_total", "Requests")
+
+    def test_label_values_are_escaped(self):
+        registry = MetricsRegistry()
+        errors = registry.counter("errors_total", "Errors", ("reason",))
+        errors.inc(reason='say "hi"\n')
+        assert 'errors_total{reason="say \\"hi\\"\\n"} 1' in registry.render()
+
+
+def test_search_counts_cache_hits_and_misses(tmp_path, sample_config):
+    class FakeClient:
+        def search_tracks(self, query, limit=10):
+            return [
+                MatchCandidate(
+                    spotify_id="t1",
+                    title="Imagine",
+                    artist="John Lennon",
+                    all_artists="John Lennon",
+                    album="",
+                    duration_ms=1,
+                    popularity=1,
+                )
+            ]
+
+    song = SongInput(title="Imagine", artist="John Lennon")
+    hits, misses = SEARCH_CACHE.value(result="hit"), SEARCH_CACHE.value(result="miss")
+
+    with StateStore(tmp_path / "state.sqlite3") as store:
+        search_spotify_tracks(song, FakeClient(), sample_config, store)
+        search_spotify_tracks(song, FakeClient(), sample_config, store)
+
+    assert SEARCH_CACHE.value(result="miss") == misses + 1
+    assert SEARCH_CACHE.value(result="hit") == hits + 1
@@ -0,0 +1,260 @@
+"""Tests for running migrations through the backend API."""
+
+import json
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+def _songs(count):
+    """Songs cycling through certain, uncertain and rejected matches."""
+    artists = ("Queen", "John Lennon", "Nobody")
+    return [f"Song{i} - {artists[i % 3]}" for i in range(count)]
+
+
+def _start(client, songs, dry_run=True):
+    response = client.post(
+        "/migrate/start",
+        data={"config": json.dumps({"dry_run": dry_run})},
+        files={"file": ("songs.txt", "\n".join(songs).encode())},
+    )
+    assert response.status_code == 200
+    return response.json()["session_id"]
+
+
+def _wait(client, session_id, *statuses, timeout=10.0):
+    """Poll a session until it reports one of ``statuses``."""
+    deadline = time.monotonic() + timeout
+    while True:
+        status = client.get(f"/migrate/status/{session_id}").json()
+        if status["status"] in statuses:
+            return status
+        assert time.monotonic() < deadline, status
+        time.sleep(0.01)
+
+
+def _results(client, session_id):
+    """Return the titles of a finished session's results and rejected songs."""
+    response = client.get(f"/migrate/results/{session_id}")
+    assert response.status_code == 200
+    body = response.json()
+    return (
+        [entry["song"]["title"] for entry in body["results"]],
+        [entry["song"]["title"] for entry in body["rejected_songs"]],
+    )
+
+
+def _answer(client, session_id, action, limit=100):
+    """Answer every pending decision of a session the same way."""
+    decisions = client.get(f"/migrate/decisions/{session_id}", params={"limit": limit}).json()
+    answers = [{"decision_id": d["decision_id"], "action": action} for d in decisions["decisions"]]
+    response = client.post("/migrate/decisions", json={"session_id": session_id, "decisions": answers})
+    return response.json()["accepted"]
+
+
+@pytest.fixture
+def client(backend):
+    with TestClient(backend.app) as client:
+        yield client
+
+
+class TestDecisions:
+    """Test the queue of decisions a migration asks the user."""
+
+    def test_answer_from_another_process(self, backend, client):
+        """Test that answers posted to another server process are picked up."""
+        session_id = _start(client, _songs(3))
+        _wait(client, session_id, "awaiting_decision")
+
+        # Posted straight to shared state, so the worker is not woken
+        [decision] = backend.shared_state.list_decisions(session_id, 10)
+        backend.shared_state.answer_decisions(
+            session_id, {decision["decision_id"]: {"action": "accept"}}
+        )
+
+        status = _wait(client, session_id, "completed", timeout=2 * backend.DECISION_POLL_MAX)
+        assert status["progress"]["successful"] == 2
+
+    def test_answers_out_of_order(self, client):
+        """Test that decisions can be answered in any order, each exactly once."""
+        session_id = _start(client, _songs(9))
+        status = _wait(client, session_id, "awaiting_decision")
+        assert status["progress"]["pending_decisions"] == 3
+
+        decisions = client.get(f"/migrate/decisions/{session_id}").json()
+        first, second, third = (d["decision_id"] for d in decisions["decisions"])
+        songs = [d["song"]["title"] for d in decisions["decisions"]]
+        assert songs == ["Song1", "Song4", "Song7"]
+
+        # Newest first, then the oldest, then the last one together with a repeat
+        response = client.post(
+            "/migrate/decisions",
+            json={"session_id": session_id, "decisions": [{"decision_id": third, "action": "accept"}]},
+        )
+        assert response.json() == {"accepted": 1, "ignored": 0}
+        response = client.post(
+            "/migrate/decision", json={"session_id": session_id, "decision_id": first, "action": "skip"}
+        )
+        assert response.status_code == 200
+
+        # Answering twice is ignored, not applied twice
+        response = client.post(
+            "/migrate/decisions",
+            json={
+                "session_id": session_id,
+                "decisions": [
+                    {"decision_id": third, "action": "reject"},
+                    {"decision_id": second, "action": "reject"},
+                ],
+            },
+        )
+        assert response.json() == {"accepted": 1, "ignored": 1}
+
+        status = _wait(client, session_id, "completed")
+        assert status["progress"]["successful"] == 4
+        assert status["progress"]["rejected"] == 4
+        assert status["progress"]["skipped"] == 1
+        results, rejected = _results(client, session_id)
+        assert sorted(results) == ["Song0", "Song3", "Song6", "Song7"]
+        assert sorted(rejected) == ["Song2", "Song4", "Song5", "Song8"]
+
+        response = client.post("/migrate/decision", json={"session_id": session_id, "action": "accept"})
+        assert response.status_code == 400
+
+
+class TestControl:
+    """Test pausing, resuming and cancelling migrations."""
+
+    def test_pause_with_pending_decisions_and_resume(self, backend, client, monkeypatch):
+        """Test that a resumed session keeps its decisions and applies each song once."""
+        monkeypatch.setattr(backend.SpotifyClient, "search_delay", 0.005)
+        session_id = _start(client, _songs(60), dry_run=False)
+        _wait(client, session_id, "processing")
+        deadline = time.monotonic() + 10
+        while client.get(f"/migrate/status/{session_id}").json()["progress"]["current"] < 15:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+        assert client.post(f"/migrate/{session_id}/pause").status_code == 200
+        paused = _wait(client, session_id, "paused")
+        assert paused["progress"]["current"] < 60
+        assert client.post(f"/migrate/{session_id}/pause").status_code == 409
+
+        # Queued decisions survive the pause and can be answered meanwhile
+        time.sleep(0.1)
+        assert client.get(f"/migrate/status/{session_id}").json()["progress"] == paused["progress"]
+        pending = client.get(f"/migrate/decisions/{session_id}", params={"limit": 100}).json()
+        assert pending["pending"] == len(pending["decisions"]) > 0
+        assert _answer(client, session_id, "accept") == pending["pending"]
+
+        assert client.post(f"/migrate/{session_id}/resume").status_code == 200
+        assert client.post(f"/migrate/{session_id}/resume").status_code == 409
+        while _wait(client, session_id, "awaiting_decision", "completed")["status"] != "completed":
+            _answer(client, session_id, "accept")
+            time.sleep(0.01)
+
+        status = _wait(client, session_id, "completed")
+        assert status["progress"]["successful"] == 40
+        assert status["progress"]["rejected"] == 20
+        results, rejected = _results(client, session_id)
+        assert len(results) == len(set(results)) == 40
+        assert len(rejected) == len(set(rejected)) == 20
+        liked = backend.SpotifyClient.liked
+        assert len(liked) == len(set(liked)) == 40
+
+    def test_cancel_queued(self, backend, client):
+        """Test that a queued session is cancelled at once, without matching."""
+        backend.job_runner.shutdown(wait=True)
+        session_id = _start(client, _songs(9))
+        assert client.get(f"/migrate/status/{session_id}").json()["status"] == "queued"
+
+        response = client.post(f"/migrate/{session_id}/cancel")
+        assert response.json() == {"message": "Migration cancelled"}
+        status = client.get(f"/migrate/status/{session_id}").json()
+        assert status["status"] == "cancelled"
+        assert status["progress"]["current"] == 0
+        assert _results(client, session_id) == ([], [])
+        assert backend.SpotifyClient.searches == 0
+        assert client.post(f"/migrate/{session_id}/cancel").status_code == 409
+
+    def test_cancel_running(self, backend, client, monkeypatch):
+        """Test that a running session stops early and keeps its results so far."""
+        monkeypatch.setattr(backend.SpotifyClient, "search_delay", 0.005)
+        session_id = _start(client, _songs(60))
+        _wait(client, session_id, "processing")
+        while client.get(f"/migrate/status/{session_id}").json()["progress"]["current"] < 5:
+            time.sleep(0.01)
+
+        response = client.post(f"/migrate/{session_id}/cancel")
+        assert response.json() == {"message": "Migration cancelling"}
+        status = _wait(client, session_id, "cancelled")
+        progress = status["progress"]
+        assert progress["current"] < 60
+        assert progress["pending_decisions"] == 0
+
+        results, rejected = _results(client, session_id)
+        assert len(results) == progress["successful"]
+        assert len(rejected) == progress["rejected"]
+        assert len(results) + len(rejected) < 60
+        pending = client.get(f"/migrate/decisions/{session_id}").json()
+        assert (pending["pending"], pending["decisions"]) == (0, [])
+        assert client.post(f"/migrate/{session_id}/cancel").status_code == 409
+        assert client.post(f"/migrate/{session_id}/resume").status_code == 409
+
+
+class TestResultPages:
+    """Test paging through results, including while a session runs."""
+
+    def _run(self, client, count=40):
+        """Start a session of certain and rejected matches only."""
+        songs = [f"Song{i} - {'Queen' if i % 2 else 'Nobody'}" for i in range(count)]
+        return _start(client, songs)
+
+    def test_cursor_stable_while_results_are_appended(self, backend, client, monkeypatch):
+        """Test that following cursors during a run yields every result once, in order."""
+        monkeypatch.setattr(backend.SpotifyClient, "search_delay", 0.005)
+        session_id = self._run(client)
+
+        titles, cursor, running_pages = [], None, 0
+        deadline = time.monotonic() + 10
+        while True:
+            params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+            body = client.get(f"/migrate/results/{session_id}/page", params=params).json()
+            titles.extend(entry["song"]["title"] for entry in body["items"])
+            if body["next_cursor"] is None:
+                break
+            running_pages += 1
+            cursor = body["next_cursor"]
+            assert time.monotonic() < deadline
+            time.sleep(0.005)
+
+        assert running_pages > 1
+        assert titles == _results(client, session_id)[0]
+        assert titles == [f"Song{i}" for i in range(1, 40, 2)]
+
+    def test_invalid_cursor(self, client):
+        """Test that malformed cursors and cursors off an entry are refused."""
+        session_id = self._run(client, 6)
+        _wait(client, session_id, "completed")
+        page = client.get(f"/migrate/results/{session_id}/page", params={"limit": 1}).json()
+        assert page["next_cursor"] is not None
+
+        url = f"/migrate/results/{session_id}/page"
+        end = str(int(page["next_cursor"]) * 100)
+        for cursor in ("abc", "-1", "1", end):
+            response = client.get(url, params={"cursor": cursor})
+            assert response.status_code == 400, cursor
+            assert response.json()["detail"] == "Invalid cursor"
+        assert client.get(url, params={"kind": "songs"}).status_code == 400
+
+    def test_cursor_of_expired_session(self, backend, client, monkeypatch):
+        """Test that a cursor stops working once its session expired."""
+        session_id = self._run(client, 6)
+        _wait(client, session_id, "completed")
+        url = f"/migrate/results/{session_id}/page"
+        cursor = client.get(url, params={"limit": 1}).json()["next_cursor"]
+
+        monkeypatch.setattr(backend.session_store, "ttl", 0)
+        response = client.get(url, params={"cursor": cursor})
+        assert response.status_code == 404
@@ -0,0 +1,142 @@
+"""Tests for the Spotify OAuth callback."""
+
+import json
+import re
+import urllib.parse
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+PLAYLISTS = 120
+
+
+def _message(response):
+    """The message the callback page posts to the window that opened it."""
+    script = re.search(r"<script>(.*)</script>", response.text).group(1)
+    return json.loads(re.search(r"postMessage\((.*), window\.origin\)", script).group(1))
+
+
+def spotify(request):
+    """Mock Spotify accounts and Web API."""
+    if request.url.path == "/api/token":
+        form = urllib.parse.parse_qs(request.content.decode())
+        if form["code"] == ["bad"]:
+            return httpx.Response(400, json={"error": "invalid_grant", "error_description": "Invalid code"})
+        return httpx.Response(200, json={"access_token": "token"})
+    assert request.headers["Authorization"] == "Bearer token"
+    if request.url.path == "/v1/me":
+        return httpx.Response(200, json={"id": "user", "display_name": "</script>", "images": []})
+    if request.url.path == "/v1/me/playlists":
+        offset = int(request.url.params["offset"])
+        limit = int(request.url.params["limit"])
+        items = [
+            {"id": f"p{i}", "name": f"P{i}", "tracks": {"total": i}, "images": []} if i != 5 else None
+            for i in range(offset, min(offset + limit, PLAYLISTS))
+        ]
+        return httpx.Response(200, json={"items": items, "total": PLAYLISTS})
+    return httpx.Response(404)
+
+
+class MockSpotify:
+    """Transport recording the requests it answers with ``send``."""
+
+    def __init__(self):
+        self.requests = []
+        self.send = spotify
+
+    async def __call__(self, request):
+        self.requests.append(request)
+        return self.send(request)
+
+
+@pytest.fixture
+def spotify_api():
+    return MockSpotify()
+
+
+@pytest.fixture
+def client(backend, spotify_api):
+    with TestClient(backend.app) as client:
+        # The app's pooled client is swapped for one on the mock transport
+        opened = backend.spotify_http
+        backend.spotify_http = httpx.AsyncClient(transport=httpx.MockTransport(spotify_api))
+        client.portal.call(opened.aclose)
+        yield client
+
+
+def _sign_in(client):
+    """Start a login; return the state sent to Spotify."""
+    response = client.get("/api/auth/spotify", follow_redirects=False)
+    assert response.status_code == 307
+    query = urllib.parse.parse_qs(urllib.parse.urlsplit(response.headers["location"]).query)
+    return query["state"][0]
+
+
+def test_callback_loads_user_and_every_playlist(client, spotify_api):
+    """Test a successful login, with every playlist page loaded."""
+    state = _sign_in(client)
+    response = client.get("/api/auth/spotify/callback", params={"code": "good", "state": state})
+
+    message = _message(response)
+    assert message["type"] == "AUTH_SUCCESS"
+    assert message["accessToken"] == "token"
+    assert message["user"] == {"id": "user", "name": "</script>", "imageUrl": None}
+    # Spotify's null entries are dropped
+    assert [p["id"] for p in message["playlists"]] == [f"p{i}" for i in range(PLAYLISTS) if i != 5]
+    assert "</script>" not in response.text.split("<script>", 1)[1].rsplit("</script>", 1)[0]
+
+    offsets = sorted(int(r.url.params["offset"]) for r in spotify_api.requests if r.url.path == "/v1/me/playlists")
+    assert offsets == [0, 50, 100]
+    # The state is used once
+    assert "spotify_oauth_state" not in client.cookies
+    response = client.get("/api/auth/spotify/callback", params={"code": "good", "state": state})
+    assert _message(response)["type"] == "AUTH_ERROR"
+
+
+def test_callback_reports_error(client, spotify_api):
+    """Test that an error from Spotify is passed on without any request."""
+    _sign_in(client)
+    response = client.get("/api/auth/spotify/callback", params={"error": "access_denied"})
+    assert _message(response) == {"type": "AUTH_ERROR", "error": "access_denied"}
+    assert spotify_api.requests == []
+
+
+@pytest.mark.parametrize("signed_in", [True, False])
+def test_callback_rejects_state_mismatch(client, spotify_api, signed_in):
+    """Test that a code is not exchanged unless the state is the one sent."""
+    if signed_in:
+        _sign_in(client)
+    response = client.get("/api/auth/spotify/callback", params={"code": "good", "state": "forged"})
+
+    message = _message(response)
+    assert message["type"] == "AUTH_ERROR"
+    assert "state" in message["error"]
+    assert spotify_api.requests == []
+
+
+def test_callback_reports_failed_token_exchange(client):
+    """Test that Spotify's reason for refusing the code is shown."""
+    state = _sign_in(client)
+    response = client.get("/api/auth/spotify/callback", params={"code": "bad", "state": state})
+    assert _message(response) == {"type": "AUTH_ERROR", "error": "Invalid code"}
+
+
+@pytest.mark.parametrize("failure", ["status", "network"])
+def test_callback_reports_failed_requests(client, spotify_api, failure):
+    """Test that a failing API request ends the login with an error."""
+
+    def failing(request):
+        if request.url.path != "/v1/me/playlists":
+            return spotify(request)
+        if failure == "network":
+            raise httpx.ConnectError("Connection refused", request=request)
+        return httpx.Response(500)
+
+    spotify_api.send = failing
+    state = _sign_in(client)
+    response = client.get("/api/auth/spotify/callback", params={"code": "good", "state": state})
+
+    message = _message(response)
+    assert message["type"] == "AUTH_ERROR"
+    assert message["error"].startswith("Spotify request failed")
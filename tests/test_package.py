@@ -15,3 +15,12 @@ def test_package_import():
 
     assert hasattr(yt2spot, "__version__")
     assert yt2spot.__version__ == "0.1.0"
+
+
+def test_slotted_records():
+    """Test that song and match records carry no per-instance __dict__."""
+    from yt2spot.models import MatchDecision, SongInput
+
+    song = SongInput(title="a", artist="b")
+    assert not hasattr(song, "__dict__")
+    assert not hasattr(MatchDecision(input_song=song), "__dict__")
@@ -0,0 +1,125 @@
+"""Tests for the backend's cache of parsed uploads."""
+
+import os
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from parse_cache import ParseCache
+from uploads import content_hasher
+
+SONGS = b"Bohemian Rhapsody - Queen\nKiller Queen - Queen\nNo Match - Nobody\n"
+
+
+def _token(content: bytes, extension: str = ".txt") -> str:
+    hasher = content_hasher(extension)
+    hasher.update(content)
+    return hasher.hexdigest()
+
+
+def _put(cache, content: bytes, name: str = "songs.txt") -> str:
+    """Cache a parse of ``content`` (its song file just holds the content)."""
+    token = _token(content)
+    partial = cache.partial_path(name)
+    partial.write_bytes(content)
+    assert cache.put(token, partial, name, content.count(b"\n"))
+    return token
+
+
+class TestParseCache:
+    """Test the content-addressed cache."""
+
+    def test_hit_on_identical_bytes(self, tmp_path):
+        """Test that the same bytes find the cached parse."""
+        cache = ParseCache(tmp_path)
+        token = _put(cache, SONGS)
+
+        cached = cache.get(_token(bytes(SONGS)))
+        assert cached is not None
+        assert (cached.filename, cached.songs) == ("songs.txt", 3)
+        assert cache.stats() == {"hits": 1, "misses": 0, "evicted": 0}
+
+        target = tmp_path / "session" / "songs.jsonl"
+        assert cache.link(token, target) == cached
+        assert target.read_bytes() == SONGS
+
+    @pytest.mark.parametrize("position", [0, len(SONGS) // 2, len(SONGS) - 1])
+    def test_miss_after_any_byte_changes(self, tmp_path, position):
+        """Test that changing one byte, or the extension, misses."""
+        cache = ParseCache(tmp_path)
+        _put(cache, SONGS)
+
+        changed = bytearray(SONGS)
+        changed[position] ^= 1
+        assert cache.get(_token(bytes(changed))) is None
+        assert cache.get(_token(SONGS, ".csv")) is None
+        assert cache.link(_token(bytes(changed)), tmp_path / "songs.jsonl") is None
+        assert cache.stats()["misses"] == 3
+
+    def test_rejects_bad_tokens(self, tmp_path):
+        """Test that only digests are looked up, never other paths."""
+        cache = ParseCache(tmp_path)
+        assert cache.get("../../etc/passwd") is None
+        assert cache.get("0" * 63) is None
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """Test that entries past the size bound go, oldest use first."""
+        entry = b"x" * 100
+        cache = ParseCache(tmp_path, max_bytes=250)
+        first = _put(cache, entry + b"1\n", "first.txt")
+        second = _put(cache, entry + b"2\n", "second.txt")
+        now = time.time()
+        os.utime(tmp_path / f"{first}.jsonl", (now - 20, now - 20))
+        os.utime(tmp_path / f"{second}.jsonl", (now - 10, now - 10))
+
+        # Using the first entry makes the second the least recently used
+        assert cache.get(first) is not None
+        third = _put(cache, entry + b"3\n", "third.txt")
+
+        assert cache.get(second) is None
+        assert not (tmp_path / f"{second}.json").exists()
+        assert cache.get(first) is not None
+        assert cache.get(third) is not None
+        assert cache.stats()["evicted"] == 1
+
+    def test_too_large_not_cached(self, tmp_path):
+        """Test that a parse larger than the whole cache is dropped."""
+        cache = ParseCache(tmp_path, max_bytes=10)
+        partial = cache.partial_path("big")
+        partial.write_bytes(SONGS)
+
+        assert not cache.put(_token(SONGS), partial, "big.txt", 3)
+        assert not partial.exists()
+        assert cache.get(_token(SONGS)) is None
+
+
+def test_cached_parse_migrates_like_a_fresh_one(backend):
+    """Test that starting from a file token gives the same results as the file."""
+    with TestClient(backend.app) as client:
+        upload = client.post("/upload", files={"file": ("songs.txt", SONGS)}).json()
+        again = client.post("/upload", files={"file": ("copy.txt", SONGS)}).json()
+        assert upload["file_token"] == again["file_token"] == _token(SONGS)
+
+        fresh = client.post(
+            "/migrate/start", data={"config": '{"dry_run": true}'}, files={"file": ("songs.txt", SONGS)}
+        ).json()
+        cached = client.post(
+            "/migrate/start", json={"file_token": upload["file_token"], "config": {"dry_run": True}}
+        ).json()
+        assert cached["total_songs"] == fresh["total_songs"] == 3
+
+        results = []
+        for session_id in (fresh["session_id"], cached["session_id"]):
+            deadline = time.monotonic() + 10
+            while client.get(f"/migrate/status/{session_id}").json()["status"] != "completed":
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+            response = client.get(f"/migrate/results/{session_id}").json()
+            results.append((response["results"], response["rejected_songs"]))
+
+        assert results[0] == results[1]
+        assert len(results[0][0]) == 2
+
+        # Unknown tokens are refused, so the file has to be sent again
+        response = client.post("/migrate/start", json={"file_token": _token(SONGS + b"\n")})
+        assert response.status_code == 404
@@ -0,0 +1,121 @@
+"""Tests for recovering migrations from a backend worker that died."""
+
+import json
+import os
+import signal
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SONGS = [
+    f"Song{i} - " + ("Queen" if i % 3 == 0 else "John Lennon" if i % 3 == 1 else "Nobody")
+    for i in range(90)
+]
+
+# Runs a backend server process: "start" starts a slow migration and
+# reports once it is well under way, "finish" waits for the given session
+# to complete, accepting every decision it queues
+WORKER = """
+import json
+import sys
+import time
+
+sys.path.insert(0, sys.argv[1])
+import conftest
+from fastapi.testclient import TestClient
+
+conftest.FakeSpotify.search_delay = float(sys.argv[2])
+main = conftest.load_backend()
+
+
+def status(client, session_id):
+    return client.get(f"/migrate/status/{session_id}").json()
+
+
+with TestClient(main.app) as client:
+    if sys.argv[3] == "start":
+        response = client.post(
+            "/migrate/start",
+            data={"config": json.dumps({"dry_run": True})},
+            files={"file": ("songs.txt", sys.stdin.read().encode())},
+        )
+        session_id = response.json()["session_id"]
+        while status(client, session_id)["progress"].get("current", 0) < 40:
+            time.sleep(0.01)
+        print(session_id, flush=True)
+        time.sleep(60)
+    else:
+        session_id = sys.argv[4]
+        deadline = time.monotonic() + 60
+        while status(client, session_id)["status"] != "completed":
+            assert time.monotonic() < deadline, status(client, session_id)
+            pending = client.get(f"/migrate/decisions/{session_id}", params={"limit": 100}).json()
+            if pending["decisions"]:
+                client.post("/migrate/decisions", json={
+                    "session_id": session_id,
+                    "decisions": [
+                        {"decision_id": decision["decision_id"], "action": "accept"}
+                        for decision in pending["decisions"]
+                    ],
+                })
+            time.sleep(0.05)
+        print(json.dumps({
+            "status": status(client, session_id),
+            "results": client.get(f"/migrate/results/{session_id}").json(),
+            "searches": conftest.FakeSpotify.searches,
+        }))
+"""
+
+
+def _worker(tmp_path, *args, **kwargs):
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(ROOT),
+        "YT2SPOT_LOG_DIR": str(tmp_path / "logs"),
+        "YT2SPOT_SPOTIFY_RATE": "1000",
+        "YT2SPOT_SPOTIFY_BURST": "1000",
+        "YT2SPOT_JOB_LEASE_SECONDS": "1",
+        "YT2SPOT_CHECKPOINT_SECONDS": "0.2",
+    }
+    script = tmp_path / "worker.py"
+    script.write_text(WORKER, encoding="utf-8")
+    return subprocess.Popen(
+        [sys.executable, str(script), str(ROOT / "tests"), *args],
+        cwd=tmp_path,
+        env=env,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        text=True,
+        **kwargs,
+    )
+
+
+def test_killed_worker_migration_completes(tmp_path):
+    """Test that a migration whose worker was killed completes in another one."""
+    first = _worker(tmp_path, "0.05", "start")
+    first.stdin.write("\n".join(SONGS))
+    first.stdin.close()
+    session_id = first.stdout.readline().strip()
+    os.kill(first.pid, signal.SIGKILL)
+    first.wait()
+    assert session_id
+
+    second = _worker(tmp_path, "0", "finish", session_id)
+    output, _ = second.communicate(timeout=120)
+    assert second.returncode == 0
+    report = json.loads(output)
+
+    progress = report["status"]["progress"]
+    assert report["status"]["status"] == "completed"
+    assert progress["successful"] == 60
+    assert progress["rejected"] == 30
+    assert progress["pending_decisions"] == 0
+
+    # Each song has exactly one result, and the songs done before the
+    # last checkpoint were not searched again
+    results = report["results"]
+    titles = [entry["song"]["title"] for entry in results["results"] + results["rejected_songs"]]
+    assert sorted(titles) == sorted(song.split(" - ")[0] for song in SONGS)
+    assert report["searches"] < len(SONGS) - 20
@@ -0,0 +1,99 @@
+"""Tests for the backend's Spotify request scheduler."""
+
+import threading
+import time
+
+import pytest
+from scheduler import INTERACTIVE, RequestScheduler
+
+from yt2spot.spotify_client import RequestCancelled
+
+
+def _saturate(scheduler, session_ids, grants):
+    """Keep every session waiting on a call until ``grants`` calls were made."""
+    counts = dict.fromkeys(session_ids, 0)
+    lock = threading.Lock()
+    done = threading.Event()
+
+    def worker(session_id):
+        while not done.is_set():
+            scheduler.call(session_id, lambda: None)
+            with lock:
+                counts[session_id] += 1
+                if sum(counts.values()) >= grants:
+                    done.set()
+
+    threads = [threading.Thread(target=worker, args=(sid,)) for sid in session_ids]
+    for thread in threads:
+        thread.start()
+    assert done.wait(10)
+    scheduler.shutdown()
+    for thread in threads:
+        thread.join(5)
+    return counts
+
+
+class TestRequestScheduler:
+    """Test sharing the request budget between sessions."""
+
+    def test_weighted_fair_share_under_contention(self):
+        """Test that busy sessions get turns in proportion to their weights."""
+        scheduler = RequestScheduler(rate=1000, burst=1)
+        scheduler.register("large", 2)
+        scheduler.register("small-1")
+        scheduler.register("small-2")
+
+        counts = _saturate(scheduler, ["large", "small-1", "small-2"], 400)
+
+        assert counts["large"] / counts["small-1"] == pytest.approx(2, rel=0.2)
+        assert counts["small-1"] / counts["small-2"] == pytest.approx(1, rel=0.2)
+
+    def test_rate_limits_the_shared_budget(self):
+        """Test that calls beyond the burst wait for tokens at the configured rate."""
+        scheduler = RequestScheduler(rate=50, burst=5)
+        start = time.monotonic()
+        try:
+            for _ in range(15):
+                scheduler.call("s", lambda: None)
+        finally:
+            scheduler.shutdown()
+
+        # 5 go at once, the other 10 take 10 / 50 seconds
+        assert time.monotonic() - start >= 0.15
+
+    def test_interactive_calls_go_first(self):
+        """Test that an interactive call is served ahead of bulk calls queued before it."""
+        scheduler = RequestScheduler(rate=20, burst=1)
+        order = []
+        lock = threading.Lock()
+
+        def call(session_id, priority):
+            scheduler.call(session_id, lambda: None, priority=priority)
+            with lock:
+                order.append(priority)
+
+        scheduler.call("bulk", lambda: None)  # Spends the burst
+        bulk = [threading.Thread(target=call, args=(f"bulk-{i}", "bulk")) for i in range(3)]
+        for thread in bulk:
+            thread.start()
+        time.sleep(0.01)
+        interactive = threading.Thread(target=call, args=("user", INTERACTIVE))
+        interactive.start()
+        for thread in (*bulk, interactive):
+            thread.join(5)
+        scheduler.shutdown()
+
+        assert order[0] == INTERACTIVE
+
+    def test_released_session_calls_are_cancelled(self):
+        """Test that releasing a session cancels its calls until it registers again."""
+        scheduler = RequestScheduler(rate=100, burst=1)
+        try:
+            scheduler.release("s")
+            with pytest.raises(RequestCancelled):
+                scheduler.call("s", lambda: None)
+
+            scheduler.register("s")
+            assert scheduler.call("s", lambda: "ok") == "ok"
+        finally:
+            scheduler.shutdown()
@@ -0,0 +1,93 @@
+"""Tests for the backend's JSON encoding."""
+
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+import serialization
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from serialization import JSONBytesResponse, dumps, encode_array, encode_entry, loads
+
+from yt2spot.models import MatchCandidate, SongInput
+
+
+@pytest.fixture(params=["orjson", "json"])
+def encoder(request, monkeypatch):
+    """Run a test with orjson and again with the standard library fallback."""
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(serialization, "orjson", None)
+    return request.param
+
+
+class TestDumps:
+    """Test encoding values as compact JSON bytes."""
+
+    def test_dataclasses(self, encoder):
+        """Test that dataclasses, nested too, are encoded as objects."""
+        song = SongInput(title="Jöga", artist="Björk", source_line=3)
+        candidate = MatchCandidate("id", "Jöga", "Björk", "Björk", "Homogenic", 305000, 60)
+
+        encoded = dumps({"song": song, "candidates": [candidate]})
+
+        assert loads(encoded) == {
+            "song": {
+                "title": "Jöga",
+                "artist": "Björk",
+                "album": "",
+                "duration": "",
+                "source_line": 3,
+                "normalized_key": "jöga|björk",
+            },
+            "candidates": [asdict(candidate)],
+        }
+        # Compact and UTF-8, not escaped
+        assert b": " not in encoded and b", " not in encoded
+        assert "Jöga".encode() in encoded
+
+    def test_datetimes(self, encoder):
+        """Test that datetimes are encoded in ISO 8601."""
+        created = datetime(2024, 5, 17, 12, 30, 5, 250000)
+        assert loads(dumps({"created_at": created})) == {"created_at": "2024-05-17T12:30:05.250000"}
+
+    def test_unknown_types_as_str(self, encoder):
+        """Test that other values fall back to str()."""
+        assert loads(dumps([Path("logs/a.jsonl")])) == ["logs/a.jsonl"]
+
+
+class TestSplicing:
+    """Test splicing already encoded JSON into responses."""
+
+    def test_encode_entry(self):
+        """Test that raw fields are inserted as they are, first."""
+        assert encode_entry({"a": 1}, {"song": b'{"title":"x"}'}) == b'{"song":{"title":"x"},"a":1}'
+        assert encode_entry({}, {"song": b"{}"}) == b'{"song":{}}'
+        assert encode_entry({"a": 1}) == b'{"a":1}'
+
+    def test_encode_array(self):
+        """Test joining encoded lines into an array."""
+        assert encode_array([b'{"a":1}\n', b"2\n"]) == b'[{"a":1},2]'
+        assert encode_array([]) == b"[]"
+
+
+def test_json_bytes_response():
+    """Test that endpoints can return values or ready-made JSON bytes."""
+    app = FastAPI()
+
+    @app.get("/value")
+    def value():
+        return JSONBytesResponse({"created_at": datetime(2024, 1, 2), "song": SongInput("a", "b")})
+
+    @app.get("/bytes")
+    def raw():
+        return JSONBytesResponse(b'{"already":"encoded"}')
+
+    with TestClient(app) as client:
+        response = client.get("/value")
+        assert response.headers["content-type"] == "application/json"
+        assert response.json()["created_at"] == "2024-01-02T00:00:00"
+        assert response.json()["song"]["normalized_key"] == "a|b"
+        assert client.get("/bytes").json() == {"already": "encoded"}
@@ -0,0 +1,124 @@
+"""Tests for the backend's bounded session store."""
+
+import time
+
+import pytest
+from session_store import SessionStore
+
+
+def _store(tmp_path, **kwargs):
+    return SessionStore(tmp_path / "sessions", **kwargs)
+
+
+class TestEviction:
+    """Test TTL and LRU eviction of finished sessions."""
+
+    def test_finished_sessions_expire_after_ttl(self, tmp_path):
+        """Test that finished sessions are evicted with their files, running ones kept."""
+        evicted = []
+        store = _store(tmp_path, ttl=0.05, spill_after=1, on_evict=evicted.append)
+        store.create("done", {"status": "completed"})
+        store.create("running", {"status": "processing"})
+        store.append_result("done", "results", {"n": 1})
+        store.finish("done")
+        assert (tmp_path / "sessions" / "done").exists()
+
+        time.sleep(0.1)
+
+        assert store.get("done") is None
+        assert store.get("running") is not None
+        assert evicted == ["done"]
+        assert not (tmp_path / "sessions" / "done").exists()
+        assert store.metrics()["evicted_sessions"] == 1
+
+    def test_least_recently_used_finished_session_goes_first(self, tmp_path):
+        """Test that the store evicts the finished session used longest ago when full."""
+        evicted = []
+        store = _store(tmp_path, max_sessions=3, on_evict=evicted.append)
+        for session_id in ("a", "b"):
+            store.create(session_id, {})
+            store.finish(session_id)
+        assert store.get("a") is not None
+        store.create("c", {})
+
+        store.create("d", {})
+
+        assert evicted == ["b"]
+        assert store.metrics()["resident_sessions"] == 3
+
+    def test_running_sessions_are_never_evicted(self, tmp_path):
+        """Test that the limit is exceeded rather than a running session dropped."""
+        store = _store(tmp_path, max_sessions=1, ttl=0)
+        store.create("a", {})
+        store.create("b", {})
+
+        assert "a" in store and "b" in store
+        assert store.metrics()["evicted_sessions"] == 0
+
+
+class TestPages:
+    """Test cursor pagination over spilled and buffered results."""
+
+    def _session(self, store, count):
+        store.create("s", {})
+        for n in range(count):
+            store.append_result("s", "results", {"n": n})
+
+    def _read_all(self, store, limit):
+        entries, cursors, cursor = [], [], 0
+        while cursor is not None:
+            cursors.append(cursor)
+            page, cursor = store.read_page("s", "results", cursor, limit)
+            entries.extend(page)
+        return entries, cursors
+
+    def test_pages_cover_spilled_and_buffered_entries(self, tmp_path):
+        """Test that paging walks the spill file, then the buffer, once each."""
+        store = _store(tmp_path, spill_after=4)
+        self._session(store, 10)
+        assert store.metrics()["spilled_result_bytes"] > 0
+
+        entries, _ = self._read_all(store, limit=3)
+
+        assert [entry["n"] for entry in entries] == list(range(10))
+
+    def test_cursor_survives_a_spill(self, tmp_path):
+        """Test that a cursor into the buffer still points at the same entry after it spills."""
+        store = _store(tmp_path, spill_after=4)
+        self._session(store, 6)
+        _, cursors = self._read_all(store, limit=5)
+        buffered_cursor = cursors[1]
+        before, _ = store.read_page("s", "results", buffered_cursor, 5)
+
+        store.finish("s")
+        after, next_cursor = store.read_page("s", "results", buffered_cursor, 5)
+
+        assert after == before == [{"n": 5}]
+        assert next_cursor is None
+
+    def test_filtered_page_and_invalid_cursor(self, tmp_path):
+        """Test filtering a page and rejecting a cursor inside an entry."""
+        store = _store(tmp_path, spill_after=2)
+        self._session(store, 6)
+
+        page, _ = store.read_page("s", "results", 0, 10, match=lambda e: e["n"] % 2 == 0)
+
+        assert page == [{"n": 0}, {"n": 2}, {"n": 4}]
+        with pytest.raises(ValueError):
+            store.read_page("s", "results", 1, 10)
+
+    def test_following_a_growing_session(self, tmp_path):
+        """Test that a followed cursor picks up entries appended after the last page."""
+        store = _store(tmp_path, spill_after=3)
+        self._session(store, 4)
+
+        page, cursor = store.read_page("s", "results", 0, 10, follow=True)
+        assert [entry["n"] for entry in page] == [0, 1, 2, 3]
+        for n in range(4, 8):
+            store.append_result("s", "results", {"n": n})
+        page, cursor = store.read_page("s", "results", cursor, 10, follow=True)
+
+        assert [entry["n"] for entry in page] == [4, 5, 6, 7]
+        assert store.read_page("s", "results", cursor, 10, follow=True) == ([], cursor)
+        with pytest.raises(ValueError):
+            store.read_page("s", "results", cursor + 1, 10)
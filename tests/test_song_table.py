@@ -0,0 +1,68 @@
+"""Tests for columnar song storage."""
+
+import pickle
+
+import pytest
+
+from yt2spot.models import SongInput
+from yt2spot.song_table import SongTable
+
+
+class TestSongTable:
+    """Test the columnar table and the songs it hands out."""
+
+    def test_rows_round_trip(self):
+        """Test that rows come back as the songs that were added."""
+        songs = [
+            SongInput(
+                title="Imagine",
+                artist="John Lennon",
+                album="Imagine",
+                duration="3:03",
+                source_line=7,
+            ),
+            SongInput(title="Jöga", artist="Björk", duration="305000", source_line=9),
+            SongInput(title="Yesterday", artist="The Beatles", normalized_key="yesterday|beatles"),
+        ]
+        table = SongTable.from_songs(songs)
+
+        assert len(table) == 3
+        assert list(table) == songs
+        assert table[-1] == songs[-1]
+        with pytest.raises(IndexError):
+            table[3]
+
+    def test_strings_are_shared(self):
+        """Test that repeated field values are stored once."""
+        table = SongTable.from_songs(
+            SongInput(title=f"Song {i}", artist="Queen", album="Greatest Hits", duration="3:00")
+            for i in range(100)
+        )
+
+        # "", Queen, Greatest Hits and 3:00
+        assert table.distinct_strings == 4
+        assert table[99].title == "Song 99"
+
+    def test_extend_table(self):
+        """Test merging tables with their own string pools, as from parser workers."""
+        first = SongTable.from_songs([SongInput("a", "Queen", source_line=1)])
+        second = SongTable.from_songs(
+            [
+                SongInput("b", "Abba", source_line=1),
+                SongInput("c", "Queen", source_line=2, normalized_key="c|q"),
+            ]
+        )
+        first.extend_table(second, line_offset=10)
+
+        assert [(song.title, song.artist, song.source_line) for song in first] == [
+            ("a", "Queen", 1),
+            ("b", "Abba", 11),
+            ("c", "Queen", 12),
+        ]
+        assert first[2].normalized_key == "c|q"
+        assert first.distinct_strings == 3
+
+    def test_pickles(self):
+        """Test that a table survives the trip back from a worker process."""
+        table = SongTable.from_songs([SongInput("a", "b", source_line=3)])
+        assert list(pickle.loads(pickle.dumps(table))) == list(table)
@@ -0,0 +1,151 @@
+"""Tests for the SQLite state store."""
+
+import sqlite3
+import time
+
+from yt2spot.matcher.search import search_cache_key, search_spotify_tracks
+from yt2spot.models import MatchCandidate, MatchDecision, SongInput
+from yt2spot.state import StateStore
+
+
+def _candidate(spotify_id="t1"):
+    return MatchCandidate(
+        spotify_id=spotify_id,
+        title="Imagine",
+        artist="John Lennon",
+        all_artists="John Lennon",
+        album="Imagine",
+        duration_ms=183000,
+        popularity=80,
+    )
+
+
+class FakeClient:
+    """Spotify client stand-in that counts searches."""
+
+    def __init__(self):
+        self.queries = []
+
+    def search_tracks(self, query, limit=10):
+        self.queries.append(query)
+        return [_candidate()]
+
+
+class FailingClient(FakeClient):
+    """Spotify client stand-in whose searches fail, as on a 429."""
+
+    def search_tracks(self, query, limit=10):
+        self.queries.append(query)
+        raise RuntimeError("rate limited")
+
+
+class TestStateStore:
+    """Test the state store tables."""
+
+    def test_uses_wal_and_batches_writes(self, tmp_path):
+        """Test that writes are queued until the batch fills or a read."""
+        store = StateStore(tmp_path / "state.db", batch_size=3)
+        assert store._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+        store.log_event("s1", "started")
+        store.log_event("s1", "progress", {"current": 1})
+
+        other = sqlite3.connect(tmp_path / "state.db")
+        assert other.execute("SELECT COUNT(*) FROM journal").fetchone()[0] == 0
+
+        store.log_event("s1", "completed")
+        assert other.execute("SELECT COUNT(*) FROM journal").fetchone()[0] == 3
+        other.close()
+
+        assert [event for event, _ in store.iter_events("s1")] == [
+            "started",
+            "progress",
+            "completed",
+        ]
+        store.close()
+
+    def test_queued_writes_leave_the_database_unlocked(self, tmp_path):
+        """Test that other processes can write while writes are queued."""
+        store = StateStore(tmp_path / "state.db", flush_interval=0.05)
+        assert store._conn.execute("PRAGMA busy_timeout").fetchone()[0] > 0
+        store.log_event("s1", "started")
+
+        other = sqlite3.connect(tmp_path / "state.db", timeout=0)
+        other.execute(
+            "INSERT INTO journal (session_id, event, created_at) VALUES ('s2', 'started', 0)"
+        )
+        other.commit()
+
+        # Committed after flush_interval without another write or read
+        deadline = time.monotonic() + 5
+        while other.execute("SELECT COUNT(*) FROM journal").fetchone()[0] < 2:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        other.close()
+        store.close()
+
+    def test_session_round_trip(self, tmp_path):
+        """Test that updates keep fields they don't mention."""
+        with StateStore(tmp_path / "state.db") as store:
+            store.save_session("s1", "processing", config={"dry_run": True})
+            store.save_session("s1", "completed", progress={"current": 2})
+
+        with StateStore(tmp_path / "state.db") as store:
+            session = store.get_session("s1")
+            assert session["status"] == "completed"
+            assert session["config"] == {"dry_run": True}
+            assert session["progress"] == {"current": 2}
+
+            store.delete_session("s1")
+            assert store.get_session("s1") is None
+
+    def test_decisions(self, tmp_path):
+        """Test decisions by session and by song key."""
+        song = SongInput(title="Imagine", artist="John Lennon", source_line=4)
+        decision = MatchDecision(
+            input_song=song,
+            chosen_candidate=_candidate(),
+            decision="auto_accept",
+            confidence=0.95,
+        )
+
+        with StateStore(tmp_path / "state.db") as store:
+            store.record_decision("s1", decision)
+            store.record_decision("s2", decision)
+
+            rows = list(store.iter_decisions("s1"))
+            assert [(row["source_line"], row["track_id"]) for row in rows] == [
+                (4, "t1")
+            ]
+            assert store.last_decision(song.normalized_key)["session_id"] == "s2"
+            assert store.last_decision("unknown") is None
+
+    def test_search_cache(self, tmp_path, sample_config):
+        """Test that repeat searches are answered from the cache."""
+        song = SongInput(title="Imagine", artist="John Lennon")
+        client = FakeClient()
+
+        with StateStore(tmp_path / "state.db") as store:
+            first = search_spotify_tracks(song, client, sample_config, store)
+            searches = len(client.queries)
+            again = search_spotify_tracks(
+                SongInput(title="imagine (Official Video)", artist="john lennon"),
+                client,
+                sample_config,
+                store,
+            )
+
+            assert again == first
+            assert len(client.queries) == searches
+            key = search_cache_key(song, sample_config)
+            assert store.get_candidates(key, max_age=-1) is None
+
+    def test_failed_search_not_cached(self, tmp_path, sample_config):
+        """Test that a search whose queries failed is not cached as empty."""
+        song = SongInput(title="Imagine", artist="John Lennon")
+        client = FailingClient()
+
+        with StateStore(tmp_path / "state.db") as store:
+            assert search_spotify_tracks(song, client, sample_config, store) == []
+            assert client.queries
+            assert store.get_candidates(search_cache_key(song, sample_config)) is None
@@ -0,0 +1,137 @@
+"""Tests for the backend's streaming multipart upload parser."""
+
+import asyncio
+import hashlib
+
+import pytest
+from uploads import UploadError, content_hasher, parse_upload
+
+BOUNDARY = "yt2spot-boundary"
+
+
+class FakeRequest:
+    """Request stand-in whose body arrives in chunks of ``chunk_size`` bytes."""
+
+    def __init__(self, body: bytes, chunk_size: int = 64 * 1024, content_length: bool = True):
+        self.body = body
+        self.chunk_size = chunk_size
+        self.headers = {"content-type": f"multipart/form-data; boundary={BOUNDARY}"}
+        if content_length:
+            self.headers["content-length"] = str(len(body))
+
+    async def stream(self):
+        for start in range(0, len(self.body), self.chunk_size):
+            yield self.body[start : start + self.chunk_size]
+
+
+def _multipart(*parts, close=True):
+    """Encode (name, filename or None, content) parts as a multipart body."""
+    body = b""
+    for name, filename, content in parts:
+        disposition = f'form-data; name="{name}"'
+        if filename is not None:
+            disposition += f'; filename="{filename}"'
+        body += f"--{BOUNDARY}\r\nContent-Disposition: {disposition}\r\n\r\n".encode()
+        body += content + b"\r\n"
+    if close:
+        body += f"--{BOUNDARY}--\r\n".encode()
+    return body
+
+
+def _parse(request, max_bytes=1024 * 1024, max_files=1):
+    """Run parse_upload and return its result with the songs of each file."""
+    songs = []
+    result = asyncio.run(
+        parse_upload(request, lambda song, index: songs.append((index, song)), max_bytes, max_files=max_files)
+    )
+    return result, songs
+
+
+class TestParseUpload:
+    """Test parsing files out of a streamed multipart body."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, len(BOUNDARY) + 3, 4096])
+    def test_boundary_split_across_chunks(self, chunk_size):
+        """Test that the result doesn't depend on where the chunks are cut."""
+        content = b"".join(f"Song {i} - Artist {i}\n".encode() for i in range(50))
+        body = _multipart(("file", "songs.txt", content))
+
+        result, songs = _parse(FakeRequest(body, chunk_size))
+
+        assert result.filename == "songs.txt"
+        assert result.songs == 50
+        assert [song.title for _, song in songs] == [f"Song {i}" for i in range(50)]
+        assert result.size == len(body)
+
+    def test_crlf_inside_file_content(self):
+        """Test that CRLF line ends in a file are content, not part ends."""
+        content = b"Imagine - John Lennon\r\nHey Jude - The Beatles\r\n\r\n--not-the-boundary\r\n"
+        body = _multipart(("file", "songs.txt", content))
+
+        result, songs = _parse(FakeRequest(body, chunk_size=5))
+
+        assert [(song.title, song.artist) for _, song in songs[:2]] == [
+            ("Imagine", "John Lennon"),
+            ("Hey Jude", "The Beatles"),
+        ]
+        # The digest covers the file's exact bytes
+        hasher = content_hasher(".txt")
+        hasher.update(content)
+        assert result.files[0].digest == hasher.hexdigest()
+        assert result.files[0].digest != hashlib.sha256(content).hexdigest()
+
+    def test_missing_closing_boundary(self):
+        """Test that a body cut short is rejected rather than half parsed."""
+        body = _multipart(("file", "songs.txt", b"Imagine - John Lennon\n"), close=False)
+
+        with pytest.raises(UploadError) as error:
+            _parse(FakeRequest(body))
+        assert error.value.status_code == 400
+
+    def test_oversized_upload(self):
+        """Test that uploads over the limit are refused, with or without a length."""
+        body = _multipart(("file", "songs.txt", b"Imagine - John Lennon\n" * 100))
+
+        for request in (FakeRequest(body), FakeRequest(body, chunk_size=256, content_length=False)):
+            with pytest.raises(UploadError) as error:
+                _parse(request, max_bytes=1024)
+            assert error.value.status_code == 413
+
+    def test_extra_form_fields(self):
+        """Test that other fields are returned next to the file."""
+        body = _multipart(
+            ("config", None, b'{"dry_run": true}'),
+            ("file", "songs.txt", b"Imagine - John Lennon\n"),
+            ("note", None, b"line one\r\nline two"),
+        )
+
+        result, songs = _parse(FakeRequest(body, chunk_size=3))
+
+        assert result.fields == {"config": '{"dry_run": true}', "note": "line one\r\nline two"}
+        assert len(songs) == 1
+
+    def test_oversized_form_field(self):
+        """Test that a settings field can't be used to buffer a large body."""
+        body = _multipart(("config", None, b"x" * (65 * 1024)), ("file", "songs.txt", b"A - B\n"))
+
+        with pytest.raises(UploadError) as error:
+            _parse(FakeRequest(body))
+        assert error.value.status_code == 413
+
+    def test_too_many_files(self):
+        """Test that files past max_files are refused."""
+        body = _multipart(("file", "a.txt", b"A - B\n"), ("file", "b.txt", b"C - D\n"))
+
+        result, songs = _parse(FakeRequest(body), max_files=2)
+        assert [file.filename for file in result.files] == ["a.txt", "b.txt"]
+        assert sorted(index for index, _ in songs) == [0, 1]
+
+        with pytest.raises(UploadError, match="Too many files"):
+            _parse(FakeRequest(body), max_files=1)
+
+    def test_unsupported_file_type(self):
+        """Test that only the supported extensions are parsed."""
+        body = _multipart(("file", "songs.xml", b"<songs/>"))
+
+        with pytest.raises(UploadError, match="Unsupported file type"):
+            _parse(FakeRequest(body))
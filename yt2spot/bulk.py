@@ -0,0 +1,293 @@
+"""
+Bulk migration of many input files, each into its own playlist.
+
+All files of a run share one authenticated Spotify client, one search
+cache and one deduplication index. Files are processed concurrently; a
+song that appears in several files is searched and scored once, and the
+other files wait for (or reuse) that result instead of searching again.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from uuid import uuid4
+
+from yt2spot.incremental import song_key
+from yt2spot.input_parser import iter_input_file
+from yt2spot.matcher.decision import make_decision
+from yt2spot.matcher.scoring import score_candidates
+from yt2spot.matcher.search import search_spotify_tracks
+from yt2spot.models import MatchCandidate, SessionConfig, SongInput
+
+# Suffixes picked up when a directory is given as input
+INPUT_SUFFIXES = (".txt", ".csv", ".json")
+
+# Files processed at the same time by default
+DEFAULT_CONCURRENCY = 4
+
+
+def discover_inputs(paths: Iterable[str | Path]) -> list[Path]:
+    """
+    Expand files and directories into the input files to migrate.
+
+    Directories contribute their files with a supported suffix (not
+    recursively), in name order. Files given explicitly are kept whatever
+    their suffix, so ``--input-format`` can apply to them.
+
+    Raises:
+        ValueError: If a path does not exist or two inputs are the same file
+    """
+    found: list[Path] = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            found.extend(
+                sorted(
+                    child
+                    for child in path.iterdir()
+                    if child.is_file() and child.suffix.lower() in INPUT_SUFFIXES
+                )
+            )
+        elif path.is_file():
+            found.append(path)
+        else:
+            raise ValueError(f"Input not found: {path}")
+
+    resolved = [path.resolve() for path in found]
+    if len(set(resolved)) != len(resolved):
+        raise ValueError("The same input file was given more than once")
+    return found
+
+
+def playlist_name_for(path: Path, prefix: str = "") -> str:
+    """Name the playlist of an input file after the file, e.g. "road trip" for road_trip.csv."""
+    return f"{prefix}{path.stem.replace('_', ' ').strip()}"
+
+
+class SharedMatchIndex:
+    """
+    Scored candidates shared by every file of a bulk run.
+
+    Songs are keyed like :class:`~yt2spot.incremental.SongDeduplicator`
+    keys them. The first file to reach a key searches; files reaching it
+    meanwhile wait for that search instead of starting their own. Indexes
+    are thread-safe.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._results: dict[str, Future] = {}
+        self.searches = 0
+        self.reused = 0
+
+    def candidates(
+        self, song: SongInput, search: Callable[[], list[MatchCandidate]]
+    ) -> list[MatchCandidate]:
+        """
+        Return the candidates for ``song``, calling ``search`` once per key.
+
+        A failed search is not kept: the caller gets its error, and songs
+        that were waiting on it run their own ``search`` instead.
+        """
+        key = song_key(song)
+        while True:
+            with self._lock:
+                result = self._results.get(key)
+                if result is None:
+                    result = self._results[key] = Future()
+                    self.searches += 1
+                    break
+            try:
+                candidates = result.result()
+            except Exception:
+                continue
+            with self._lock:
+                self.reused += 1
+            return candidates
+
+        try:
+            candidates = search()
+        except Exception as e:
+            with self._lock:
+                del self._results[key]
+            result.set_exception(e)
+            raise
+        result.set_result(candidates)
+        return candidates
+
+
+@dataclass
+class FileResult:
+    """Outcome of migrating one input file."""
+
+    input_path: Path
+    playlist_name: str
+    session_id: str = ""
+    playlist_id: str | None = None
+    total: int = 0
+    matched: int = 0
+    rejected: int = 0
+    skipped: int = 0
+    errors: int = 0
+    added: int = 0
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Check if the file was migrated without a fatal error."""
+        return self.error is None
+
+
+class BulkMigration:
+    """
+    Migrate many input files concurrently into one playlist each.
+
+    Uncertain matches are not prompted for; they count as skipped. Matched
+    tracks are added to the file's playlist (created if no playlist of
+    that name exists) once the whole file has been matched; tracks the
+    playlist already has are not added again.
+
+    Args:
+        spotify_client: Authenticated client shared by all files
+        config: Session configuration (thresholds, dry run, visibility)
+        store: Optional StateStore for the search cache and decisions
+        concurrency: Files processed at the same time
+        input_format: Parse every file as this format instead of by suffix
+        on_song: Called with (input path, decision) after each song, from
+            the file's worker thread
+    """
+
+    def __init__(
+        self,
+        spotify_client,
+        config: SessionConfig,
+        store=None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        input_format: str | None = None,
+        on_song: Callable[[Path, object], None] | None = None,
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.spotify_client = spotify_client
+        self.config = config
+        self.store = store
+        self.concurrency = concurrency
+        self.input_format = input_format
+        self.on_song = on_song
+        self.index = SharedMatchIndex()
+        # Filling playlists one at a time keeps two files with the same
+        # name from both creating one or adding the same tracks
+        self._playlist_lock = threading.Lock()
+
+    def run(self, inputs: Iterable[tuple[Path, str]]) -> list[FileResult]:
+        """
+        Migrate ``(input path, playlist name)`` pairs; results come back in input order.
+
+        A file that fails (e.g. can't be parsed) reports its error in its
+        result and does not stop the others.
+        """
+        with ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="yt2spot-bulk"
+        ) as pool:
+            futures = [
+                pool.submit(self.migrate_file, path, name) for path, name in inputs
+            ]
+        return [future.result() for future in futures]
+
+    def migrate_file(self, input_path: Path, playlist_name: str) -> FileResult:
+        """Match every song of one file and fill its playlist."""
+        result = FileResult(input_path, playlist_name, session_id=uuid4().hex)
+        self._save_session(result, "processing")
+
+        track_ids: list[str] = []
+        seen_ids: set[str] = set()
+        try:
+            for song in iter_input_file(input_path, self.input_format):
+                result.total += 1
+                try:
+                    candidates = self.index.candidates(song, partial(self._search, song))
+                    decision = make_decision(song, candidates, self.config, interactive=False)
+                except Exception:
+                    result.errors += 1
+                    continue
+
+                if self.store is not None:
+                    self.store.record_decision(result.session_id, decision)
+                if decision.is_matched:
+                    result.matched += 1
+                    track_id = decision.chosen_candidate.spotify_id
+                    # A playlist lists each track once
+                    if track_id not in seen_ids:
+                        seen_ids.add(track_id)
+                        track_ids.append(track_id)
+                elif decision.decision == "skipped":
+                    result.skipped += 1
+                else:
+                    result.rejected += 1
+                if self.on_song is not None:
+                    self.on_song(input_path, decision)
+
+            if track_ids and not self.config.dry_run:
+                self._fill_playlist(result, track_ids)
+        except Exception as e:
+            result.error = str(e)
+
+        self._save_session(result, "completed" if result.ok else "error")
+        return result
+
+    def _search(self, song: SongInput) -> list[MatchCandidate]:
+        candidates = search_spotify_tracks(song, self.spotify_client, self.config, self.store)
+        if candidates:
+            candidates = score_candidates(song, candidates, self.config)
+        return candidates
+
+    def _fill_playlist(self, result: FileResult, track_ids: list[str]) -> None:
+        with self._playlist_lock:
+            existing = self.spotify_client.get_playlist_by_name(result.playlist_name)
+            if existing is not None:
+                result.playlist_id = existing["id"]
+                # A re-run adds only what the playlist doesn't have yet
+                present = self.spotify_client.get_playlist_track_ids(result.playlist_id)
+                if present is None:
+                    raise RuntimeError(f"Could not read playlist '{result.playlist_name}'")
+                track_ids = [track_id for track_id in track_ids if track_id not in present]
+            else:
+                result.playlist_id = self.spotify_client.create_playlist(
+                    result.playlist_name,
+                    description=f"Migrated from {result.input_path.name} by YT2Spot",
+                    public=self.config.public_playlist,
+                )
+            if result.playlist_id is None:
+                raise RuntimeError(f"Could not create playlist '{result.playlist_name}'")
+            if track_ids and not self.spotify_client.add_tracks_to_playlist(
+                result.playlist_id, track_ids
+            ):
+                raise RuntimeError(f"Could not add tracks to playlist '{result.playlist_name}'")
+        result.added = len(track_ids)
+
+    def _save_session(self, result: FileResult, status: str) -> None:
+        if self.store is None:
+            return
+        progress = {
+            "total": result.total,
+            "successful": result.matched,
+            "rejected": result.rejected,
+            "skipped": result.skipped,
+            "errors": result.errors,
+        }
+        self.store.save_session(
+            result.session_id,
+            status,
+            config={
+                "source": "cli-bulk",
+                "input_path": str(result.input_path),
+                "playlist": result.playlist_name,
+                "dry_run": self.config.dry_run,
+            },
+            progress=progress,
+        )
+        self.store.log_event(result.session_id, status, {"error": result.error} if result.error else None)
@@ -4,8 +4,12 @@ from __future__ import annotations
 
 import sys
 import time
+from collections import deque
+from collections.abc import Callable, Container, Iterable, Iterator, Sized
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import chain, islice
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 import click
 from rich.console import Console
@@ -23,6 +27,9 @@ from yt2spot.version import __version__
 
 console = Console()
 
+# Number of songs searched and scored ahead of the one currently being decided
+DEFAULT_PREFETCH = 4
+
 
 @click.group()
 @click.version_option(__version__, prog_name="yt2spot")
@@ -116,6 +123,11 @@ def build_cli_overrides(
     type=click.Path(exists=True, path_type=Path),
     help="Path to the YouTube Music export text file",
 )
+@click.option(
+    "--input-format",
+    type=click.Choice(["csv", "json", "txt", "ytmusic-text"]),
+    help="Parse the input as this format instead of guessing from its extension",
+)
 @click.option(
     "--playlist",
     "-p",
@@ -132,6 +144,16 @@ def build_cli_overrides(
 @click.option(
     "--interactive", is_flag=True, help="Prompt for user input on ambiguous matches"
 )
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="Skip songs completed by an earlier, interrupted run on the same file",
+)
+@click.option(
+    "--since-last-run",
+    is_flag=True,
+    help="Only process songs that no earlier run has handled",
+)
 @click.option(
     "--force-recreate",
     is_flag=True,
@@ -156,6 +178,13 @@ def build_cli_overrides(
     help="Minimum threshold for fuzzy matching (0.0-1.0)",
 )
 @click.option("--limit", type=int, help="Limit the number of songs to process")
+@click.option(
+    "--prefetch",
+    type=click.IntRange(min=0),
+    default=DEFAULT_PREFETCH,
+    show_default=True,
+    help="Number of upcoming songs to search in the background (0 disables)",
+)
 @click.option(
     "--log-dir", type=click.Path(path_type=Path), help="Directory to store log files"
 )
@@ -177,16 +206,20 @@ def build_cli_overrides(
 )
 def migrate(
     input_path: Path,
+    input_format: str | None,
     playlist: str,
     public: bool,
     dry_run: bool,
     fuzzy: bool,
     interactive: bool,
+    resume: bool,
+    since_last_run: bool,
     force_recreate: bool,
     hard_threshold: float,
     reject_threshold: float,
     fuzzy_threshold: float,
     limit: int | None,
+    prefetch: int,
     log_dir: Path | None,
     cache_file: Path | None,
     json_logs: bool,
@@ -236,33 +269,63 @@ def migrate(
             show_banner(session_config)
 
         # Import dependencies - moved here to avoid unnecessary imports on error
-        from yt2spot.input_parser import parse_input_file
-        from yt2spot.matcher.decision import get_decision_summary, make_decision
-        from yt2spot.matcher.scoring import score_candidates
-        from yt2spot.matcher.search import search_spotify_tracks
         from yt2spot.spotify_client import SpotifyClient
 
         # Load environment variables - optimized import
         _load_env_variables()
 
-        # Parse and validate input
-        songs = _parse_and_validate_input(input_path, limit, quiet)
-        if not songs:
-            return
-
-        # Initialize Spotify client
-        if not quiet:
-            console.print("[cyan]🔐 Authenticating with Spotify...[/cyan]")
-        spotify_client = SpotifyClient(session_config)
-
-        if not spotify_client.authenticate():
-            console.print("[red] Failed to authenticate with Spotify[/red]")
-            return
-
-        # Process songs with optimized progress tracking
-        _process_songs_with_progress(
-            songs, spotify_client, session_config, interactive, dry_run, verbose, quiet
-        )
+        # Dry runs change nothing, so there is nothing to resume from
+        journal = _open_journal(input_path, session_config, resume, dry_run, quiet)
+        seen = _open_seen_songs(session_config, since_last_run, dry_run, quiet)
+        store, session_id = _open_state(session_config, input_path, dry_run)
+        status = "error"
+
+        try:
+            # Parse and validate input
+            songs = _parse_and_validate_input(
+                input_path,
+                limit,
+                quiet,
+                input_format,
+                completed=journal.completed if journal else None,
+                seen=seen if since_last_run else None,
+            )
+            if not songs:
+                return
+
+            # Initialize Spotify client
+            if not quiet:
+                console.print("[cyan]🔐 Authenticating with Spotify...[/cyan]")
+            spotify_client = SpotifyClient(session_config)
+
+            if not spotify_client.authenticate():
+                console.print("[red] Failed to authenticate with Spotify[/red]")
+                return
+
+            # Process songs with optimized progress tracking
+            _process_songs_with_progress(
+                songs,
+                spotify_client,
+                session_config,
+                interactive,
+                dry_run,
+                verbose,
+                quiet,
+                prefetch=prefetch,
+                journal=journal,
+                seen=seen,
+                store=store,
+                session_id=session_id,
+            )
+            status = "completed"
+        finally:
+            if journal is not None:
+                journal.close()
+            if seen is not None and not dry_run:
+                seen.save()
+            store.save_session(session_id, status)
+            store.log_event(session_id, status)
+            store.close()
 
         # Show runtime summary
         if not quiet:
@@ -290,22 +353,131 @@ def _load_env_variables() -> None:
         pass
 
 
-def _parse_and_validate_input(input_path: Path, limit: Optional[int], quiet: bool) -> list:
-    """Parse and validate input file, applying limit if specified."""
-    from yt2spot.input_parser import parse_input_file
-    
+def _open_journal(
+    input_path: Path,
+    session_config: SessionConfig,
+    resume: bool,
+    dry_run: bool,
+    quiet: bool,
+):
+    """Open the checkpoint journal for a real (non dry-run) migration."""
+    from yt2spot.incremental import MigrationJournal
+
+    if dry_run:
+        if resume:
+            console.print("[yellow]⚠️  --resume has no effect with --dry-run[/yellow]")
+        return None
+
+    journal = MigrationJournal.for_input(
+        session_config.log_dir, input_path, resume=resume
+    )
+    if resume and not quiet:
+        if journal.completed:
+            console.print(
+                f"[cyan]⏩ Resuming: {len(journal.completed)} songs already "
+                "completed in an earlier run[/cyan]"
+            )
+        else:
+            console.print("[yellow]⚠️  Nothing to resume for this file[/yellow]")
+    return journal
+
+
+def _open_state(session_config: SessionConfig, input_path: Path, dry_run: bool):
+    """Open the shared state store and register this run as a session."""
+    from uuid import uuid4
+
+    from yt2spot.state import StateStore
+
+    store = StateStore.in_dir(session_config.log_dir)
+    session_id = uuid4().hex
+    store.save_session(
+        session_id,
+        "processing",
+        config={
+            "source": "cli",
+            "input_path": str(input_path),
+            "dry_run": dry_run,
+            "hard_threshold": session_config.hard_threshold,
+            "reject_threshold": session_config.reject_threshold,
+        },
+    )
+    store.log_event(session_id, "started")
+    return store, session_id
+
+
+def _open_seen_songs(
+    session_config: SessionConfig,
+    since_last_run: bool,
+    dry_run: bool,
+    quiet: bool,
+):
+    """
+    Open the set of songs handled by earlier runs.
+
+    Real runs always add to the set so a later run can use
+    ``--since-last-run``; dry runs only read it, and only when asked to.
+    """
+    from yt2spot.incremental import SeenSongs
+
+    if dry_run and not since_last_run:
+        return None
+
+    seen = SeenSongs.in_dir(session_config.log_dir)
+    if since_last_run and not quiet:
+        if len(seen):
+            console.print(
+                f"[cyan]⏩ Skipping songs seen in earlier runs ({len(seen)} known)[/cyan]"
+            )
+        else:
+            console.print(
+                "[yellow]⚠️  No earlier runs recorded - processing all songs[/yellow]"
+            )
+    return seen
+
+
+def _parse_and_validate_input(
+    input_path: Path,
+    limit: Optional[int],
+    quiet: bool,
+    input_format: Optional[str] = None,
+    completed: Optional[Container[int]] = None,
+    seen=None,
+) -> Iterator | None:
+    """
+    Open a lazy song stream over the input file, applying limit if specified.
+
+    Only the first song is read up front (to report an empty file early);
+    the rest is parsed as processing pulls it, and reading stops once the
+    limit is reached. Songs whose source line is in ``completed``, and songs
+    already in ``seen`` (a ``SeenSongs`` set), are skipped before the limit
+    is applied. Large CSV files are parsed up front by several processes.
+    """
+    from yt2spot.input_parser import is_large_csv, iter_input_file, parse_csv_parallel
+
     if not quiet:
         console.print(f"[cyan]📁 Parsing input file:[/cyan] {input_path}")
-    
-    songs = parse_input_file(input_path)
-    
-    if not songs:
+
+    if is_large_csv(input_path, input_format):
+        songs = iter(parse_csv_parallel(input_path))
+    else:
+        songs = iter_input_file(input_path, input_format)
+    first_song = next(songs, None)
+
+    if first_song is None:
         console.print("[red] No songs found in input file[/red]")
-        return []
+        return None
+
+    songs = chain([first_song], songs)
+
+    if completed:
+        songs = (song for song in songs if song.source_line not in completed)
+
+    if seen is not None:
+        songs = seen.filter_new(songs)
 
     # Apply limit if specified
     if limit and limit > 0:
-        songs = songs[:limit]
+        songs = islice(songs, limit)
         if not quiet:
             console.print(f"[yellow]⚠️  Limited to first {limit} songs[/yellow]")
 
@@ -313,25 +485,47 @@ def _parse_and_validate_input(input_path: Path, limit: Optional[int], quiet: boo
 
 
 def _process_songs_with_progress(
-    songs: list,
+    songs: Iterable,
     spotify_client,
     session_config: SessionConfig,
     interactive: bool,
     dry_run: bool,
     verbose: bool,
     quiet: bool,
+    prefetch: int = DEFAULT_PREFETCH,
+    journal=None,
+    seen=None,
+    store=None,
+    session_id: str = "",
 ) -> None:
-    """Process songs with optimized progress tracking and error handling."""
-    from yt2spot.matcher.decision import get_decision_summary, make_decision
-    from yt2spot.matcher.scoring import score_candidates
-    from yt2spot.matcher.search import search_spotify_tracks
+    """
+    Process songs with optimized progress tracking and error handling.
+
+    Searching and scoring run up to ``prefetch`` songs ahead of the song
+    currently being decided, so an interactive prompt for the next song
+    is usually ready as soon as the previous one is answered. Each finished
+    song is recorded in ``journal`` (if given) so an interrupted run can be
+    resumed, and added to ``seen`` (if given) for later ``--since-last-run``
+    runs. With a state ``store``, searches go through its cache and every
+    decision is stored under ``session_id``.
+    """
+    from yt2spot.incremental import SongDeduplicator
+    from yt2spot.matcher.decision import DecisionTally, make_decision
+
+    # Streams have no length until they are exhausted
+    total = len(songs) if isinstance(songs, Sized) else None
 
     if not quiet:
-        console.print(f"[cyan]🎵 Processing {len(songs)} songs...[/cyan]")
-    
-    decisions = []
+        count = f"{total} " if total is not None else ""
+        console.print(f"[cyan]🎵 Processing {count}songs...[/cyan]")
+
+    # Settled decisions are only counted, for the summary
+    decisions = DecisionTally()
     liked_count = 0
     error_count = 0
+    deduplicator = SongDeduplicator()
+
+    executor = ThreadPoolExecutor(max_workers=prefetch) if prefetch > 0 else None
 
     with Progress(
         SpinnerColumn(),
@@ -341,20 +535,54 @@ def _process_songs_with_progress(
         console=console,
         disable=quiet,  # Disable progress bar in quiet mode
     ) as progress:
-        task = progress.add_task("Processing songs...", total=len(songs))
-
-        for i, song in enumerate(songs, 1):
+        task = progress.add_task("Processing songs...", total=total)
+
+        # Duplicates are not searched; they reuse their group's decision
+        prefetched = _iter_prefetched(
+            songs,
+            spotify_client,
+            session_config,
+            executor,
+            prefetch,
+            skip=deduplicator.register,
+            store=store,
+        )
+        for song, pending_candidates in prefetched:
             if not quiet:
                 progress.update(task, description=f"Processing: {song.title[:30]}...")
 
             try:
-                # Process single song efficiently
-                decision = _process_single_song(
-                    song, spotify_client, session_config, interactive
+                decision = None
+                if pending_candidates is None:
+                    decision = deduplicator.fan_out(song)
+
+                if decision is not None:
+                    decisions.add(decision)
+                    if store is not None:
+                        store.record_decision(session_id, decision)
+                    if verbose:
+                        console.print(f"[dim]↺ Duplicate: {decision.reason}[/dim]")
+                    if not dry_run:
+                        _record_outcome(song, decision, journal, seen)
+                    progress.advance(task)
+                    continue
+
+                if pending_candidates is not None:
+                    candidates = pending_candidates.result()
+                else:
+                    # The group's first song failed, so nothing to reuse
+                    candidates = _search_and_score(
+                        song, spotify_client, session_config, store
+                    )
+                decision = make_decision(
+                    song, candidates, session_config, interactive
                 )
-                decisions.append(decision)
+                decisions.add(decision)
+                if store is not None:
+                    store.record_decision(session_id, decision)
 
                 # Handle liking/dry run
+                completed = True
                 if decision.chosen_candidate:
                     if not dry_run:
                         if spotify_client.like_track(decision.chosen_candidate.spotify_id):
@@ -363,10 +591,13 @@ def _process_songs_with_progress(
                                 console.print(
                                     f"[green]✓[/green] Liked: {decision.chosen_candidate.title} by {decision.chosen_candidate.artist}"
                                 )
-                        elif verbose:
-                            console.print(
-                                f"[red]✗[/red] Failed to like: {decision.chosen_candidate.title}"
-                            )
+                        else:
+                            # Leave it out of the journal so --resume retries it
+                            completed = False
+                            if verbose:
+                                console.print(
+                                    f"[red]✗[/red] Failed to like: {decision.chosen_candidate.title}"
+                                )
                     else:
                         liked_count += 1  # Count what would be liked
                         if verbose:
@@ -374,6 +605,11 @@ def _process_songs_with_progress(
                                 f"[blue]🔍[/blue] Would like: {decision.chosen_candidate.title} by {decision.chosen_candidate.artist}"
                             )
 
+                if completed:
+                    # Until the first song is liked, its duplicates get their own try
+                    deduplicator.record(song, decision)
+                    if not dry_run:
+                        _record_outcome(song, decision, journal, seen)
                 progress.advance(task)
 
             except KeyboardInterrupt:
@@ -385,33 +621,114 @@ def _process_songs_with_progress(
                     console.print(f"[red]❌ Error processing '{song.title}': {e}[/red]")
                 continue
 
+        if total is None:
+            progress.update(task, total=len(decisions))
+
+    if executor is not None:
+        # Don't wait for searches the user will never see (e.g. after quitting)
+        executor.shutdown(wait=False, cancel_futures=True)
+
     # Show comprehensive summary
     if not quiet:
-        _show_migration_summary(decisions, liked_count, error_count, dry_run)
+        _show_migration_summary(
+            decisions,
+            liked_count,
+            error_count,
+            dry_run,
+            duplicates=deduplicator.duplicates,
+            unique=deduplicator.unique,
+            unchanged=seen.unchanged if seen is not None else 0,
+        )
 
 
-def _process_single_song(song, spotify_client, session_config: SessionConfig, interactive: bool):
-    """Process a single song efficiently."""
-    from yt2spot.matcher.decision import make_decision
+def _record_outcome(song, decision, journal=None, seen=None) -> None:
+    """Checkpoint a finished song in the journal and the seen-songs set."""
+    if journal is not None:
+        chosen = decision.chosen_candidate
+        journal.record(
+            song.source_line, decision.decision, chosen.spotify_id if chosen else None
+        )
+    if seen is not None:
+        seen.add(song)
+
+
+def _iter_prefetched(
+    songs: Iterable,
+    spotify_client,
+    session_config: SessionConfig,
+    executor: ThreadPoolExecutor | None,
+    window: int,
+    skip: Callable[[Any], bool] | None = None,
+    store=None,
+) -> Iterator[tuple]:
+    """
+    Yield ``(song, future)`` pairs in input order.
+
+    Keeps ``window`` songs beyond the one being yielded submitted to the
+    executor. Without an executor, candidates are searched synchronously
+    when each song is reached. Songs for which ``skip`` returns True (called
+    once per song, in input order) are not searched and come with a None
+    future.
+    """
+    song_iter = iter(songs)
+
+    if executor is None:
+        for song in song_iter:
+            if skip is not None and skip(song):
+                yield song, None
+                continue
+            future: Future = Future()
+            try:
+                future.set_result(
+                    _search_and_score(song, spotify_client, session_config, store)
+                )
+            except Exception as e:
+                future.set_exception(e)
+            yield song, future
+        return
+
+    def submit(song) -> tuple:
+        if skip is not None and skip(song):
+            return song, None
+        return song, executor.submit(
+            _search_and_score, song, spotify_client, session_config, store
+        )
+
+    pending = deque(submit(song) for song in islice(song_iter, window + 1))
+    while pending:
+        current = pending.popleft()
+        next_song = next(song_iter, None)
+        if next_song is not None:
+            pending.append(submit(next_song))
+        yield current
+
+
+def _search_and_score(
+    song, spotify_client, session_config: SessionConfig, store=None
+) -> list:
+    """Search Spotify (or the store's cache) and return scored candidates."""
     from yt2spot.matcher.scoring import score_candidates
     from yt2spot.matcher.search import search_spotify_tracks
 
-    # Search for candidates
-    candidates = search_spotify_tracks(song, spotify_client, session_config)
+    candidates = search_spotify_tracks(song, spotify_client, session_config, store)
 
-    # Score candidates if any found
     if candidates:
         candidates = score_candidates(song, candidates, session_config)
 
-    # Make decision
-    return make_decision(song, candidates, session_config, interactive)
-
+    return candidates
 
-def _show_migration_summary(decisions: list, liked_count: int, error_count: int, dry_run: bool) -> None:
-    """Show comprehensive migration summary."""
-    from yt2spot.matcher.decision import get_decision_summary
 
-    summary = get_decision_summary(decisions)
+def _show_migration_summary(
+    decisions,
+    liked_count: int,
+    error_count: int,
+    dry_run: bool,
+    duplicates: int = 0,
+    unique: int = 0,
+    unchanged: int = 0,
+) -> None:
+    """Show comprehensive migration summary of a DecisionTally."""
+    summary = decisions.summary()
     
     console.print("\n[bold]📊 Migration Summary:[/bold]")
     console.print(f"  Total songs processed: {summary['total']}")
@@ -430,6 +747,14 @@ def _show_migration_summary(decisions: list, liked_count: int, error_count: int,
         f"  Rejected: [red]{summary['auto_reject'] + summary['manual_reject']}[/red]"
     )
     console.print(f"  Success rate: [cyan]{summary['success_rate']:.1%}[/cyan]")
+
+    if duplicates > 0:
+        console.print(
+            f"  Duplicates reusing an earlier match: [dim]{duplicates}[/dim] "
+            f"({unique} unique songs)"
+        )
+    if unchanged > 0:
+        console.print(f"  Unchanged since last run: [dim]{unchanged}[/dim]")
     
     if error_count > 0:
         console.print(f"  [red]Errors encountered: {error_count}[/red]")
@@ -457,6 +782,234 @@ def show_banner(config: SessionConfig) -> None:
     )
 
 
+@cli.command("migrate-bulk")
+@click.argument(
+    "inputs", nargs=-1, required=True, type=click.Path(exists=True, path_type=Path)
+)
+@click.option(
+    "--input-format",
+    type=click.Choice(["csv", "json", "txt", "ytmusic-text"]),
+    help="Parse every input as this format instead of guessing from its extension",
+)
+@click.option(
+    "--playlist-prefix",
+    default="",
+    help="Text put before each playlist name (playlists are named after their files)",
+)
+@click.option(
+    "--public/--private", default=True, help="Make the playlists public or private"
+)
+@click.option(
+    "--dry-run", is_flag=True, help="Simulate the process without making any changes"
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=4,
+    show_default=True,
+    help="Number of files processed at the same time",
+)
+@click.option(
+    "--hard-threshold",
+    type=float,
+    default=0.87,
+    help="Threshold for automatic acceptance (0.0-1.0)",
+)
+@click.option(
+    "--reject-threshold",
+    type=float,
+    default=0.60,
+    help="Threshold for automatic rejection (0.0-1.0)",
+)
+@click.option(
+    "--fuzzy-threshold",
+    type=float,
+    default=0.80,
+    help="Minimum threshold for fuzzy matching (0.0-1.0)",
+)
+@click.option(
+    "--log-dir", type=click.Path(path_type=Path), help="Directory to store log files"
+)
+@click.option(
+    "--cache-file",
+    type=click.Path(path_type=Path),
+    help="Path to Spotify token cache file",
+)
+@click.option("--quiet", "-q", is_flag=True, help="Minimize output (errors only)")
+@click.option(
+    "--verbose", "-v", is_flag=True, help="Verbose output with detailed information"
+)
+def migrate_bulk(
+    inputs: tuple[Path, ...],
+    input_format: str | None,
+    playlist_prefix: str,
+    public: bool,
+    dry_run: bool,
+    concurrency: int,
+    hard_threshold: float,
+    reject_threshold: float,
+    fuzzy_threshold: float,
+    log_dir: Path | None,
+    cache_file: Path | None,
+    quiet: bool,
+    verbose: bool,
+) -> None:
+    """
+    Migrate many export files at once, each into its own playlist.
+
+    INPUTS are export files, or directories whose .txt, .csv and .json
+    files are migrated. Files are processed concurrently with one Spotify
+    login, search cache and duplicate index, so a song found in several
+    files is searched only once. Uncertain matches are skipped.
+
+    Example usage:
+
+        yt2spot migrate-bulk exports/
+
+        yt2spot migrate-bulk rock.csv jazz.csv --playlist-prefix "YT: " --dry-run
+    """
+    from yt2spot.bulk import BulkMigration, discover_inputs, playlist_name_for
+
+    start_time = time.time()
+    validate_thresholds(hard_threshold, reject_threshold, fuzzy_threshold)
+    if quiet and verbose:
+        raise click.BadParameter("Cannot use both --quiet and --verbose")
+
+    try:
+        files = discover_inputs(inputs)
+    except ValueError as e:
+        raise click.BadParameter(str(e)) from e
+    if not files:
+        console.print("[red] No input files found[/red]")
+        sys.exit(1)
+
+    cli_overrides = build_cli_overrides(
+        "", public, False, hard_threshold, reject_threshold, fuzzy_threshold,
+        False, quiet, verbose, False, log_dir, cache_file, None, dry_run, False, False
+    )
+
+    try:
+        session_config = load_config(str(files[0]), cli_overrides)
+        jobs = [(path, playlist_name_for(path, playlist_prefix)) for path in files]
+
+        from yt2spot.spotify_client import SpotifyClient
+        from yt2spot.state import StateStore
+
+        _load_env_variables()
+
+        # One login for every file
+        if not quiet:
+            console.print(f"[cyan]📁 Migrating {len(files)} files[/cyan]")
+            console.print("[cyan]🔐 Authenticating with Spotify...[/cyan]")
+        spotify_client = SpotifyClient(session_config)
+        if not spotify_client.authenticate():
+            console.print("[red] Failed to authenticate with Spotify[/red]")
+            sys.exit(1)
+
+        store = StateStore.in_dir(session_config.log_dir)
+        try:
+            with Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                BarColumn(),
+                TextColumn("{task.completed} songs"),
+                console=console,
+                disable=quiet,
+            ) as progress:
+                tasks = {path: progress.add_task(name[:30], total=None) for path, name in jobs}
+
+                def on_song(path: Path, decision) -> None:
+                    progress.advance(tasks[path])
+                    if verbose and decision.is_matched:
+                        chosen = decision.chosen_candidate
+                        console.print(f"[green]✓[/green] {path.name}: {chosen.title} by {chosen.artist}")
+
+                bulk = BulkMigration(
+                    spotify_client,
+                    session_config,
+                    store=store,
+                    concurrency=concurrency,
+                    input_format=input_format,
+                    on_song=on_song,
+                )
+                results = bulk.run(jobs)
+        finally:
+            store.close()
+
+        if not quiet:
+            _show_bulk_summary(results, bulk.index, dry_run)
+            runtime = time.time() - start_time
+            console.print(f"\n[green]✅ Bulk migration finished in {runtime:.2f}s[/green]")
+        if not all(result.ok for result in results):
+            sys.exit(1)
+
+    except KeyboardInterrupt:
+        console.print("\n[yellow]⚠️  Operation cancelled by user[/yellow]")
+        sys.exit(1)
+    except Exception as e:
+        console.print(f"\n[red]❌ Error: {e}[/red]")
+        sys.exit(1)
+
+
+def _show_bulk_summary(results: list, index, dry_run: bool) -> None:
+    """Show one line per migrated file and the shared search savings."""
+    console.print("\n[bold]📊 Bulk Migration Summary:[/bold]")
+    for result in results:
+        if not result.ok:
+            console.print(f"  [red]✗[/red] {result.input_path.name}: {result.error}")
+            continue
+        added = (
+            f"{result.matched} would be added"
+            if dry_run
+            else f"{result.added} added to '{result.playlist_name}'"
+        )
+        console.print(
+            f"  [green]✓[/green] {result.input_path.name}: {result.matched}/{result.total} matched, "
+            f"{added}, {result.skipped} skipped, {result.rejected} rejected"
+            + (f", [red]{result.errors} errors[/red]" if result.errors else "")
+        )
+    if index.reused:
+        console.print(
+            f"  Searches shared between files: [dim]{index.reused}[/dim] "
+            f"({index.searches} songs searched)"
+        )
+    if dry_run:
+        console.print(
+            "\n[blue]🔍 This was a dry run - no playlists were changed[/blue]"
+        )
+
+
+@cli.command()
+@click.argument(
+    "input_path", type=click.Path(exists=True, dir_okay=False, path_type=Path)
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="CSV file to write (default: standard output)",
+)
+def convert(input_path: Path, output: Path | None) -> None:
+    """
+    Convert text copied from a YouTube Music library page to CSV.
+
+    The text can also be migrated directly, without converting it first:
+
+        yt2spot migrate --input library.txt --input-format ytmusic-text
+    """
+    from yt2spot.converter import convert_export
+
+    with open(input_path, encoding="utf-8") as source:
+        if output is None:
+            convert_export(source, sys.stdout)
+            return
+
+        with open(output, "w", encoding="utf-8", newline="") as destination:
+            count = convert_export(source, destination)
+
+    console.print(f"[green]✓[/green] Wrote {count} songs to {output}")
+
+
 @cli.command()
 @click.option(
     "--path",
@@ -0,0 +1,107 @@
+"""
+Conversion of copied YouTube Music library text into structured rows.
+
+A library page copied from YouTube Music lists each song as a block of
+lines: the title, one or more artist lines, the album, and finally the
+duration. The converter reads these blocks in a single streaming pass.
+"""
+
+from __future__ import annotations
+
+import csv
+import re
+from collections.abc import Iterable, Iterator
+from typing import NamedTuple, TextIO
+
+EXPORT_CSV_HEADER = ("Title", "Artist", "Album", "Duration")
+
+# A song block ends with its duration, e.g. "4:30" or "1:02:03"
+_DURATION_LINE = re.compile(r"^\d+(?::\d{2}){1,2}$")
+
+
+class ExportRow(NamedTuple):
+    """One song parsed from a text export."""
+
+    title: str
+    artist: str
+    album: str
+    duration: str
+    source_line: int
+
+
+def iter_export_rows(lines: Iterable[str]) -> Iterator[ExportRow]:
+    """
+    Parse song blocks from text export lines.
+
+    Blank lines are ignored, and a block without at least a title and an
+    artist line before its duration is dropped, as is a trailing block with
+    no duration.
+
+    Args:
+        lines: Lines of the export in order (an open file works)
+
+    Returns:
+        Iterator of rows in export order
+    """
+    parts: list[str] = []
+    first_line = 0
+
+    for line_num, raw_line in enumerate(lines, start=1):
+        line = raw_line.strip()
+        if not line:
+            continue
+
+        if not _DURATION_LINE.match(line):
+            if not parts:
+                first_line = line_num
+            parts.append(line)
+            continue
+
+        # Durations outside a block carry nothing and are skipped
+        if len(parts) >= 2:
+            yield _build_row(parts, line, first_line)
+        parts = []
+
+
+def _build_row(parts: list[str], duration: str, source_line: int) -> ExportRow:
+    """Split a block into title, artist and album."""
+    title = parts[0]
+
+    if len(parts) == 2:
+        artist_parts = parts[1:]
+        album = ""
+    elif len(parts) == 3:
+        artist_parts = parts[1:2]
+        album = parts[2]
+    else:
+        # Artists may span several lines (e.g. "Lady Gaga", "&", "Bruno Mars")
+        artist_parts = parts[1:-1]
+        album = parts[-1]
+
+    # An album named like the title is a single
+    if album == title:
+        album = ""
+
+    artist = " ".join(" ".join(artist_parts).split())
+    return ExportRow(title, artist, album, duration, source_line)
+
+
+def convert_export(lines: Iterable[str], destination: TextIO) -> int:
+    """
+    Write a text export as CSV with a Title, Artist, Album, Duration header.
+
+    Args:
+        lines: Lines of the export
+        destination: Text stream to write to (open with ``newline=""``)
+
+    Returns:
+        Number of songs written
+    """
+    writer = csv.writer(destination, quoting=csv.QUOTE_ALL)
+    writer.writerow(EXPORT_CSV_HEADER)
+
+    count = 0
+    for row in iter_export_rows(lines):
+        writer.writerow(row[:4])
+        count += 1
+    return count
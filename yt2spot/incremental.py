@@ -1,8 +1,269 @@
 """Incremental processing and deduplication."""
 
-# Placeholder for incremental processing - will be implemented in Sprint 2
+from __future__ import annotations
 
+import hashlib
+import json
+import os
+import time
+from array import array
+from collections.abc import Iterable, Iterator
+from dataclasses import replace
+from pathlib import Path
+from typing import TextIO
 
-def track_processed_songs() -> None:
-    """Track which songs have been processed."""
-    pass
+from yt2spot.matcher.normalize import (
+    create_search_key,
+    normalize_artist,
+    normalize_title,
+)
+from yt2spot.models import MatchDecision, SongInput
+
+
+def song_key(song: SongInput) -> str:
+    """
+    Create the key under which songs count as the same track.
+
+    Titles and artists are normalized first, so "Song (Official Video)" by
+    "The Band" and "song" by "band, the" share a key.
+    """
+    return create_search_key(normalize_title(song.title), normalize_artist(song.artist))
+
+
+class SongDeduplicator:
+    """
+    Deduplication stage between parsing and searching.
+
+    Songs are registered in input order. Only the first song of each key
+    needs to be searched and decided; the decision recorded for it is then
+    fanned out to every later song with the same key.
+    """
+
+    def __init__(self) -> None:
+        self._first_lines: dict[str, int] = {}
+        self._decisions: dict[str, MatchDecision] = {}
+        self.unique = 0
+        self.duplicates = 0
+
+    def register(self, song: SongInput) -> bool:
+        """
+        Register a song and set its ``normalized_key``.
+
+        Returns:
+            True if the song repeats an earlier registered song
+        """
+        song.normalized_key = song_key(song)
+
+        if song.normalized_key in self._first_lines:
+            self.duplicates += 1
+            return True
+
+        self._first_lines[song.normalized_key] = song.source_line
+        self.unique += 1
+        return False
+
+    def record(self, song: SongInput, decision: MatchDecision) -> None:
+        """Remember the decision made for the first song of a group."""
+        self._decisions.setdefault(song.normalized_key, decision)
+
+    def fan_out(self, song: SongInput) -> MatchDecision | None:
+        """
+        Copy the group's decision for a duplicate song.
+
+        Returns:
+            The decision with ``song`` as its input, or None if the first
+            song of the group never got a decision (e.g. it failed)
+        """
+        decision = self._decisions.get(song.normalized_key)
+        if decision is None:
+            return None
+
+        first_line = self._first_lines[song.normalized_key]
+        return replace(
+            decision,
+            input_song=song,
+            reason=f"Duplicate of line {first_line}: {decision.reason}",
+        )
+
+
+def file_fingerprint(path: str | Path) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class MigrationJournal:
+    """
+    Append-only, crash-safe journal of per-song outcomes.
+
+    One journal exists per input file (keyed by its content hash) and holds
+    one JSON line per finished ``source_line``. Writes are fsynced in
+    batches, so a crash loses at most the last unsynced batch and a
+    partially written last line is ignored when the journal is read back.
+    """
+
+    VERSION = 1
+
+    def __init__(
+        self,
+        path: Path,
+        input_hash: str,
+        resume: bool = False,
+        sync_every: int = 50,
+        sync_interval: float = 2.0,
+    ):
+        self.path = path
+        self.input_hash = input_hash
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.completed: set[int] = set()
+        self._needs_newline = False
+
+        if resume and path.exists():
+            self._load()
+            self._file: TextIO = open(path, "a", encoding="utf-8")
+            if self._needs_newline:
+                self._file.write("\n")
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(path, "w", encoding="utf-8")
+            header = {"journal": self.VERSION, "input_hash": input_hash}
+            self._file.write(json.dumps(header) + "\n")
+
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    @classmethod
+    def for_input(
+        cls, journal_dir: str | Path, input_path: str | Path, resume: bool = False
+    ) -> MigrationJournal:
+        """Open the journal belonging to ``input_path`` in ``journal_dir``."""
+        input_hash = file_fingerprint(input_path)
+        path = Path(journal_dir) / f"journal-{input_hash[:16]}.jsonl"
+        return cls(path, input_hash, resume=resume)
+
+    def _load(self) -> None:
+        with open(self.path, encoding="utf-8") as file:
+            text = file.read()
+        self._needs_newline = bool(text) and not text.endswith("\n")
+
+        lines = text.splitlines()
+        if not lines:
+            return
+        try:
+            header = json.loads(lines[0])
+        except json.JSONDecodeError:
+            header = {}
+        if header.get("input_hash") != self.input_hash:
+            raise ValueError(f"Journal {self.path} belongs to a different input file")
+
+        for line in lines[1:]:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Torn write from a crash
+            self.completed.add(entry["line"])
+
+    def record(
+        self, source_line: int, decision: str, track_id: str | None = None
+    ) -> None:
+        """Append the outcome of one song."""
+        entry = {"line": source_line, "decision": decision, "track_id": track_id}
+        self._file.write(json.dumps(entry) + "\n")
+        self.completed.add(source_line)
+
+        self._unsynced += 1
+        if (
+            self._unsynced >= self.sync_every
+            or time.monotonic() - self._last_sync >= self.sync_interval
+        ):
+            self.sync()
+
+    def sync(self) -> None:
+        """Flush buffered entries to disk."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        """Sync and close the journal."""
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    def __enter__(self) -> MigrationJournal:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class SeenSongs:
+    """
+    Compact on-disk set of songs handled by earlier runs.
+
+    Each song is stored as a 64-bit hash of its ``song_key``, so a library
+    of 100,000 songs takes 800 KB and loads with a single read. Collisions
+    are negligible at that size (about one in 10^9 for a new song).
+    """
+
+    FILE_NAME = "seen-songs.bin"
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._hashes: set[int] = set()
+        self._added = 0
+        self.unchanged = 0
+
+        if path.exists():
+            hashes = array("Q")
+            hashes.frombytes(path.read_bytes())
+            self._hashes.update(hashes)
+
+    @classmethod
+    def in_dir(cls, directory: str | Path) -> SeenSongs:
+        """Open the set stored in ``directory``."""
+        return cls(Path(directory) / cls.FILE_NAME)
+
+    @staticmethod
+    def _hash(song: SongInput) -> int:
+        digest = hashlib.blake2b(song_key(song).encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "little")
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def __contains__(self, song: SongInput) -> bool:
+        return self._hash(song) in self._hashes
+
+    def add(self, song: SongInput) -> None:
+        """Mark a song as handled."""
+        fingerprint = self._hash(song)
+        if fingerprint not in self._hashes:
+            self._hashes.add(fingerprint)
+            self._added += 1
+
+    def filter_new(self, songs: Iterable[SongInput]) -> Iterator[SongInput]:
+        """Yield only songs not handled before, counting the rest as unchanged."""
+        for song in songs:
+            if song in self:
+                self.unchanged += 1
+            else:
+                yield song
+
+    def save(self) -> None:
+        """Write the set if it changed, replacing the old file atomically."""
+        if not self._added:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(".tmp")
+        with open(temp_path, "wb") as file:
+            array("Q", sorted(self._hashes)).tofile(file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.path)
+        self._added = 0
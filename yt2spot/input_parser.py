@@ -4,19 +4,40 @@ Supports CSV, JSON, and TXT formats from YouTube Music exports.
 """
 
 import csv
-import json
+import io
+import mmap
+import os
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain
 from pathlib import Path
 
 from rich.console import Console
 
+from yt2spot.converter import iter_export_rows
+from yt2spot.json_stream import iter_json_items
 from yt2spot.models import SongInput
+from yt2spot.song_table import SongTable
 
 console = Console()
 
+# Object keys that may hold the track array in JSON exports, most preferred first
+JSON_TRACK_KEYS = ("tracks", "songs", "items")
 
-def parse_input_file(file_path: str | Path) -> list[SongInput]:
+# Characters read per step when streaming JSON files
+JSON_CHUNK_SIZE = 64 * 1024
+
+# CSV files at least this large are parsed by parse_csv_parallel
+PARALLEL_CSV_MIN_BYTES = 32 * 1024 * 1024
+
+# Bytes copied at a time while scanning for quote-safe CSV boundaries
+CSV_SCAN_WINDOW = 16 * 1024 * 1024
+
+
+def parse_input_file(file_path: str | Path) -> Sequence[SongInput]:
     """
-    Parse input file and return list of SongInput objects.
+    Parse input file and return a sequence of SongInput objects.
 
     Supports:
     - CSV files (with headers: Title, Artist, Album, Duration)
@@ -27,7 +48,7 @@ def parse_input_file(file_path: str | Path) -> list[SongInput]:
         file_path: Path to the input file
 
     Returns:
-        List of SongInput objects
+        List of SongInput objects, or a SongTable for large CSV files
 
     Raises:
         FileNotFoundError: If file doesn't exist
@@ -35,159 +56,424 @@ def parse_input_file(file_path: str | Path) -> list[SongInput]:
     """
     file_path = Path(file_path)
 
+    if is_large_csv(file_path):
+        songs = parse_csv_parallel(file_path)
+    else:
+        songs = list(iter_input_file(file_path))
+
+    console.print(
+        f"[green]✓[/green] Parsed {len(songs)} songs from "
+        f"{file_path.suffix.lstrip('.').upper()} file"
+    )
+    return songs
+
+
+def iter_input_file(
+    file_path: str | Path, file_format: str | None = None
+) -> Iterator[SongInput]:
+    """
+    Lazily parse an input file, yielding songs as they are read.
+
+    Accepts the same formats as :func:`parse_input_file`, but only keeps the
+    current record in memory, so callers can start working on the first song
+    before the rest of the file has been read.
+
+    Args:
+        file_path: Path to the input file
+        file_format: Format to parse as instead of the one implied by the
+            suffix, e.g. "ytmusic-text" for text copied from YouTube Music
+
+    Returns:
+        Iterator of SongInput objects in file order
+
+    Raises:
+        FileNotFoundError: If file doesn't exist
+        ValueError: If file format is unsupported (raised immediately) or
+            malformed (raised while iterating)
+    """
+    file_path = Path(file_path)
+
     if not file_path.exists():
         raise FileNotFoundError(f"Input file not found: {file_path}")
 
-    suffix = file_path.suffix.lower()
+    file_format = _normalize_format(file_format or file_path.suffix)
+    return _iter_file(file_path, file_format)
 
-    if suffix == ".csv":
-        return _parse_csv(file_path)
-    elif suffix == ".json":
-        return _parse_json(file_path)
-    elif suffix == ".txt":
-        return _parse_txt(file_path)
-    else:
+
+def is_large_csv(file_path: str | Path, file_format: str | None = None) -> bool:
+    """
+    Check if a file is a CSV worth parsing with :func:`parse_csv_parallel`.
+
+    Args:
+        file_path: Path to the input file
+        file_format: Format override, as for :func:`iter_input_file`
+    """
+    file_path = Path(file_path)
+    return (
+        (file_format or file_path.suffix).lower().lstrip(".") == "csv"
+        and file_path.is_file()
+        and file_path.stat().st_size >= PARALLEL_CSV_MIN_BYTES
+    )
+
+
+def iter_input_stream(lines: Iterable[str], file_format: str) -> Iterator[SongInput]:
+    """
+    Lazily parse songs from an iterable of text lines.
+
+    Any iterable of strings works, including open text files, so input that
+    is not on disk (uploads, converted exports) can be parsed the same way.
+
+    Args:
+        lines: Text lines (or chunks, for JSON) in file order
+        file_format: One of "csv", "json", "txt" or "ytmusic-text" (a
+            leading dot is allowed)
+
+    Returns:
+        Iterator of SongInput objects in input order
+
+    Raises:
+        ValueError: If the format is unsupported or the input is malformed
+    """
+    file_format = _normalize_format(file_format)
+    return _PARSERS[file_format](lines)
+
+
+def _normalize_format(file_format: str) -> str:
+    """Return the parser key for a format name or file suffix."""
+    normalized = file_format.lower().lstrip(".")
+    if normalized not in _PARSERS:
         raise ValueError(
-            f"Unsupported file format: {suffix}. Supported: .csv, .json, .txt"
+            f"Unsupported file format: {file_format}. "
+            "Supported: .csv, .json, .txt, ytmusic-text"
         )
+    return normalized
+
+
+def _iter_file(file_path: Path, file_format: str) -> Iterator[SongInput]:
+    """Open a file and stream songs from it, closing it when exhausted."""
+    with open(file_path, encoding="utf-8") as file:
+        yield from _PARSERS[file_format](file)
+
 
+def _iter_csv(lines: Iterable[str]) -> Iterator[SongInput]:
+    """Stream songs from CSV lines."""
+    try:
+        line_iter = iter(lines)
+
+        # Buffer just enough lines to detect if file has headers
+        head: list[str] = []
+        head_size = 0
+        for line in line_iter:
+            head.append(line)
+            head_size += len(line)
+            if head_size >= 1024:
+                break
+        sample = "".join(head)[:1024]
+
+        sniffer = csv.Sniffer()
+        has_header = sniffer.has_header(sample)
+
+        reader = csv.reader(chain(head, line_iter))
+
+        if has_header:
+            headers = next(reader)
+            # Try to map headers to expected fields
+            header_map = _map_csv_headers(headers)
+        else:
+            # Assume order: Title, Artist, Album, Duration
+            header_map = {"title": 0, "artist": 1, "album": 2, "duration": 3}
+
+        for row_num, row in enumerate(reader, start=2 if has_header else 1):
+            song = _song_from_row(row, header_map, row_num)
+            if song is not None:
+                yield song
+
+    except Exception as e:
+        raise ValueError(f"Failed to parse CSV file: {e}") from e
+
+
+def _song_from_row(
+    row: list[str], header_map: dict, row_num: int
+) -> SongInput | None:
+    """Build a song from a CSV row, or warn and return None if it is unusable."""
+    song, problem = _row_to_song(row, header_map, row_num)
+    if problem:
+        _warn_skipped_row(row_num, problem)
+    return song
 
-def _parse_csv(file_path: Path) -> list[SongInput]:
-    """Parse CSV file with song data."""
-    songs = []
+
+def _row_to_song(
+    row: list[str], header_map: dict, row_num: int
+) -> tuple[SongInput | None, str | None]:
+    """Build a song from a CSV row, returning (song, problem)."""
+    if not row or all(not cell.strip() for cell in row):
+        return None, None  # Skip empty rows
 
     try:
-        with open(file_path, encoding="utf-8") as file:
-            # Try to detect if file has headers
-            sample = file.read(1024)
-            file.seek(0)
+        song = SongInput(
+            title=row[header_map["title"]].strip()
+            if len(row) > header_map["title"]
+            else "",
+            artist=row[header_map["artist"]].strip()
+            if len(row) > header_map["artist"]
+            else "",
+            album=row[header_map.get("album", -1)].strip()
+            if len(row) > header_map.get("album", -1)
+            else "",
+            duration=row[header_map.get("duration", -1)].strip()
+            if len(row) > header_map.get("duration", -1)
+            else "",
+            source_line=row_num,
+        )
+    except (IndexError, ValueError) as e:
+        return None, f"malformed: {e}"
+
+    if song.title and song.artist:  # Require at least title and artist
+        return song, None
+    return None, "missing title or artist"
+
+
+def _warn_skipped_row(row_num: int, problem: str) -> None:
+    """Report a CSV row that could not be turned into a song."""
+    console.print(f"[yellow]Warning:[/yellow] Skipping row {row_num} - {problem}")
+
+
+def parse_csv_parallel(
+    file_path: str | Path, workers: int | None = None
+) -> SongTable:
+    """
+    Parse a large CSV file using several worker processes.
+
+    The file is memory-mapped and split into chunks at record boundaries
+    (newlines outside quoted fields), each chunk is parsed in its own
+    process into a SongTable, and the tables are merged back in file order
+    with the same ``source_line`` numbers the sequential parser would
+    assign. The whole file is held in memory, so it is kept columnar.
+
+    Args:
+        file_path: Path to the CSV file
+        workers: Number of worker processes (defaults to the CPU count)
+
+    Returns:
+        SongTable of the songs in file order
+
+    Raises:
+        FileNotFoundError: If file doesn't exist
+        ValueError: If the file is malformed
+    """
+    file_path = Path(file_path)
+
+    if not file_path.exists():
+        raise FileNotFoundError(f"Input file not found: {file_path}")
 
-            sniffer = csv.Sniffer()
-            has_header = sniffer.has_header(sample)
+    workers = workers or os.cpu_count() or 1
 
-            reader = csv.reader(file)
+    try:
+        with open(file_path, "rb") as file, mmap.mmap(
+            file.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mapped:
+            sample = mapped[:1024].decode("utf-8", errors="ignore")
+            has_header = csv.Sniffer().has_header(sample)
 
             if has_header:
-                headers = next(reader)
-                # Try to map headers to expected fields
-                header_map = _map_csv_headers(headers)
+                # The reader pulls exactly the lines of the header record
+                lines = (line.decode("utf-8") for line in iter(mapped.readline, b""))
+                header_map = _map_csv_headers(next(csv.reader(lines)))
+                data_start = mapped.tell()
             else:
                 # Assume order: Title, Artist, Album, Duration
                 header_map = {"title": 0, "artist": 1, "album": 2, "duration": 3}
-
-            for row_num, row in enumerate(reader, start=2 if has_header else 1):
-                if not row or all(not cell.strip() for cell in row):
-                    continue  # Skip empty rows
-
-                try:
-                    song = SongInput(
-                        title=row[header_map["title"]].strip()
-                        if len(row) > header_map["title"]
-                        else "",
-                        artist=row[header_map["artist"]].strip()
-                        if len(row) > header_map["artist"]
-                        else "",
-                        album=row[header_map.get("album", -1)].strip()
-                        if len(row) > header_map.get("album", -1)
-                        else "",
-                        duration=row[header_map.get("duration", -1)].strip()
-                        if len(row) > header_map.get("duration", -1)
-                        else "",
-                        source_line=row_num,
-                    )
-
-                    if song.title and song.artist:  # Require at least title and artist
-                        songs.append(song)
-                    else:
-                        console.print(
-                            f"[yellow]Warning:[/yellow] Skipping row {row_num} - missing title or artist"
-                        )
-
-                except (IndexError, ValueError) as e:
-                    console.print(
-                        f"[yellow]Warning:[/yellow] Skipping malformed row {row_num}: {e}"
-                    )
+                data_start = 0
+
+            boundaries = _find_record_boundaries(
+                mapped, data_start, len(mapped), workers
+            )
+
+        chunks = [
+            (str(file_path), start, end, header_map)
+            for start, end in zip(boundaries, boundaries[1:], strict=False)
+        ]
+        if workers > 1 and len(chunks) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(_parse_csv_chunk, chunks))
+        else:
+            results = [_parse_csv_chunk(chunk) for chunk in chunks]
 
     except Exception as e:
         raise ValueError(f"Failed to parse CSV file: {e}") from e
 
-    console.print(f"[green]✓[/green] Parsed {len(songs)} songs from CSV file")
+    # Chunk-local row numbers become file row numbers
+    songs = SongTable()
+    row_offset = 1 if has_header else 0
+    for row_count, chunk_songs, problems in results:
+        songs.extend_table(chunk_songs, line_offset=row_offset)
+        for row_num, problem in problems:
+            _warn_skipped_row(row_num + row_offset, problem)
+        row_offset += row_count
+
     return songs
 
 
-def _parse_json(file_path: Path) -> list[SongInput]:
-    """Parse JSON file with song data."""
-    songs = []
+def _find_record_boundaries(
+    mapped: mmap.mmap, start: int, end: int, parts: int
+) -> list[int]:
+    """
+    Split ``[start, end)`` into up to ``parts`` ranges of whole CSV records.
 
-    try:
-        with open(file_path, encoding="utf-8") as file:
-            data = json.load(file)
-
-        # Handle different JSON structures
-        if isinstance(data, list):
-            # Array of track objects
-            tracks = data
-        elif isinstance(data, dict):
-            # Object with tracks array
-            tracks = data.get("tracks", data.get("songs", data.get("items", [])))
-        else:
-            raise ValueError("Unexpected JSON structure")
+    A newline ends a record only when an even number of quote characters
+    precedes it (escaped quotes come in pairs), so ``start`` must itself be a
+    record boundary.
+    """
+    boundaries = [start]
+    position = start
+    quotes = 0
+
+    for part in range(1, parts):
+        target = start + (end - start) * part // parts
+        if target <= boundaries[-1]:
+            continue
+
+        quotes += _count_quotes(mapped, position, target)
+        position = target
+
+        while True:
+            newline = mapped.find(b"\n", position, end)
+            if newline == -1:
+                boundaries.append(end)
+                return boundaries
+            quotes += _count_quotes(mapped, position, newline)
+            position = newline + 1
+            if quotes % 2 == 0:
+                break
+
+        if position < end:
+            boundaries.append(position)
+
+    boundaries.append(end)
+    return boundaries
+
+
+def _count_quotes(mapped: mmap.mmap, start: int, end: int) -> int:
+    """Count quote bytes in a range without copying it all at once."""
+    count = 0
+    for window in range(start, end, CSV_SCAN_WINDOW):
+        count += mapped[window : min(window + CSV_SCAN_WINDOW, end)].count(b'"')
+    return count
+
+
+def _parse_csv_chunk(
+    chunk: tuple[str, int, int, dict],
+) -> tuple[int, SongTable, list[tuple[int, str]]]:
+    """
+    Parse one byte range of a CSV file in a worker process.
 
-        for i, track in enumerate(tracks):
-            try:
-                # Handle different field names
-                title = (
-                    track.get("title")
-                    or track.get("name")
-                    or track.get("track_name", "")
-                )
-                artist = track.get("artist") or track.get("artist_name") or ""
-                album = track.get("album") or track.get("album_name", "")
-                duration = (
-                    track.get("duration")
-                    or track.get("duration_ms")
-                    or track.get("length", "")
-                )
+    Returns the number of rows read, the songs (numbered from 1 within the
+    chunk), and ``(row, problem)`` pairs for skipped rows. The songs are sent
+    back as a SongTable, which pickles as a few flat buffers.
+    """
+    path, start, end, header_map = chunk
 
-                # Handle artist arrays
-                if isinstance(artist, list):
-                    artist = ", ".join(artist)
+    with open(path, "rb") as file, mmap.mmap(
+        file.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mapped:
+        text = mapped[start:end].decode("utf-8")
 
-                song = SongInput(
-                    title=str(title).strip(),
-                    artist=str(artist).strip(),
-                    album=str(album).strip(),
-                    duration=str(duration).strip(),
-                    source_line=i + 1,
-                )
+    songs = SongTable()
+    problems = []
+    row_count = 0
+    for row_count, row in enumerate(csv.reader(io.StringIO(text)), start=1):
+        song, problem = _row_to_song(row, header_map, row_count)
+        if song is not None:
+            songs.append(song)
+        elif problem:
+            problems.append((row_count, problem))
 
-                if song.title and song.artist:
-                    songs.append(song)
-                else:
-                    console.print(
-                        f"[yellow]Warning:[/yellow] Skipping track {i+1} - missing title or artist"
-                    )
+    return row_count, songs, problems
 
-            except (KeyError, ValueError) as e:
-                console.print(
-                    f"[yellow]Warning:[/yellow] Skipping malformed track {i+1}: {e}"
-                )
+
+def _iter_json(lines: Iterable[str]) -> Iterator[SongInput]:
+    """
+    Stream songs from JSON text.
+
+    Items are decoded one at a time from either a top-level array or the
+    "tracks", "songs" or "items" array of a top-level object (in that order
+    of preference), so huge exports never have to be loaded whole.
+    """
+    try:
+        tracks = iter_json_items(_iter_chunks(lines), JSON_TRACK_KEYS, _rereader(lines))
+
+        for i, track in enumerate(tracks):
+            song = _song_from_track(track, i + 1)
+            if song is not None:
+                yield song
 
     except Exception as e:
         raise ValueError(f"Failed to parse JSON file: {e}") from e
 
-    console.print(f"[green]✓[/green] Parsed {len(songs)} songs from JSON file")
-    return songs
+
+def _iter_chunks(lines: Iterable[str]) -> Iterable[str]:
+    """Read file objects in fixed-size chunks; minified JSON is one huge line."""
+    read = getattr(lines, "read", None)
+    if read is not None:
+        return iter(partial(read, JSON_CHUNK_SIZE), "")
+    return lines
 
 
-def _parse_txt(file_path: Path) -> list[SongInput]:
-    """Parse simple text file with song data."""
-    songs = []
+def _rereader(lines: Iterable[str]) -> Callable[[], Iterable[str]] | None:
+    """Return a function reading a seekable file again from here, or None."""
+    seekable = getattr(lines, "seekable", None)
+    if seekable is None or not seekable():
+        return None
+    start = lines.tell()
 
+    def reread() -> Iterable[str]:
+        lines.seek(start)
+        return _iter_chunks(lines)
+
+    return reread
+
+
+def _song_from_track(track: dict, index: int) -> SongInput | None:
+    """Build a song from a JSON track object, or return None if unusable."""
     try:
-        with open(file_path, encoding="utf-8") as file:
-            lines = file.readlines()
+        # Handle different field names
+        title = track.get("title") or track.get("name") or track.get("track_name", "")
+        artist = track.get("artist") or track.get("artist_name") or ""
+        album = track.get("album") or track.get("album_name", "")
+        duration = (
+            track.get("duration") or track.get("duration_ms") or track.get("length", "")
+        )
+
+        # Handle artist arrays
+        if isinstance(artist, list):
+            artist = ", ".join(artist)
+
+        song = SongInput(
+            title=str(title).strip(),
+            artist=str(artist).strip(),
+            album=str(album).strip(),
+            duration=str(duration).strip(),
+            source_line=index,
+        )
 
+        if song.title and song.artist:
+            return song
+
+        console.print(
+            f"[yellow]Warning:[/yellow] Skipping track {index} - missing title or artist"
+        )
+
+    except (KeyError, ValueError) as e:
+        console.print(
+            f"[yellow]Warning:[/yellow] Skipping malformed track {index}: {e}"
+        )
+
+    return None
+
+
+def _iter_txt(lines: Iterable[str]) -> Iterator[SongInput]:
+    """Stream songs from simple text lines."""
+    try:
         for line_num, line in enumerate(lines, start=1):
             line = line.strip()
             if not line:
@@ -214,14 +500,13 @@ def _parse_txt(file_path: Path) -> list[SongInput]:
             artist = _clean_artist_name(artist)
 
             if title:  # Require at least a title
-                song = SongInput(
+                yield SongInput(
                     title=title,
                     artist=artist,
                     album="",
                     duration="",
                     source_line=line_num,
                 )
-                songs.append(song)
             else:
                 console.print(
                     f"[yellow]Warning:[/yellow] Skipping empty line {line_num}"
@@ -230,8 +515,29 @@ def _parse_txt(file_path: Path) -> list[SongInput]:
     except Exception as e:
         raise ValueError(f"Failed to parse TXT file: {e}") from e
 
-    console.print(f"[green]✓[/green] Parsed {len(songs)} songs from TXT file")
-    return songs
+
+def _iter_ytmusic_text(lines: Iterable[str]) -> Iterator[SongInput]:
+    """Stream songs from text copied from a YouTube Music library page."""
+    try:
+        for row in iter_export_rows(lines):
+            yield SongInput(
+                title=row.title,
+                artist=row.artist,
+                album=row.album,
+                duration=row.duration,
+                source_line=row.source_line,
+            )
+
+    except Exception as e:
+        raise ValueError(f"Failed to parse YouTube Music text export: {e}") from e
+
+
+_PARSERS: dict[str, Callable[[Iterable[str]], Iterator[SongInput]]] = {
+    "csv": _iter_csv,
+    "json": _iter_json,
+    "txt": _iter_txt,
+    "ytmusic-text": _iter_ytmusic_text,
+}
 
 
 def _map_csv_headers(headers: list[str]) -> dict:
@@ -0,0 +1,233 @@
+"""
+Incremental JSON reading for very large exports.
+
+Walks a JSON document chunk by chunk and yields the items of one array
+without ever holding the whole document in memory. Peak memory is bounded
+by the chunk size plus the size of the largest single item.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from typing import Any
+
+# Characters that matter when skipping over a value we don't need
+_STRUCTURAL = re.compile(r'["\[\]{}]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+_WHITESPACE = " \t\n\r"
+_NUMBER_TAIL = ".eE+-"
+
+
+class _ChunkBuffer:
+    """A sliding window over a stream of text chunks."""
+
+    def __init__(self, chunks: Iterable[str]):
+        self._chunks = iter(chunks)
+        self._decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        # Consumed text kept by capture(), and where its unsaved part starts
+        self._kept: list[str] | None = None
+        self._mark = 0
+
+    def fill(self) -> bool:
+        """Append the next non-empty chunk, dropping consumed text. False at EOF."""
+        for chunk in self._chunks:
+            if chunk:
+                if self._kept is not None:
+                    self._kept.append(self.buffer[self._mark : self.pos])
+                    self._mark = 0
+                self.buffer = self.buffer[self.pos :] + chunk
+                self.pos = 0
+                return True
+        self.eof = True
+        return False
+
+    def peek(self) -> str | None:
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return None
+
+    def expect(self, char: str) -> None:
+        """Consume ``char`` (after whitespace) or raise ValueError."""
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' but found {found!r}")
+        self.pos += 1
+
+    def decode(self) -> Any:
+        """Decode and consume the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # A number touching the end of the buffer (or cut before its
+            # fraction/exponent) may continue in the next chunk
+            if (
+                not self.eof
+                and (end == len(self.buffer) or self.buffer[end] in _NUMBER_TAIL)
+                and self.fill()
+            ):
+                continue
+            self.pos = end
+            return value
+
+    def skip(self) -> None:
+        """Consume the next JSON value without building it."""
+        if self.peek() not in ("{", "["):
+            self.decode()
+            return
+
+        depth = 0
+        in_string = False
+        while True:
+            pattern = _STRING_SPECIAL if in_string else _STRUCTURAL
+            match = pattern.search(self.buffer, self.pos)
+            if match is None:
+                self.pos = len(self.buffer)
+                if not self.fill():
+                    raise ValueError("Unexpected end of JSON input")
+                continue
+
+            char = match.group()
+            self.pos = match.end()
+            if in_string:
+                if char == "\\":
+                    # Make sure the escaped character is in the buffer, then skip it
+                    if self.pos >= len(self.buffer) and not self.fill():
+                        raise ValueError("Unexpected end of JSON input")
+                    self.pos += 1
+                else:
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char in "{[":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def capture(self) -> str:
+        """Consume the next JSON value and return its text."""
+        self.peek()
+        self._kept = []
+        self._mark = self.pos
+        try:
+            self.skip()
+            return "".join(self._kept) + self.buffer[self._mark : self.pos]
+        finally:
+            self._kept = None
+
+
+def iter_json_items(
+    chunks: Iterable[str],
+    keys: Sequence[str],
+    reread: Callable[[], Iterable[str]] | None = None,
+) -> Iterator[Any]:
+    """
+    Yield the items of a JSON array one at a time.
+
+    The array is either the top-level value or the value of one of ``keys``
+    in a top-level object (other members are skipped without being decoded).
+    When the object holds several of the keys, the one listed first wins,
+    wherever it is in the document. A top-level object without any of the
+    keys yields nothing.
+
+    The first key's array is always streamed. Another key's array has to be
+    held until the rest of the object shows no better key follows: with
+    ``reread`` the document is read a second time to stream it, otherwise
+    its text is kept in memory (but not decoded) meanwhile.
+
+    Args:
+        chunks: The document as text chunks of any size
+        keys: Object keys that may hold the array, most preferred first
+        reread: Returns the document's chunks again from the start
+
+    Returns:
+        Iterator over the decoded array items
+
+    Raises:
+        ValueError: If the document is not valid JSON or has another shape
+    """
+    stream = _ChunkBuffer(chunks)
+    preference = {key: rank for rank, key in enumerate(keys)}
+
+    first = stream.peek()
+    if first == "[":
+        yield from _iter_array(stream)
+        return
+    if first != "{":
+        raise ValueError("Unexpected JSON structure")
+
+    best: int | None = None
+    held: str | None = None
+    for key in _iter_members(stream):
+        rank = preference.get(key)
+        if rank is None or stream.peek() != "[" or (best is not None and rank >= best):
+            stream.skip()
+        elif rank == 0:
+            yield from _iter_array(stream)
+            return
+        else:
+            best = rank
+            if reread is None:
+                held = stream.capture()
+            else:
+                stream.skip()
+
+    if best is None:
+        return
+    if held is not None:
+        yield from _iter_array(_ChunkBuffer([held]))
+        return
+    stream = _ChunkBuffer(reread())
+    for key in _iter_members(stream):
+        if key == keys[best] and stream.peek() == "[":
+            yield from _iter_array(stream)
+            return
+        stream.skip()
+
+
+def _iter_members(stream: _ChunkBuffer) -> Iterator[str]:
+    """Yield the keys of the object at the current position; the caller consumes each value."""
+    stream.expect("{")
+    if stream.peek() == "}":
+        stream.pos += 1
+        return
+    while True:
+        key = stream.decode()
+        if not isinstance(key, str):
+            raise ValueError("Expected an object key")
+        stream.expect(":")
+        yield key
+        if stream.peek() == "}":
+            stream.pos += 1
+            return
+        stream.expect(",")
+
+
+def _iter_array(stream: _ChunkBuffer) -> Iterator[Any]:
+    """Yield items of the array starting at the current position."""
+    stream.expect("[")
+    if stream.peek() == "]":
+        stream.pos += 1
+        return
+    while True:
+        yield stream.decode()
+        if stream.peek() == "]":
+            stream.pos += 1
+            return
+        stream.expect(",")
@@ -229,39 +229,57 @@ def _preview_candidate(candidates: list[MatchCandidate]) -> None:
             console.print("[red]Please enter a number 1-5 or 'b'.[/red]")
 
 
-def get_decision_summary(decisions: list[MatchDecision]) -> dict:
-    """Generate summary statistics for a list of decisions."""
-    if not decisions:
-        return {
-            "total": 0,
-            "auto_accept": 0,
-            "manual_accept": 0,
-            "auto_reject": 0,
-            "manual_reject": 0,
-            "skipped": 0,
-            "no_candidates": 0,
-            "success_rate": 0.0,
-            "avg_confidence": 0.0,
-        }
+class DecisionTally:
+    """
+    Running summary of decisions.
 
-    counts = {
-        "total": len(decisions),
-        "auto_accept": sum(1 for d in decisions if d.decision == "auto_accept"),
-        "manual_accept": sum(1 for d in decisions if d.decision == "manual_accept"),
-        "auto_reject": sum(1 for d in decisions if d.decision == "auto_reject"),
-        "manual_reject": sum(1 for d in decisions if d.decision == "manual_reject"),
-        "skipped": sum(1 for d in decisions if d.decision == "skipped"),
-        "no_candidates": sum(1 for d in decisions if d.decision == "no_candidates"),
-    }
-
-    successful = counts["auto_accept"] + counts["manual_accept"]
-    counts["success_rate"] = (
-        successful / counts["total"] if counts["total"] > 0 else 0.0
-    )
+    Keeps counts instead of the decisions themselves, so a long run doesn't
+    hold every song and chosen candidate until its summary is shown.
+    """
 
-    confidences = [d.confidence for d in decisions if d.confidence > 0]
-    counts["avg_confidence"] = (
-        sum(confidences) / len(confidences) if confidences else 0.0
+    DECISIONS = (
+        "auto_accept",
+        "manual_accept",
+        "auto_reject",
+        "manual_reject",
+        "skipped",
+        "no_candidates",
     )
 
-    return counts
+    def __init__(self) -> None:
+        self.counts = dict.fromkeys(self.DECISIONS, 0)
+        self.total = 0
+        self._confidence_sum = 0.0
+        self._confident = 0
+
+    def add(self, decision: MatchDecision) -> None:
+        """Count a settled decision."""
+        self.total += 1
+        if decision.decision in self.counts:
+            self.counts[decision.decision] += 1
+        if decision.confidence > 0:
+            self._confidence_sum += decision.confidence
+            self._confident += 1
+
+    def __len__(self) -> int:
+        return self.total
+
+    def summary(self) -> dict:
+        """Return the counts in the form of get_decision_summary()."""
+        successful = self.counts["auto_accept"] + self.counts["manual_accept"]
+        return {
+            "total": self.total,
+            **self.counts,
+            "success_rate": successful / self.total if self.total else 0.0,
+            "avg_confidence": (
+                self._confidence_sum / self._confident if self._confident else 0.0
+            ),
+        }
+
+
+def get_decision_summary(decisions: list[MatchDecision]) -> dict:
+    """Generate summary statistics for a list of decisions."""
+    tally = DecisionTally()
+    for decision in decisions:
+        tally.add(decision)
+    return tally.summary()
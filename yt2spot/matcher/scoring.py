@@ -7,11 +7,13 @@ from rapidfuzz import fuzz
 from rich.console import Console
 
 from yt2spot.matcher.normalize import normalize_artist, normalize_title
+from yt2spot.metrics import MATCHER_STAGE_SECONDS
 from yt2spot.models import MatchCandidate, SessionConfig, SongInput
 
 console = Console()
 
 
+@MATCHER_STAGE_SECONDS.time(stage="score")
 def score_candidates(
     song: SongInput, candidates: list[MatchCandidate], config: SessionConfig
 ) -> list[MatchCandidate]:
@@ -2,18 +2,46 @@
 Spotify search functionality with intelligent query construction.
 """
 
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
 
 from rich.console import Console
 
-from yt2spot.matcher.normalize import normalize_artist, normalize_title
+from yt2spot.matcher.normalize import (
+    create_search_key,
+    normalize_artist,
+    normalize_title,
+)
+from yt2spot.metrics import MATCHER_STAGE_SECONDS, SEARCH_CACHE
 from yt2spot.models import MatchCandidate, SessionConfig, SongInput
-from yt2spot.spotify_client import SpotifyClient
+from yt2spot.spotify_client import RequestCancelled, SpotifyClient
+
+if TYPE_CHECKING:
+    from yt2spot.state import StateStore
 
 console = Console()
 
 
+def search_cache_key(song: SongInput, config: SessionConfig) -> str:
+    """
+    Build the search cache key for a song.
+
+    Everything that changes the queries sent to Spotify (normalized title,
+    artist and album, and the number of candidates requested) is part of
+    the key.
+    """
+    key = create_search_key(normalize_title(song.title), normalize_artist(song.artist))
+    album = normalize_title(song.album) if song.album else ""
+    return f"{key}|{album}|{config.max_candidates}"
+
+
+@MATCHER_STAGE_SECONDS.time(stage="search")
 def search_spotify_tracks(
-    song: SongInput, spotify_client: SpotifyClient, config: SessionConfig
+    song: SongInput,
+    spotify_client: SpotifyClient,
+    config: SessionConfig,
+    store: StateStore | None = None,
 ) -> list[MatchCandidate]:
     """
     Search Spotify for track candidates using multiple query strategies.
@@ -22,12 +50,21 @@ def search_spotify_tracks(
         song: Input song to search for
         spotify_client: Authenticated Spotify client
         config: Session configuration
+        store: State store to use as a search cache, if any
 
     Returns:
         List of match candidates sorted by relevance
     """
+    if store is not None:
+        cache_key = search_cache_key(song, config)
+        cached = store.get_candidates(cache_key)
+        SEARCH_CACHE.inc(result="miss" if cached is None else "hit")
+        if cached is not None:
+            return cached
+
     all_candidates = []
     used_queries = set()
+    failed = False
 
     # Strategy 1: Exact search with normalized fields
     normalized_title = normalize_title(song.title)
@@ -70,7 +107,10 @@ def search_spotify_tracks(
                 if len(candidates) >= config.max_candidates and "track:" in query:
                     break
 
+        except RequestCancelled:
+            raise
         except Exception as e:
+            failed = True
             console.print(
                 f"[yellow]Warning:[/yellow] Search failed for query '{query}': {e}"
             )
@@ -85,7 +125,12 @@ def search_spotify_tracks(
             unique_candidates.append(candidate)
 
     # Limit to max candidates
-    return unique_candidates[: config.max_candidates]
+    candidates = unique_candidates[: config.max_candidates]
+
+    # Don't cache results a transient failure may have cut short
+    if store is not None and not failed:
+        store.put_candidates(cache_key, candidates)
+    return candidates
 
 
 def build_search_query(song: SongInput, strategy: str = "balanced") -> str:
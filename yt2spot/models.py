@@ -8,7 +8,7 @@ from typing import Literal
 MatchStatus = Literal["ACCEPT", "SKIP", "UNMATCHED", "AMBIGUOUS"]
 
 
-@dataclass
+@dataclass(slots=True)
 class SongInput:
     """Represents a parsed song from the input file."""
 
@@ -36,7 +36,7 @@ class SongInput:
         return f"Line {self.source_line}: {self.title} - {self.artist}"
 
 
-@dataclass
+@dataclass(slots=True)
 class MatchCandidate:
     """Represents a potential Spotify match for a song."""
 
@@ -75,7 +75,7 @@ class MatchCandidate:
         return f"{minutes}:{seconds:02d}"
 
 
-@dataclass
+@dataclass(slots=True)
 class MatchDecision:
     """Represents the final decision for a song match."""
 
@@ -0,0 +1,135 @@
+"""
+Columnar in-memory storage for very large song lists.
+
+A list of SongInput objects costs one object per song plus one string per
+field. SongTable instead keeps titles (which mostly don't repeat) as packed
+UTF-8, and artists, albums and durations (which repeat a lot) as integer
+indexes into a shared pool of interned strings. Source lines are a plain
+integer array, and normalized keys are only stored when they differ from
+the default SongInput derives. Rows come out as SongInput objects built on
+access, so parsers and the matcher use them unchanged.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator
+
+from yt2spot.models import SongInput
+
+
+def _default_key(title: str, artist: str) -> str:
+    """The normalized key SongInput assigns when none is given."""
+    return f"{title.lower()}|{artist.lower()}"
+
+
+class SongTable:
+    """Columnar, append-only collection of songs."""
+
+    __slots__ = (
+        "_strings",
+        "_string_ids",
+        "_title_data",
+        "_title_ends",
+        "_artists",
+        "_albums",
+        "_durations",
+        "_source_lines",
+        "_keys",
+    )
+
+    def __init__(self) -> None:
+        self._strings: list[str] = [""]
+        self._string_ids: dict[str, int] = {"": 0}
+        self._title_data = bytearray()
+        self._title_ends = array("Q")
+        self._artists = array("I")
+        self._albums = array("I")
+        self._durations = array("I")
+        self._source_lines = array("I")
+        # Row index -> key, for the few rows whose key isn't the default
+        self._keys: dict[int, str] = {}
+
+    @classmethod
+    def from_songs(cls, songs: Iterable[SongInput]) -> SongTable:
+        """Build a table from any iterable of songs (e.g. a parser stream)."""
+        table = cls()
+        table.extend(songs)
+        return table
+
+    def _intern(self, text: str) -> int:
+        string_id = self._string_ids.get(text)
+        if string_id is None:
+            string_id = len(self._strings)
+            self._strings.append(text)
+            self._string_ids[text] = string_id
+        return string_id
+
+    def append(self, song: SongInput) -> None:
+        """Add one song; only its field values are kept."""
+        if song.normalized_key != _default_key(song.title, song.artist):
+            self._keys[len(self)] = song.normalized_key
+        self._title_data += song.title.encode("utf-8")
+        self._title_ends.append(len(self._title_data))
+        self._artists.append(self._intern(song.artist))
+        self._albums.append(self._intern(song.album))
+        self._durations.append(self._intern(song.duration))
+        self._source_lines.append(song.source_line)
+
+    def extend(self, songs: Iterable[SongInput]) -> None:
+        """Add songs in order."""
+        for song in songs:
+            self.append(song)
+
+    def extend_table(self, other: SongTable, line_offset: int = 0) -> None:
+        """
+        Add every row of another table, shifting its source lines.
+
+        Cheaper than adding its rows one by one: the columns are copied
+        whole, and only the other table's string pool is interned again.
+        """
+        rows = len(self)
+        string_ids = [self._intern(text) for text in other._strings]
+        title_offset = len(self._title_data)
+
+        self._title_data += other._title_data
+        self._title_ends.extend(end + title_offset for end in other._title_ends)
+        for column, other_column in (
+            (self._artists, other._artists),
+            (self._albums, other._albums),
+            (self._durations, other._durations),
+        ):
+            column.extend(string_ids[string_id] for string_id in other_column)
+        self._source_lines.extend(line + line_offset for line in other._source_lines)
+        self._keys.update((rows + index, key) for index, key in other._keys.items())
+
+    def __len__(self) -> int:
+        return len(self._source_lines)
+
+    def __getitem__(self, index: int) -> SongInput:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("SongTable index out of range")
+        return self._row(index)
+
+    def __iter__(self) -> Iterator[SongInput]:
+        for index in range(len(self)):
+            yield self._row(index)
+
+    def _row(self, index: int) -> SongInput:
+        start = self._title_ends[index - 1] if index else 0
+        strings = self._strings
+        return SongInput(
+            title=self._title_data[start : self._title_ends[index]].decode("utf-8"),
+            artist=strings[self._artists[index]],
+            album=strings[self._albums[index]],
+            duration=strings[self._durations[index]],
+            source_line=self._source_lines[index],
+            normalized_key=self._keys.get(index, ""),
+        )
+
+    @property
+    def distinct_strings(self) -> int:
+        """Number of distinct artists, albums and durations in the shared pool."""
+        return len(self._strings)
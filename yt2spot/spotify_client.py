@@ -4,17 +4,42 @@ Spotify API client for playlist management and track operations.
 
 import os
 import time
+from collections.abc import Iterator
+from contextlib import contextmanager
 from urllib.parse import quote
 
 import spotipy
 from rich.console import Console
+from spotipy.exceptions import SpotifyException
 from spotipy.oauth2 import SpotifyOAuth
 
+from yt2spot.metrics import SPOTIFY_REQUEST_SECONDS, SPOTIFY_REQUESTS
 from yt2spot.models import MatchCandidate, SessionConfig
 
 console = Console()
 
 
+class RequestCancelled(Exception):
+    """Raised by a Spotify call abandoned because its migration was stopped."""
+
+
+@contextmanager
+def _observe(operation: str) -> Iterator[None]:
+    """Record the latency and outcome of one Spotify API call."""
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    except SpotifyException as e:
+        if e.http_status == 429:
+            outcome = "rate_limited"
+        raise
+    finally:
+        SPOTIFY_REQUEST_SECONDS.observe(time.perf_counter() - start, operation=operation)
+        SPOTIFY_REQUESTS.inc(operation=operation, outcome=outcome)
+
+
 class SpotifyClient:
     """Client for interacting with the Spotify Web API."""
 
@@ -60,7 +85,8 @@ class SpotifyClient:
             self._client = spotipy.Spotify(auth_manager=auth_manager)
 
             # Test authentication by getting user profile
-            user_profile = self._client.current_user()
+            with _observe("current_user"):
+                user_profile = self._client.current_user()
             self._user_id = user_profile["id"]
 
             console.print(
@@ -73,40 +99,41 @@ class SpotifyClient:
             return False
 
     def search_tracks(self, query: str, limit: int = 10) -> list[MatchCandidate]:
-        """Search for tracks on Spotify."""
+        """
+        Search for tracks on Spotify.
+
+        API errors are raised rather than returned as an empty list, so a
+        failed search is not mistaken for (and cached as) one without results.
+        """
         if not self._client:
             raise RuntimeError("Spotify client not authenticated")
 
-        try:
-            # Clean and format search query
-            search_query = quote(query.strip())
+        # Clean and format search query
+        search_query = quote(query.strip())
+        with _observe("search"):
             results = self._client.search(q=search_query, type="track", limit=limit)
 
-            candidates = []
-            for track in results["tracks"]["items"]:
-                # Get primary artist and additional artists
-                artists = [artist["name"] for artist in track["artists"]]
-                primary_artist = artists[0] if artists else "Unknown"
-                all_artists = ", ".join(artists)
-
-                candidate = MatchCandidate(
-                    spotify_id=track["id"],
-                    title=track["name"],
-                    artist=primary_artist,
-                    all_artists=all_artists,
-                    album=track["album"]["name"],
-                    duration_ms=track["duration_ms"],
-                    popularity=track["popularity"],
-                    preview_url=track.get("preview_url"),
-                    spotify_url=track["external_urls"]["spotify"],
-                )
-                candidates.append(candidate)
-
-            return candidates
+        candidates = []
+        for track in results["tracks"]["items"]:
+            # Get primary artist and additional artists
+            artists = [artist["name"] for artist in track["artists"]]
+            primary_artist = artists[0] if artists else "Unknown"
+            all_artists = ", ".join(artists)
+
+            candidate = MatchCandidate(
+                spotify_id=track["id"],
+                title=track["name"],
+                artist=primary_artist,
+                all_artists=all_artists,
+                album=track["album"]["name"],
+                duration_ms=track["duration_ms"],
+                popularity=track["popularity"],
+                preview_url=track.get("preview_url"),
+                spotify_url=track["external_urls"]["spotify"],
+            )
+            candidates.append(candidate)
 
-        except Exception as e:
-            console.print(f"[red]Search failed for '{query}': {e}[/red]")
-            return []
+        return candidates
 
     def like_track(self, spotify_id: str) -> bool:
         """Add a track to the user's liked songs."""
@@ -114,7 +141,8 @@ class SpotifyClient:
             raise RuntimeError("Spotify client not authenticated")
 
         try:
-            self._client.current_user_saved_tracks_add([spotify_id])
+            with _observe("save_tracks"):
+                self._client.current_user_saved_tracks_add([spotify_id])
             return True
         except Exception as e:
             console.print(f"[red]Failed to like track {spotify_id}: {e}[/red]")
@@ -126,7 +154,8 @@ class SpotifyClient:
             raise RuntimeError("Spotify client not authenticated")
 
         try:
-            self._client.current_user_saved_tracks_delete([spotify_id])
+            with _observe("remove_saved_tracks"):
+                self._client.current_user_saved_tracks_delete([spotify_id])
             return True
         except Exception as e:
             console.print(f"[red]Failed to unlike track {spotify_id}: {e}[/red]")
@@ -138,7 +167,8 @@ class SpotifyClient:
             raise RuntimeError("Spotify client not authenticated")
 
         try:
-            result = self._client.current_user_saved_tracks_contains([spotify_id])
+            with _observe("saved_tracks_contains"):
+                result = self._client.current_user_saved_tracks_contains([spotify_id])
             return result[0] if result else False
         except Exception as e:
             console.print(
@@ -154,9 +184,10 @@ class SpotifyClient:
             raise RuntimeError("Spotify client not authenticated")
 
         try:
-            playlist = self._client.user_playlist_create(
-                user=self._user_id, name=name, public=public, description=description
-            )
+            with _observe("create_playlist"):
+                playlist = self._client.user_playlist_create(
+                    user=self._user_id, name=name, public=public, description=description
+                )
             return playlist["id"]
         except Exception as e:
             console.print(f"[red]Failed to create playlist '{name}': {e}[/red]")
@@ -172,7 +203,8 @@ class SpotifyClient:
             batch_size = 100
             for i in range(0, len(track_ids), batch_size):
                 batch = track_ids[i : i + batch_size]
-                self._client.playlist_add_items(playlist_id, batch)
+                with _observe("playlist_add_items"):
+                    self._client.playlist_add_items(playlist_id, batch)
 
                 # Rate limiting
                 if len(track_ids) > batch_size:
@@ -189,7 +221,8 @@ class SpotifyClient:
             raise RuntimeError("Spotify client not authenticated")
 
         try:
-            playlists = self._client.current_user_playlists(limit=50)
+            with _observe("current_user_playlists"):
+                playlists = self._client.current_user_playlists(limit=50)
             for playlist in playlists["items"]:
                 if playlist["name"] == name:
                     return playlist
@@ -198,13 +231,39 @@ class SpotifyClient:
             console.print(f"[red]Failed to search for playlist '{name}': {e}[/red]")
             return None
 
+    def get_playlist_track_ids(self, playlist_id: str) -> set[str] | None:
+        """Get the IDs of the tracks already in a playlist."""
+        if not self._client:
+            raise RuntimeError("Spotify client not authenticated")
+
+        try:
+            track_ids: set[str] = set()
+            with _observe("playlist_items"):
+                page = self._client.playlist_items(
+                    playlist_id, fields="items(track(id)),next", limit=100
+                )
+            while page:
+                for item in page["items"]:
+                    # Local files and removed tracks have no track ID
+                    if item.get("track") and item["track"].get("id"):
+                        track_ids.add(item["track"]["id"])
+                if not page.get("next"):
+                    break
+                with _observe("playlist_items"):
+                    page = self._client.next(page)
+            return track_ids
+        except Exception as e:
+            console.print(f"[red]Failed to get tracks of playlist: {e}[/red]")
+            return None
+
     def get_user_profile(self) -> dict | None:
         """Get the current user's profile."""
         if not self._client:
             return None
 
         try:
-            return self._client.current_user()
+            with _observe("current_user"):
+                return self._client.current_user()
         except Exception as e:
             console.print(f"[red]Failed to get user profile: {e}[/red]")
             return None
@@ -215,7 +274,8 @@ class SpotifyClient:
             raise RuntimeError("Spotify client not authenticated")
 
         try:
-            return self._client.track(spotify_id)
+            with _observe("track"):
+                return self._client.track(spotify_id)
         except Exception as e:
             console.print(f"[red]Failed to get track info for {spotify_id}: {e}[/red]")
             return None
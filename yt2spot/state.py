@@ -0,0 +1,332 @@
+"""
+Persistent state shared by the CLI and the web backend.
+
+A single embedded SQLite database (in WAL mode, so readers never block the
+writer) holds the Spotify search cache, per-song decisions, migration
+sessions and a session event journal. Writes are queued in memory and
+committed in batches, each in one short transaction, so other processes
+are never locked out for long; reads flush the queue first, so callers
+always see their own writes.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from dataclasses import asdict
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+from typing import Any
+
+from yt2spot.models import MatchCandidate, MatchDecision
+
+STATE_FILE_NAME = "state.sqlite3"
+
+# Spotify's catalogue changes slowly; a week keeps repeat runs fast
+SEARCH_CACHE_TTL = 7 * 24 * 3600
+
+SCHEMA_VERSION = 1
+
+# How long a statement waits for another process's write lock
+BUSY_TIMEOUT_MS = 5000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_cache (
+    normalized_key TEXT PRIMARY KEY,
+    candidates TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    config TEXT NOT NULL DEFAULT '{}',
+    progress TEXT NOT NULL DEFAULT '{}',
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS decisions (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    source_line INTEGER NOT NULL,
+    normalized_key TEXT NOT NULL,
+    decision TEXT NOT NULL,
+    track_id TEXT,
+    confidence REAL NOT NULL DEFAULT 0,
+    reason TEXT NOT NULL DEFAULT '',
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_decisions_session
+    ON decisions (session_id, source_line);
+CREATE INDEX IF NOT EXISTS idx_decisions_key ON decisions (normalized_key);
+
+CREATE TABLE IF NOT EXISTS journal (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    event TEXT NOT NULL,
+    payload TEXT NOT NULL DEFAULT '{}',
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_journal_session ON journal (session_id, id);
+"""
+
+
+class StateStore:
+    """
+    SQLite-backed store for caches, decisions, sessions and events.
+
+    One connection is shared by all threads and guarded by a lock, which
+    suits SQLite's single-writer model. Queued writes are committed once
+    ``batch_size`` statements or ``flush_interval`` seconds have passed,
+    on any read, and on ``flush``/``close``.
+    """
+
+    def __init__(
+        self, path: str | Path, batch_size: int = 100, flush_interval: float = 0.5
+    ):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._lock = threading.RLock()
+        self._queue: list[tuple[str, tuple]] = []
+        self._timer: threading.Timer | None = None
+        self._closed = False
+
+        if str(path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(path), check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # WAL makes NORMAL safe against corruption; a crash loses at most
+        # the last committed batch
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    @classmethod
+    def in_dir(cls, directory: str | Path, **kwargs: Any) -> StateStore:
+        """Open the store kept in ``directory``."""
+        return cls(Path(directory) / STATE_FILE_NAME, **kwargs)
+
+    # Write batching
+
+    def _write(self, sql: str, params: tuple = ()) -> None:
+        with self._lock:
+            self._queue.append((sql, params))
+            if len(self._queue) >= self.batch_size:
+                self._commit()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _commit(self) -> None:
+        """Run the queued writes in one transaction, a statement at a time."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._queue:
+            return
+        queue, self._queue = self._queue, []
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            for sql, writes in groupby(queue, key=itemgetter(0)):
+                self._conn.executemany(sql, [params for _, params in writes])
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def _query(self, sql: str, params: tuple = ()) -> list[tuple]:
+        with self._lock:
+            self._commit()
+            return self._conn.execute(sql, params).fetchall()
+
+    def flush(self) -> None:
+        """Commit all queued writes."""
+        with self._lock:
+            if not self._closed:
+                self._commit()
+
+    def close(self) -> None:
+        """Flush and close the database."""
+        with self._lock:
+            if not self._closed:
+                self._commit()
+                self._closed = True
+                self._conn.close()
+
+    def __enter__(self) -> StateStore:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    # Search cache
+
+    def get_candidates(
+        self, key: str, max_age: float = SEARCH_CACHE_TTL
+    ) -> list[MatchCandidate] | None:
+        """
+        Look up cached search results.
+
+        Returns:
+            The cached candidates, or None if missing or older than ``max_age``
+        """
+        rows = self._query(
+            "SELECT candidates, updated_at FROM search_cache WHERE normalized_key = ?",
+            (key,),
+        )
+        if not rows or time.time() - rows[0][1] > max_age:
+            return None
+        return [MatchCandidate(**fields) for fields in json.loads(rows[0][0])]
+
+    def put_candidates(self, key: str, candidates: list[MatchCandidate]) -> None:
+        """Cache search results (serialized immediately)."""
+        payload = json.dumps([asdict(candidate) for candidate in candidates])
+        self._write(
+            "INSERT OR REPLACE INTO search_cache VALUES (?, ?, ?)",
+            (key, payload, time.time()),
+        )
+
+    # Decisions
+
+    def record_decision(self, session_id: str, decision: MatchDecision) -> None:
+        """Store the decision made for one song of a session."""
+        song = decision.input_song
+        chosen = decision.chosen_candidate
+        self._write(
+            "INSERT INTO decisions (session_id, source_line, normalized_key,"
+            " decision, track_id, confidence, reason, created_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                session_id,
+                song.source_line,
+                song.normalized_key,
+                decision.decision,
+                chosen.spotify_id if chosen else None,
+                decision.confidence,
+                decision.reason,
+                time.time(),
+            ),
+        )
+
+    def iter_decisions(self, session_id: str) -> Iterator[dict[str, Any]]:
+        """Yield a session's decisions in input order."""
+        rows = self._query(
+            "SELECT source_line, normalized_key, decision, track_id, confidence,"
+            " reason FROM decisions WHERE session_id = ? ORDER BY source_line",
+            (session_id,),
+        )
+        columns = (
+            "source_line",
+            "normalized_key",
+            "decision",
+            "track_id",
+            "confidence",
+            "reason",
+        )
+        for row in rows:
+            yield dict(zip(columns, row, strict=True))
+
+    def last_decision(self, normalized_key: str) -> dict[str, Any] | None:
+        """Return the most recent decision for a song key across sessions."""
+        rows = self._query(
+            "SELECT session_id, decision, track_id, confidence FROM decisions"
+            " WHERE normalized_key = ? ORDER BY id DESC LIMIT 1",
+            (normalized_key,),
+        )
+        if not rows:
+            return None
+        session_id, decision, track_id, confidence = rows[0]
+        return {
+            "session_id": session_id,
+            "decision": decision,
+            "track_id": track_id,
+            "confidence": confidence,
+        }
+
+    # Sessions
+
+    def save_session(
+        self,
+        session_id: str,
+        status: str,
+        config: dict[str, Any] | None = None,
+        progress: dict[str, Any] | None = None,
+    ) -> None:
+        """Create or update a session; omitted fields keep their stored value."""
+        now = time.time()
+        self._write(
+            "INSERT INTO sessions (id, status, config, progress, created_at,"
+            " updated_at) VALUES (?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT (id) DO UPDATE SET status = excluded.status,"
+            " config = COALESCE(?, config), progress = COALESCE(?, progress),"
+            " updated_at = excluded.updated_at",
+            (
+                session_id,
+                status,
+                json.dumps(config or {}),
+                json.dumps(progress or {}),
+                now,
+                now,
+                None if config is None else json.dumps(config),
+                None if progress is None else json.dumps(progress),
+            ),
+        )
+
+    def get_session(self, session_id: str) -> dict[str, Any] | None:
+        """Return a stored session, or None if it doesn't exist."""
+        rows = self._query(
+            "SELECT status, config, progress, created_at, updated_at"
+            " FROM sessions WHERE id = ?",
+            (session_id,),
+        )
+        if not rows:
+            return None
+        status, config, progress, created_at, updated_at = rows[0]
+        return {
+            "id": session_id,
+            "status": status,
+            "config": json.loads(config),
+            "progress": json.loads(progress),
+            "created_at": created_at,
+            "updated_at": updated_at,
+        }
+
+    def delete_session(self, session_id: str) -> None:
+        """Remove a session with its decisions and events."""
+        for table, column in (
+            ("decisions", "session_id"),
+            ("journal", "session_id"),
+            ("sessions", "id"),
+        ):
+            self._write(f"DELETE FROM {table} WHERE {column} = ?", (session_id,))
+
+    # Journal
+
+    def log_event(
+        self, session_id: str, event: str, payload: dict[str, Any] | None = None
+    ) -> None:
+        """Append an event to a session's journal."""
+        self._write(
+            "INSERT INTO journal (session_id, event, payload, created_at)"
+            " VALUES (?, ?, ?, ?)",
+            (session_id, event, json.dumps(payload or {}), time.time()),
+        )
+
+    def iter_events(self, session_id: str) -> Iterator[tuple[str, dict[str, Any]]]:
+        """Yield ``(event, payload)`` pairs of a session in order."""
+        rows = self._query(
+            "SELECT event, payload FROM journal WHERE session_id = ? ORDER BY id",
+            (session_id,),
+        )
+        for event, payload in rows:
+            yield event, json.loads(payload)